@@ -0,0 +1,65 @@
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.collision import BroadPhase, swept_aabb
+
+FRAMES = 2000
+ROAD_X, LANE_W, LANES = 100, 100, 3
+CAR_W, CAR_H = 50, 100
+PLAYER_Y = 580
+SPACING = 2 * CAR_H
+
+
+def setup(count, speed, seed=0):
+    # Cars keep their distance within a lane, as in the game, so more cars
+    # means a longer stretch of road rather than denser traffic
+    rng = np.random.default_rng(seed)
+    lanes = np.arange(count) % LANES
+    x = (ROAD_X + lanes * LANE_W).astype(np.float64)
+    y = (np.arange(count) // LANES) * SPACING + rng.uniform(0, SPACING - CAR_H, count) - 100
+    motion = np.full(count, float(speed))
+    return rng, x, y, motion, max(800, (count // LANES + 1) * SPACING)
+
+
+def run_discrete(count, speed):
+    # The old test: every car against the player at the end of the frame
+    rng, x, y, motion, length = setup(count, speed)
+    misses = 0
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        px = ROAD_X + rng.integers(0, LANES) * LANE_W
+        before = (np.abs(x - px) < CAR_W) & (y + CAR_H <= PLAYER_Y)
+        y += motion
+        hit = (np.abs(x - px) < CAR_W) & (np.abs(y - PLAYER_Y) < CAR_H)
+        # Cars that were above the player and are now below it went straight through
+        misses += int((before & ~hit & (y >= PLAYER_Y + CAR_H)).sum())
+        y[y > length - 100] -= length
+    return (time.perf_counter() - start) / FRAMES, misses
+
+
+def run_swept(count, speed):
+    rng, x, y, motion, length = setup(count, speed)
+    alive = np.ones(count, dtype=bool)
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        px = ROAD_X + rng.integers(0, LANES) * LANE_W
+        grid = BroadPhase(LANE_W, CAR_H + speed, ROAD_X, LANES).build(x, y, alive)
+        near = grid.query(px, PLAYER_Y, px + CAR_W, PLAYER_Y + CAR_H)
+        any(swept_aabb(px, PLAYER_Y, CAR_W, CAR_H, 0, 0, cx, cy, CAR_W, CAR_H, 0, dy) is not None
+            for cx, cy, dy in zip(x[near].tolist(), y[near].tolist(), motion[near].tolist()))
+        y += motion
+        y[y > length - 100] -= length
+    return (time.perf_counter() - start) / FRAMES
+
+
+if __name__ == "__main__":
+    print(f"{FRAMES} frames, microseconds per frame; 'missed' counts cars that jumped over the player")
+    print(f"{'cars':>6} {'speed':>6} {'discrete':>10} {'missed':>8} {'swept':>10}")
+    for count in (3, 30, 300, 3000):
+        for speed in (10, 150, 400):
+            discrete, misses = run_discrete(count, speed)
+            print(f"{count:6} {speed:6} {discrete * 1e6:10.1f} {misses:8} {run_swept(count, speed) * 1e6:10.1f}")
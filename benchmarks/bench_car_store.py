@@ -0,0 +1,55 @@
+import os
+import random
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.entities import EntityStore
+
+FRAMES = 2000
+HEIGHT = 700
+
+
+def run_dicts(count):
+    # The old opponent list: per-car loop, list.remove and a new dict per spawn
+    rng = random.Random(0)
+    cars = [{'x': rng.randint(100, 350), 'y': rng.uniform(-100, HEIGHT), 'speed': rng.uniform(5, 15)}
+            for _ in range(count)]
+    player = (225, 580)
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        passed = 0
+        for car in cars[:]:
+            car['y'] += car['speed']
+            if car['y'] > HEIGHT:
+                cars.remove(car)
+                passed += 1
+        for _ in range(passed):
+            cars.append({'x': rng.randint(100, 350), 'y': -100, 'speed': rng.uniform(5, 15)})
+        any(abs(car['x'] - player[0]) < 50 and abs(car['y'] - player[1]) < 100 for car in cars)
+    return (time.perf_counter() - start) / FRAMES
+
+
+def run_store(count):
+    rng = np.random.default_rng(0)
+    cars = EntityStore(count, {'x': np.float64, 'y': np.float64, 'speed': np.float64})
+    for _ in range(count):
+        cars.spawn(x=rng.integers(100, 350), y=rng.uniform(-100, HEIGHT), speed=rng.uniform(5, 15))
+    player = (225, 580)
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        cars.y[cars.alive] += cars.speed[cars.alive]
+        passed = cars.despawn(cars.y > HEIGHT)
+        for _ in range(passed):
+            cars.spawn(x=rng.integers(100, 350), y=-100, speed=rng.uniform(5, 15))
+        (cars.alive & (np.abs(cars.x - player[0]) < 50) & (np.abs(cars.y - player[1]) < 100)).any()
+    return (time.perf_counter() - start) / FRAMES
+
+
+if __name__ == "__main__":
+    print(f"{FRAMES} frames: move, despawn, respawn and collision test, microseconds per frame")
+    print(f"{'cars':>6} {'dicts':>10} {'store':>10}")
+    for count in (3, 30, 300, 1000):
+        print(f"{count:6} {run_dicts(count) * 1e6:10.1f} {run_store(count) * 1e6:10.1f}")
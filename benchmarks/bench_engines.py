@@ -0,0 +1,87 @@
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from snake_engine import SnakeEngine, DIRECTIONS, OPPOSITE
+from car_racing_engine import CarRacingEngine
+
+TICKS = 50000
+
+
+def snake_bot(engine):
+    # Greedy: the allowed direction closest to the fruit that does not hit the body
+    x, y = engine.snake.head
+    fx, fy = engine.fruit
+    best, best_distance = None, None
+    for direction, (dx, dy) in DIRECTIONS.items():
+        if direction == OPPOSITE[engine.direction]:
+            continue
+        cell = ((x + dx) % engine.cols, (y + dy) % engine.rows)
+        if cell in engine.snake and cell != engine.snake.segments[-1]:
+            continue
+        distance = abs(cell[0] - fx) + abs(cell[1] - fy)
+        if best is None or distance < best_distance:
+            best, best_distance = direction, distance
+    return best or engine.direction
+
+
+def run_snake(seed):
+    engine = SnakeEngine(40, 30, seed=seed)
+    games, turns = 0, []
+    start = time.perf_counter()
+    for _ in range(TICKS):
+        direction = snake_bot(engine)
+        turns.append(direction)
+        engine.turn(direction)
+        engine.step()
+        if engine.over:
+            games += 1
+            engine.reset()
+    return time.perf_counter() - start, games, turns, (engine.score, engine.snake.head, engine.fruit)
+
+
+def replay_snake(seed, turns):
+    engine = SnakeEngine(40, 30, seed=seed)
+    for direction in turns:
+        engine.turn(direction)
+        engine.step()
+        if engine.over:
+            engine.reset()
+    return engine.score, engine.snake.head, engine.fruit
+
+
+def run_car(seed):
+    engine = CarRacingEngine('hard', seed=seed)
+    steering = random.Random(seed)
+    games, inputs = 0, []
+    start = time.perf_counter()
+    for _ in range(TICKS):
+        keys = (steering.random() < 0.3, steering.random() < 0.3)
+        inputs.append(keys)
+        engine.move_left, engine.move_right = keys
+        engine.step()
+        if engine.over:
+            games += 1
+            engine.reset()
+    return time.perf_counter() - start, games, inputs, (engine.score, engine.player_car['x'], len(engine.opponent_cars))
+
+
+def replay_car(seed, inputs):
+    engine = CarRacingEngine('hard', seed=seed)
+    for keys in inputs:
+        engine.move_left, engine.move_right = keys
+        engine.step()
+        if engine.over:
+            engine.reset()
+    return engine.score, engine.player_car['x'], len(engine.opponent_cars)
+
+
+if __name__ == "__main__":
+    print(f"{TICKS} headless ticks per engine, bot input included")
+    elapsed, games, turns, final = run_snake(1)
+    print(f"Snake:      {TICKS / elapsed:10.0f} ticks/s, {games} games, replay matches: {replay_snake(1, turns) == final}")
+    elapsed, games, inputs, final = run_car(1)
+    print(f"Car Racing: {TICKS / elapsed:10.0f} ticks/s, {games} games, replay matches: {replay_car(1, inputs) == final}")
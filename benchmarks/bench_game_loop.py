@@ -0,0 +1,79 @@
+import heapq
+import itertools
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.game_loop import GameLoop
+
+RATE = 60
+SECONDS = 3.0
+
+
+class Clock:
+    # Minimal stand-in for Tk's after() queue, so the loop runs without a display
+    def __init__(self):
+        self.queue = []
+        self.ids = itertools.count()
+
+    def after(self, ms, callback):
+        after_id = next(self.ids)
+        heapq.heappush(self.queue, (time.perf_counter() + ms / 1000, after_id, callback))
+        return after_id
+
+    def after_cancel(self, after_id):
+        self.queue = [entry for entry in self.queue if entry[1] != after_id]
+        heapq.heapify(self.queue)
+
+    def run(self, seconds):
+        end = time.perf_counter() + seconds
+        while self.queue and time.perf_counter() < end:
+            due, _, callback = heapq.heappop(self.queue)
+            time.sleep(max(0.0, due - time.perf_counter()))
+            callback()
+
+
+def busy(ms):
+    end = time.perf_counter() + ms / 1000
+    while time.perf_counter() < end:
+        pass
+
+
+def run_after_chain(render_ms):
+    # The old loop: one step and one draw, then after(1000 // fps)
+    clock = Clock()
+    steps = [0]
+
+    def update():
+        steps[0] += 1
+        busy(render_ms)
+        clock.after(1000 // RATE, update)
+
+    clock.after(0, update)
+    clock.run(SECONDS)
+    return steps[0] / SECONDS, None
+
+
+def run_game_loop(render_ms):
+    clock = Clock()
+    steps = [0]
+
+    def update():
+        steps[0] += 1
+
+    loop = GameLoop(clock, update, lambda alpha: busy(render_ms), RATE)
+    loop.start()
+    clock.run(SECONDS)
+    return steps[0] / SECONDS, loop.stats()
+
+
+if __name__ == "__main__":
+    print(f"Target {RATE} steps/s over {SECONDS:.0f} s, with a render costing the given ms")
+    print(f"{'render ms':>9} {'after() steps/s':>16} {'loop steps/s':>13} {'loop fps':>9} {'skipped':>8} {'dropped':>8}")
+    for render_ms in (0, 5, 12, 20, 40):
+        old, _ = run_after_chain(render_ms)
+        new, stats = run_game_loop(render_ms)
+        print(f"{render_ms:9} {old:16.1f} {new:13.1f} {stats['fps']:9.1f} {stats['skipped_renders']:8} "
+              f"{stats['dropped_steps']:8}")
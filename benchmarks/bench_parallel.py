@@ -0,0 +1,47 @@
+import os
+import sys
+import time
+import chess
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from chess_engine import SearchEngine, TranspositionTable
+from chess_parallel import ParallelSearch
+
+# Middlegame positions with plenty of root moves to split
+POSITIONS = [
+    "r1bqkb1r/pppp1ppp/2n2n2/4p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 4 4",
+    "r1bq1rk1/ppp2ppp/2np1n2/2b1p3/2B1P3/2PP1N2/PP3PPP/RNBQ1RK1 w - - 0 7",
+    "r2q1rk1/pp2bppp/2n1pn2/3p4/3P1B2/2PB1N2/PP1N1PPP/R2Q1RK1 w - - 0 10",
+    "2r2rk1/pp1qbppp/2n1pn2/3p4/3P4/P1NBPN2/1P3PPP/R2Q1RK1 w - - 1 13"
+]
+
+
+def run(engine, depth):
+    # Fixed depth with no time or node limit, so both engines do comparable work
+    nodes = 0
+    start = time.perf_counter()
+    for fen in POSITIONS:
+        result = engine.search(chess.Board(fen), max_depth=depth)
+        nodes += result.nodes
+        print(f"  {fen[:40]:40}  {result.move}  score {result.score:6}  nodes {result.nodes}")
+    return time.perf_counter() - start, nodes
+
+
+if __name__ == "__main__":
+    depth = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count()
+
+    print(f"Single process, depth {depth}")
+    single_time, single_nodes = run(SearchEngine(tt=TranspositionTable()), depth)
+
+    parallel = ParallelSearch(workers=workers).start()
+    # Warm up the pool so process start-up is not part of the measurement
+    parallel.search(chess.Board(), max_depth=1)
+    print(f"{workers} worker processes, depth {depth}")
+    parallel_time, parallel_nodes = run(parallel, depth)
+    parallel.close()
+
+    print(f"single:   {single_time:.2f}s  {single_nodes / single_time:.0f} nodes/sec")
+    print(f"parallel: {parallel_time:.2f}s  {parallel_nodes / parallel_time:.0f} nodes/sec")
+    print(f"speedup:  {single_time / parallel_time:.2f}x")
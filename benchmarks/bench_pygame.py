@@ -0,0 +1,49 @@
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pygame_games import SnakePygame, CarRacingPygame
+import pygame
+from bench_engines import snake_bot
+
+FRAMES = 600
+SIZES = [(500, 700), (800, 600), (1280, 960), (1920, 1080)]
+
+
+def run(cls, size, dirty_rects):
+    # One step and one render per frame, as fast as the backend allows
+    game = cls('hard', None, dirty_rects=dirty_rects)
+    # The window manager resizes a real window; the dummy display has to be set by hand
+    pygame.display.set_mode(size, pygame.RESIZABLE)
+    game.resize(*size)
+    game.engine.rng.seed(1)
+    game.reset()
+    steering = random.Random(1)
+    blits = 0
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        if cls is SnakePygame:
+            game.engine.turn(snake_bot(game.engine))
+        else:
+            game.engine.move_left, game.engine.move_right = steering.random() < 0.3, steering.random() < 0.3
+        game.update()
+        if game.state == "gameover":
+            game.reset()
+        blits += game.render(0.5)
+    elapsed = time.perf_counter() - start
+    pygame.quit()
+    return FRAMES / elapsed, blits / FRAMES
+
+
+if __name__ == "__main__":
+    print(f"{FRAMES} frames per run, video driver {os.environ['SDL_VIDEODRIVER']}")
+    print(f"{'game':>10} {'size':>10} {'full fps':>9} {'dirty fps':>10} {'rects/frame':>12}")
+    for cls in (SnakePygame, CarRacingPygame):
+        for size in SIZES:
+            full, _ = run(cls, size, False)
+            dirty, rects = run(cls, size, True)
+            print(f"{cls.name:>10} {size[0]:>5}x{size[1]:<4} {full:9.0f} {dirty:10.0f} {rects:12.1f}")
@@ -0,0 +1,92 @@
+import collections
+import itertools
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.scene import Scene
+from snake_body import SnakeBody
+
+FRAMES = 600
+COLS, ROWS, CELL = 40, 30, 20
+
+
+class CallCounter:
+    # Counts the canvas calls a frame makes; stands in for tk.Canvas so this
+    # runs without a display (the cost of a real Tk call is on top of this)
+    def __init__(self):
+        self.calls = collections.Counter()
+        self.ids = itertools.count(1)
+
+    def create(self, *args, **options):
+        self.calls['create'] += 1
+        return next(self.ids)
+
+    create_rectangle = create_line = create_text = create_oval = create_image = create
+
+    def coords(self, *args):
+        self.calls['coords'] += 1
+
+    def itemconfig(self, *args, **options):
+        self.calls['itemconfig'] += 1
+
+    def delete(self, *args):
+        self.calls['delete'] += 1
+
+    def tag_lower(self, *args):
+        self.calls['tag_lower'] += 1
+
+
+def snake_frames():
+    # A snake sweeping the board row by row, growing every 10 steps
+    body = SnakeBody(COLS, ROWS, (0, 0))
+    for frame in range(FRAMES):
+        x, y = body.head
+        x, y = (x + 1) % COLS, (y + (x + 1) // COLS) % ROWS
+        body.move((x, y), grow=frame % 10 == 0)
+        yield list(body), frame
+
+
+def run_immediate():
+    canvas = CallCounter()
+    start = time.perf_counter()
+    for segments, frame in snake_frames():
+        canvas.delete("all")
+        canvas.create_rectangle(0, 0, COLS * CELL, ROWS * CELL, fill="#1a1a2e")
+        for x in range(0, COLS * CELL, CELL):
+            canvas.create_line(x, 0, x, ROWS * CELL, fill="#2e2e4e")
+        for y in range(0, ROWS * CELL, CELL):
+            canvas.create_line(0, y, COLS * CELL, y, fill="#2e2e4e")
+        for x, y in segments:
+            canvas.create_rectangle(x * CELL, y * CELL, (x + 1) * CELL, (y + 1) * CELL, fill="#00ffcc")
+        canvas.create_text(10, 10, text=f"Score: {frame}")
+    return canvas.calls, time.perf_counter() - start
+
+
+def run_scene():
+    canvas = CallCounter()
+    scene = Scene(canvas, ["background", "grid", "sprites", "hud"])
+    start = time.perf_counter()
+    for segments, frame in snake_frames():
+        scene.draw("backdrop", "background", "rectangle", (0, 0, COLS * CELL, ROWS * CELL), fill="#1a1a2e")
+        for i, x in enumerate(range(0, COLS * CELL, CELL)):
+            scene.draw(f"vline{i}", "grid", "line", (x, 0, x, ROWS * CELL), fill="#2e2e4e")
+        for i, y in enumerate(range(0, ROWS * CELL, CELL)):
+            scene.draw(f"hline{i}", "grid", "line", (0, y, COLS * CELL, y), fill="#2e2e4e")
+        for x, y in segments:
+            scene.draw(f"snake{x}_{y}", "sprites", "rectangle",
+                       (x * CELL, y * CELL, (x + 1) * CELL, (y + 1) * CELL), fill="#00ffcc")
+        scene.draw("score", "hud", "text", (10, 10), text=f"Score: {frame}")
+        scene.commit()
+    return canvas.calls, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    print(f"Snake board {COLS}x{ROWS}, {FRAMES} frames: canvas calls per frame")
+    print(f"{'':10} {'create':>8} {'coords':>8} {'config':>8} {'delete':>8} {'ms/frame':>9}")
+    for name, run in (("immediate", run_immediate), ("scene", run_scene)):
+        calls, elapsed = run()
+        print(f"{name:10} {calls['create'] / FRAMES:8.1f} {calls['coords'] / FRAMES:8.1f} "
+              f"{calls['itemconfig'] / FRAMES:8.1f} {calls['delete'] / FRAMES:8.1f} {elapsed / FRAMES * 1000:9.3f}")
@@ -0,0 +1,65 @@
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from snake_body import SnakeBody
+
+TICKS = 2000
+
+
+def cycle(cols, rows):
+    # A Hamiltonian cycle of the grid (rows must be even): snake along the
+    # rows from column 1 onwards, then back up column 0
+    path = []
+    for y in range(rows):
+        xs = range(1, cols) if y % 2 == 0 else range(cols - 1, 0, -1)
+        path.extend((x, y) for x in xs)
+    path.extend((0, y) for y in range(rows - 1, -1, -1))
+    return path
+
+
+def run_body(cols, rows, length):
+    # Deque + occupancy set + free-cell array, moving along the cycle and
+    # spawning a fruit every tick
+    path = cycle(cols, rows)
+    body = SnakeBody(cols, rows, path[length - 1])
+    for i in range(length - 2, -1, -1):
+        body.move(path[i], grow=True)
+    rng = random.Random(0)
+    start = time.perf_counter()
+    for tick in range(TICKS):
+        head = path[-(tick + 1) % len(path)]
+        assert body.move(head)
+        body.spawn_fruit(rng)
+    return (time.perf_counter() - start) / TICKS
+
+
+def run_list(cols, rows, length):
+    # The old list body: insert at 0, copy-and-scan for self-collision and
+    # rejection-sample the fruit
+    path = cycle(cols, rows)
+    snake = [path[i] for i in range(length)]
+    rng = random.Random(0)
+    start = time.perf_counter()
+    for tick in range(TICKS):
+        head = path[-(tick + 1) % len(path)]
+        snake.insert(0, head)
+        snake.pop()
+        assert head not in snake[1:]
+        while True:
+            fruit = (rng.randint(0, cols - 1), rng.randint(0, rows - 1))
+            if fruit not in snake:
+                break
+    return (time.perf_counter() - start) / TICKS
+
+
+if __name__ == "__main__":
+    cols = rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    print(f"{cols}x{rows} grid, {TICKS} ticks per run, microseconds per tick")
+    print(f"{'fill':>6} {'deque+set':>12} {'list':>12}")
+    for fill in (0.1, 0.5, 0.9, 0.95):
+        length = int(cols * rows * fill)
+        print(f"{fill:6.0%} {run_body(cols, rows, length) * 1e6:12.1f} {run_list(cols, rows, length) * 1e6:12.1f}")
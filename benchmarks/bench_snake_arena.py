@@ -0,0 +1,28 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from snake_arena import SnakeArena
+
+TICKS = 300
+# Frame budget at the fastest snake speed (20 fps)
+FRAME_BUDGET_MS = 50
+
+
+if __name__ == "__main__":
+    counts = [int(arg) for arg in sys.argv[1:]] or [100, 300, 500]
+    print(f"200x200 arena, {TICKS} ticks, all snakes on autopilot")
+    for bots in counts:
+        arena = SnakeArena(bots=bots, fruits=500, seed=1)
+        arena.add_snake(player=True)
+        times = []
+        deaths = 0
+        for _ in range(TICKS):
+            start = time.perf_counter()
+            deaths += arena.tick()
+            times.append((time.perf_counter() - start) * 1000)
+        times.sort()
+        print(f"{bots:4} bots: mean {sum(times) / TICKS:5.1f} ms  p95 {times[int(TICKS * 0.95)]:5.1f} ms  "
+              f"max {times[-1]:5.1f} ms  (budget {FRAME_BUDGET_MS} ms)  deaths {deaths}")
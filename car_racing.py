@@ -1,11 +1,14 @@
 import tkinter as tk
 from tkinter import messagebox
-import random
-from PIL import Image, ImageTk
-import os
+from PIL import Image, ImageDraw
 from db_config import get_db_connection
 import datetime
-import winsound
+from car_racing_engine import CarRacingEngine
+from utils.scene import Scene
+from utils.compositor import Compositor
+from utils.game_loop import GameLoop
+from utils.sound import get_sound
+from utils.assets import get_assets
 
 class CarRacingGame:
     def __init__(self, parent, difficulty, username):
@@ -20,25 +23,22 @@ class CarRacingGame:
 
         self.canvas = tk.Canvas(self.window, bg="#1a1a2e", highlightthickness=0)
         self.canvas.pack(fill="both", expand=True)
+        self.scene = Scene(self.canvas, ["background", "road", "cars", "hud"], "Car Racing")
 
         self.width, self.height = 500, 700
-        self.road_rect = [self.width // 5, 0, self.width * 3 // 5, self.height]
-        self.player_car = {'x': self.width // 2 - 25, 'y': self.height - 120}
-        self.opponent_cars = [{'x': random.randint(self.road_rect[0], self.road_rect[0] + self.road_rect[2] - 50), 'y': -100}]
-        self.speed = {'easy': 5, 'medium': 10, 'hard': 15}[difficulty]
-        self.spawn_interval = {'easy': 60, 'medium': 45, 'hard': 30}[difficulty]
-        self.spawn_timer = 0
-        self.score = 0
+        # The rules and all game state; this class only draws it and feeds it keys
+        self.engine = CarRacingEngine(difficulty, self.width, self.height)
         self.state = "menu"
-        self.speed_increase = 0
-        self.lane_offset = 0
         self.fps = 60
-        self.running = True
-        self.lane_pulse = 0
+        # Fixed 60 steps a second; renders are skipped rather than slowing the game when behind
+        self.loop = GameLoop(self.window, self.update, self.render, self.fps)
 
-        self.image_cache = {}
-        self.photo_images = {}
+        # Tones play without blocking the loop
+        self.sound = get_sound()
+        self.assets = get_assets()
         self.load_images()
+        # Verge, road and grass as one image per window size
+        self.backgrounds = Compositor(self.render_background)
 
         self.font_size = max(16, self.width // 30)
 
@@ -46,37 +46,14 @@ class CarRacingGame:
         self.window.bind("<KeyPress>", self.on_key_press)
         self.window.bind("<KeyRelease>", self.on_key_release)
 
-        self.move_left = False
-        self.move_right = False
-
         self.draw_menu()
-        self.update()
+        self.loop.start()
 
     def load_images(self):
-        image_paths = {
-            'car_img': os.path.join('assets', 'car.png'),
-            'enemy_img': os.path.join('assets', 'enemy_car.png'),
-            'grass_img': os.path.join('assets', 'grass.png')
-        }
-        for key, path in image_paths.items():
-            try:
-                if os.path.exists(path):
-                    img = Image.open(path)
-                else:
-                    raise FileNotFoundError(f"{path} not found")
-                if key in ['car_img', 'enemy_img']:
-                    img = img.resize((50, 100), Image.LANCZOS)
-                else:
-                    img = img.resize((150, 150), Image.LANCZOS)
-                self.image_cache[key] = img
-                self.photo_images[key] = ImageTk.PhotoImage(img)
-            except Exception as e:
-                print(f"Failed to load {key}: {e}")
-                self.image_cache[key] = None
-                self.photo_images[key] = None
-        self.car_img = self.photo_images.get('car_img')
-        self.enemy_img = self.photo_images.get('enemy_img')
-        self.grass_img = self.photo_images.get('grass_img')
+        # Scaled sprites from the shared asset cache; a missing file gets a placeholder box
+        size = (self.width // 10, self.width // 5)
+        self.car_img = self.assets.photo('car.png', size, ("#ff0066", "#00ffcc"))
+        self.enemy_img = self.assets.photo('enemy_car.png', size, ("#ffcc00", "#00ffcc"))
 
     def save_score(self):
         if not self.username:
@@ -90,7 +67,7 @@ class CarRacingGame:
                 cursor.execute(
                     "INSERT INTO game_scores (user_id, game_name, difficulty_level, score, played_at) "
                     "VALUES (%s, %s, %s, %s, %s)",
-                    (user_id[0], "Car Racing", self.difficulty, self.score, datetime.datetime.now())
+                    (user_id[0], "Car Racing", self.difficulty, self.engine.score, datetime.datetime.now())
                 )
                 conn.commit()
             cursor.close()
@@ -101,21 +78,10 @@ class CarRacingGame:
     def on_resize(self, event):
         self.width = self.canvas.winfo_width()
         self.height = self.canvas.winfo_height()
-        self.road_rect = [self.width // 5, 0, self.width * 3 // 5, self.height]
-        self.player_car['x'] = max(self.road_rect[0], min(self.player_car['x'], self.road_rect[0] + self.road_rect[2] - self.width // 10))
-        self.player_car['y'] = self.height - 120
+        self.engine.resize(self.width, self.height)
         self.font_size = max(16, self.width // 30)
 
-        for key, img in self.image_cache.items():
-            if img:
-                if key in ['car_img', 'enemy_img']:
-                    size = (self.width // 10, self.width // 5)
-                else:
-                    size = (self.width // 5, self.width // 5)
-                self.photo_images[key] = ImageTk.PhotoImage(img.resize(size, Image.LANCZOS))
-        self.car_img = self.photo_images.get('car_img')
-        self.enemy_img = self.photo_images.get('enemy_img')
-        self.grass_img = self.photo_images.get('grass_img')
+        self.load_images()
 
         if self.state == "menu":
             self.draw_menu()
@@ -126,123 +92,110 @@ class CarRacingGame:
 
     def on_key_press(self, event):
         if event.keysym == "Escape":
-            self.running = False
+            self.loop.stop()
             self.save_score()
             self.window.destroy()
         elif self.state == "menu":
             if event.keysym == "space":
-                try:
-                    winsound.Beep(1000, 100)
-                except:
-                    pass
+                self.sound.play(1000, 100)
                 self.state = "playing"
                 self.draw_game()
         elif self.state == "gameover":
             if event.keysym == "r":
-                try:
-                    winsound.Beep(1000, 100)
-                except:
-                    pass
+                self.sound.play(1000, 100)
                 self.reset()
         elif self.state == "playing":
-            if event.keysym == "Left":
-                self.move_left = True
+            if event.keysym == "p":
+                self.loop.toggle_pause()
+            elif event.keysym == "Left":
+                self.engine.move_left = True
             elif event.keysym == "Right":
-                self.move_right = True
+                self.engine.move_right = True
 
     def on_key_release(self, event):
         if event.keysym == "Left":
-            self.move_left = False
+            self.engine.move_left = False
         elif event.keysym == "Right":
-            self.move_right = False
+            self.engine.move_right = False
 
     def reset(self):
-        self.player_car = {'x': self.width // 2 - self.width // 20, 'y': self.height - 120}
-        self.opponent_cars = [{'x': random.randint(self.road_rect[0], self.road_rect[0] + self.road_rect[2] - self.width // 10), 'y': -100}]
-        self.score = 0
-        self.spawn_timer = 0
-        self.spawn_interval = {'easy': 60, 'medium': 45, 'hard': 30}[self.difficulty]
-        self.speed_increase = 0
-        self.lane_offset = 0
+        self.engine.reset()
         self.state = "playing"
         self.draw_game()
 
+    def render_background(self, width, height, theme):
+        # Everything under the lane markings: verge, road, grass tiles and their grid
+        image = Image.new("RGB", (width, height), "#646464")
+        draw = ImageDraw.Draw(image)
+        draw.rectangle((width // 5, 0, width // 5 + width * 3 // 5, height), fill="#1a1a2e", outline="#00ffcc", width=3)
+        tile = max(1, width // 5)
+        grass = self.assets.source('grass.png').resize((tile, tile), Image.LANCZOS) if theme == "grass" else None
+        for y in range(0, height, tile):
+            for x in (0, width * 4 // 5):
+                if grass:
+                    image.paste(grass, (x, y))
+                else:
+                    draw.rectangle((x, y, x + tile, y + tile), fill="#228B22", outline="#000000")
+        # Add grid overlay on grass
+        for x in range(0, width // 5, 20):
+            draw.line((x, 0, x, height), fill="#2e2e4e", width=1)
+            draw.line((width * 4 // 5 + x, 0, width * 4 // 5 + x, height), fill="#2e2e4e", width=1)
+        for y in range(0, height, 20):
+            draw.line((0, y, width // 5, y), fill="#2e2e4e", width=1)
+            draw.line((width * 4 // 5, y, width, y), fill="#2e2e4e", width=1)
+        return image
+
     def draw_road(self):
-        self.canvas.delete("all")
-        self.canvas.create_rectangle(0, 0, self.width, self.height, fill="#646464")
-        self.canvas.create_rectangle(
-            self.road_rect[0], self.road_rect[1],
-            self.road_rect[0] + self.road_rect[2], self.road_rect[3],
-            fill="#1a1a2e", outline="#00ffcc", width=3
-        )
-        self.lane_offset = (self.lane_offset + 5) % 35
-        self.lane_pulse = (self.lane_pulse + 1) % 20
-        lane_color = "#ffffff" if self.lane_pulse < 10 else "#cccccc"
-        for y in range(-int(self.lane_offset), self.height, 35):
-            self.canvas.create_line(
-                self.road_rect[0] + self.road_rect[2] // 2, y,
-                self.road_rect[0] + self.road_rect[2] // 2, y + 20,
+        scene = self.scene
+        theme = "grass" if self.assets.source('grass.png') else "plain"
+        background = self.backgrounds.get(max(1, self.width), max(1, self.height), theme)
+        scene.draw("background", "background", "image", (0, 0), image=background, anchor="nw")
+        road_rect = self.engine.road_rect
+        lane_color = "#ffffff" if self.engine.lane_pulse < 10 else "#cccccc"
+        for i, y in enumerate(range(-int(self.engine.lane_offset), self.height, 35)):
+            scene.draw(
+                f"mark{i}", "road", "line", (road_rect[0] + road_rect[2] // 2, y, road_rect[0] + road_rect[2] // 2, y + 20),
                 fill=lane_color, width=5
             )
 
-    def draw_grass(self):
-        for y in range(0, self.height, self.width // 5):
-            if self.grass_img:
-                self.canvas.create_image(0, y, image=self.grass_img, anchor="nw")
-                self.canvas.create_image(self.width * 4 // 5, y, image=self.grass_img, anchor="nw")
-            else:
-                self.canvas.create_rectangle(
-                    0, y, self.width // 5, y + self.width // 5, fill="#228B22"
-                )
-                self.canvas.create_rectangle(
-                    self.width * 4 // 5, y, self.width, y + self.width // 5, fill="#228B22"
-                )
-        # Add grid overlay on grass
-        for x in range(0, self.width // 5, 20):
-            self.canvas.create_line(x, 0, x, self.height, fill="#2e2e4e", width=1)
-            self.canvas.create_line(self.width * 4 // 5 + x, 0, self.width * 4 // 5 + x, self.height, fill="#2e2e4e", width=1)
-        for y in range(0, self.height, 20):
-            self.canvas.create_line(0, y, self.width // 5, y, fill="#2e2e4e", width=1)
-            self.canvas.create_line(self.width * 4 // 5, y, self.width, y, fill="#2e2e4e", width=1)
-
     def draw_ui(self):
-        self.canvas.create_text(
-            10, 10, text=f"Score: {self.score}", fill="#ffcc00",
-            font=("Arial Black", self.font_size, "bold"), anchor="nw", tag="score"
+        self.scene.draw(
+            "score", "hud", "text", (10, 10), text=f"Score: {self.engine.score}", fill="#ffcc00",
+            font=("Arial Black", self.font_size, "bold"), anchor="nw"
         )
 
     def draw_menu(self):
-        self.canvas.delete("all")
-        self.canvas.create_rectangle(0, 0, self.width, self.height, fill="#1a1a2e")
-        self.canvas.create_text(
-            self.width // 2, 200, text="Car Racing Game", fill="#00ffcc",
-            font=("Impact", self.font_size + 4, "bold"), anchor="center", tag="text1"
+        self.scene.draw("backdrop", "background", "rectangle", (0, 0, self.width, self.height), fill="#1a1a2e")
+        self.scene.draw(
+            "text1", "hud", "text", (self.width // 2, 200), text="Car Racing Game", fill="#00ffcc",
+            font=("Impact", self.font_size + 4, "bold"), anchor="center"
         )
-        self.canvas.create_text(
-            self.width // 2, 250, text="Press [SPACE] to Start", fill="#ffcc00",
-            font=("Arial Black", self.font_size, "bold"), anchor="center", tag="text2"
+        self.scene.draw(
+            "text2", "hud", "text", (self.width // 2, 250), text="Press [SPACE] to Start", fill="#ffcc00",
+            font=("Arial Black", self.font_size, "bold"), anchor="center"
         )
-        self.canvas.create_text(
-            self.width // 2, 290, text="Press [ESC] to Quit", fill="#ffcc00",
-            font=("Arial Black", self.font_size, "bold"), anchor="center", tag="text3"
+        self.scene.draw(
+            "text3", "hud", "text", (self.width // 2, 290), text="Press [ESC] to Quit", fill="#ffcc00",
+            font=("Arial Black", self.font_size, "bold"), anchor="center"
         )
+        self.scene.commit()
         self.animate_text()
 
     def draw_gameover(self):
-        self.canvas.delete("all")
-        self.canvas.create_rectangle(0, 0, self.width, self.height, fill="#1a1a2e")
-        self.canvas.create_text(
-            self.width // 2, 200, text="Game Over!", fill="#ff0066",
-            font=("Impact", self.font_size + 4, "bold"), anchor="center", tag="text1"
+        self.scene.draw("backdrop", "background", "rectangle", (0, 0, self.width, self.height), fill="#1a1a2e")
+        self.scene.draw(
+            "text1", "hud", "text", (self.width // 2, 200), text="Game Over!", fill="#ff0066",
+            font=("Impact", self.font_size + 4, "bold"), anchor="center"
         )
-        self.canvas.create_text(
-            self.width // 2, 250, text=f"Score: {self.score}", fill="#00ffcc",
-            font=("Arial Black", self.font_size, "bold"), anchor="center", tag="text2"
+        self.scene.draw(
+            "text2", "hud", "text", (self.width // 2, 250), text=f"Score: {self.engine.score}", fill="#00ffcc",
+            font=("Arial Black", self.font_size, "bold"), anchor="center"
         )
-        self.canvas.create_text(
-            self.width // 2, 290, text="Press [R] to Retry or [ESC] to Quit", fill="#ffcc00",
-            font=("Arial Black", self.font_size, "bold"), anchor="center", tag="text3"
+        self.scene.draw(
+            "text3", "hud", "text", (self.width // 2, 290), text="Press [R] to Retry or [ESC] to Quit",
+            fill="#ffcc00", font=("Arial Black", self.font_size, "bold"), anchor="center"
         )
+        self.scene.commit()
         self.animate_text()
 
     def animate_text(self):
@@ -251,87 +204,52 @@ class CarRacingGame:
             current_color = self.canvas.itemcget("text1", "fill") if self.canvas.find_withtag("text1") else colors[0]
             next_color = colors[1] if current_color == colors[0] else colors[0]
             for tag in ["text1", "text2", "text3"]:
-                if self.canvas.find_withtag(tag):
-                    self.canvas.itemconfig(tag, fill=next_color)
+                self.scene.config(tag, fill=next_color)
             self.window.after(1000, self.animate_text)
 
-    def draw_game(self):
+    def draw_game(self, alpha=0.0):
+        # Canvas items are created once and then only moved; an opponent's
+        # sprite is named by its slot in the store. alpha is how far the
+        # loop is into the next step, so cars are drawn that much further on.
         self.draw_road()
-        self.draw_grass()
-        if self.car_img:
-            self.canvas.create_image(
-                self.player_car['x'] + self.width // 20, self.player_car['y'] + self.width // 10,
-                image=self.car_img, anchor="center"
-            )
-        else:
-            self.canvas.create_rectangle(
-                self.player_car['x'], self.player_car['y'],
-                self.player_car['x'] + self.width // 10, self.player_car['y'] + self.width // 5,
-                fill="#ff0066", outline="#00ffcc"
+        px, py = self.engine.player_car['x'], self.engine.player_car['y']
+        self.scene.draw(
+            "player", "cars", "image", (px + self.width // 20, py + self.width // 10),
+            image=self.car_img, anchor="center"
+        )
+        cars = self.engine.opponent_cars
+        slots = cars.active()
+        ys = cars.y[slots] + alpha * (cars.speed[slots] + self.engine.speed_increase)
+        for slot, x, y in zip(slots.tolist(), cars.x[slots].tolist(), ys.tolist()):
+            self.scene.draw(
+                f"car{slot}", "cars", "image", (x + self.width // 20, y + self.width // 10),
+                image=self.enemy_img, anchor="center"
             )
-        for car in self.opponent_cars:
-            if self.enemy_img:
-                self.canvas.create_image(
-                    car['x'] + self.width // 20, car['y'] + self.width // 10,
-                    image=self.enemy_img, anchor="center"
-                )
-            else:
-                self.canvas.create_rectangle(
-                    car['x'], car['y'],
-                    car['x'] + self.width // 10, car['y'] + self.width // 5,
-                    fill="#ffcc00", outline="#00ffcc"
-                )
         self.draw_ui()
+        if self.loop.paused:
+            self.scene.draw(
+                "paused", "hud", "text", (self.width // 2, self.height // 2), text="Paused - [P] to Resume",
+                fill="#ffcc00", font=("Arial Black", self.font_size, "bold"), anchor="center"
+            )
+        self.scene.commit()
 
-    def spawn_enemy(self):
-        lanes = [self.road_rect[0] + i * (self.road_rect[2] // 3) for i in range(3)]
-        x = random.choice([l for l in lanes if all(abs(l - car['x']) > self.width // 10 for car in self.opponent_cars)])
-        self.opponent_cars.append({'x': x, 'y': -100})
-
-    def check_collision(self):
-        player_rect = [self.player_car['x'], self.player_car['y'], self.width // 10, self.width // 5]
-        for car in self.opponent_cars:
-            enemy_rect = [car['x'], car['y'], self.width // 10, self.width // 5]
-            if (abs(player_rect[0] - enemy_rect[0]) < player_rect[2] and
-                abs(player_rect[1] - enemy_rect[1]) < player_rect[3]):
-                try:
-                    winsound.Beep(800, 200)
-                except:
-                    pass
-                self.state = "gameover"
-                self.draw_gameover()
-
-    def update(self):
-        if not self.running:
+    def game_over(self):
+        # Ends the run once, however many cars were hit in the frame
+        if self.state != "playing":
             return
+        self.sound.play(800, 200)
+        self.state = "gameover"
+        self.draw_gameover()
 
+    def render(self, alpha):
+        # Menu and game over screens are drawn once, when they are entered
         if self.state == "playing":
-            if self.move_left and self.player_car['x'] > self.road_rect[0]:
-                self.player_car['x'] -= 7
-            if self.move_right and self.player_car['x'] < self.road_rect[0] + self.road_rect[2] - self.width // 10:
-                self.player_car['x'] += 7
+            self.draw_game(alpha)
 
-            for car in self.opponent_cars[:]:
-                car['y'] += self.speed + self.speed_increase
-                if car['y'] > self.height:
-                    self.opponent_cars.remove(car)
-                    self.score += {'easy': 10, 'medium': 15, 'hard': 20}[self.difficulty]
-                    try:
-                        winsound.Beep(1200, 100)
-                    except:
-                        pass
-
-            self.spawn_timer += 1
-            if self.spawn_timer >= self.spawn_interval:
-                self.spawn_enemy()
-                self.spawn_timer = 0
-                if self.spawn_interval > 30:
-                    self.spawn_interval -= 1
-                    self.speed_increase += 0.1
-
-            self.score += 1
-            self.check_collision()
-
-            self.draw_game()
-
-        self.window.after(1000 // self.fps, self.update)
\ No newline at end of file
+    def update(self):
+        if self.state == "playing":
+            events = self.engine.step()
+            if 'crash' in events:
+                self.game_over()
+            elif 'pass' in events:
+                self.sound.play(1200, 100)
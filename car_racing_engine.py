@@ -0,0 +1,135 @@
+import random
+import numpy as np
+from utils.entities import EntityStore
+from utils.collision import BroadPhase, swept_aabb
+
+# Most opponent cars alive at once
+MAX_OPPONENTS = 512
+# Opponents drive at their own speed, up to this much either side of the base speed
+SPEED_SPREAD = 0.25
+LANES = 3
+# Base opponent speed, starting spawn interval and points per car passed, per difficulty
+SPEEDS = {'easy': 5, 'medium': 10, 'hard': 15}
+SPAWN_INTERVALS = {'easy': 60, 'medium': 45, 'hard': 30}
+PASS_POINTS = {'easy': 10, 'medium': 15, 'hard': 20}
+# Pixels the player moves sideways per step
+PLAYER_STEP = 7
+# Opponents appear this far above the top edge
+SPAWN_Y = -100
+
+
+class CarRacingEngine:
+    # The rules of Car Racing with no Tk: state plus step(), in playfield
+    # pixels. All randomness comes from one seeded Random, so a seed and the
+    # steering inputs replay a game exactly. step() returns the events of the
+    # tick ('pass', 'crash') for the view to play sounds on.
+    def __init__(self, difficulty, width=500, height=700, seed=None):
+        self.difficulty = difficulty
+        self.speed = SPEEDS[difficulty]
+        self.rng = random.Random(seed)
+        # Opponents: x/y position, own speed and lane, as one array per field
+        self.opponent_cars = EntityStore(MAX_OPPONENTS, {'x': np.float64, 'y': np.float64, 'speed': np.float64,
+                                                          'lane': np.int32})
+        self.player_car = None
+        self.resize(width, height)
+        self.reset()
+
+    def resize(self, width, height):
+        self.width, self.height = width, height
+        self.road_rect = [width // 5, 0, width * 3 // 5, height]
+        self.car_w, self.car_h = width // 10, width // 5
+        if self.player_car is not None:
+            self.player_car['x'] = max(self.road_rect[0], min(self.player_car['x'],
+                                                              self.road_rect[0] + self.road_rect[2] - self.car_w))
+            self.player_car['y'] = height - 120
+
+    def reset(self):
+        self.player_car = {'x': self.width // 2 - self.width // 20, 'y': self.height - 120}
+        self.opponent_cars.clear()
+        self.opponent_cars.spawn(x=self.rng.randint(self.road_rect[0], self.road_rect[0] + self.road_rect[2] - self.car_w),
+                                 y=SPAWN_Y, speed=self.speed, lane=-1)
+        self.score = 0
+        self.spawn_timer = 0
+        self.spawn_interval = SPAWN_INTERVALS[self.difficulty]
+        self.speed_increase = 0
+        self.lane_offset = 0
+        self.lane_pulse = 0
+        self.move_left = False
+        self.move_right = False
+        self.over = False
+        self.ticks = 0
+
+    def build_grid(self, cell_h):
+        # Broad phase over the opponents: one column per lane, rows of cell_h
+        cars = self.opponent_cars
+        grid = BroadPhase(self.road_rect[2] // LANES, cell_h, self.road_rect[0], LANES)
+        return grid.build(cars.x, cars.y, cars.alive)
+
+    def spawn_enemy(self):
+        cars = self.opponent_cars
+        lane_width = self.road_rect[2] // LANES
+        grid = self.build_grid(self.car_h)
+        open_lanes = []
+        for lane in range(LANES):
+            lane_x = self.road_rect[0] + lane * lane_width
+            near = grid.query(lane_x, SPAWN_Y, lane_x + self.car_w, self.height)
+            in_lane = near[np.abs(cars.x[near] - lane_x) < self.car_w]
+            # A lane is free once its last car has cleared the spawn point
+            if not (cars.y[in_lane] < self.car_h).any():
+                open_lanes.append((lane, in_lane))
+        if not open_lanes:
+            return
+        lane, in_lane = self.rng.choice(open_lanes)
+        speed = self.speed * self.rng.uniform(1 - SPEED_SPREAD, 1 + SPEED_SPREAD)
+        if len(in_lane):
+            # Never faster than the cars ahead in the same lane, so they cannot overlap
+            speed = min(speed, cars.speed[in_lane].min())
+        cars.spawn(x=self.road_rect[0] + lane * lane_width, y=SPAWN_Y, speed=speed, lane=lane)
+
+    def check_collision(self, start_x, motion):
+        # Swept test over the whole step, so fast cars cannot jump over the
+        # player between two steps. motion is how far each opponent moves.
+        cars = self.opponent_cars
+        car_w, car_h = self.car_w, self.car_h
+        x, y = self.player_car['x'], self.player_car['y']
+        reach = float(motion.max(initial=0))
+        grid = self.build_grid(car_h + reach)
+        near = grid.query(min(x, start_x), y, max(x, start_x) + car_w, y + car_h)
+        return any(swept_aabb(start_x, y, car_w, car_h, x - start_x, 0, cx, cy, car_w, car_h, 0, dy) is not None
+                   for cx, cy, dy in zip(cars.x[near].tolist(), cars.y[near].tolist(), motion[near].tolist()))
+
+    def step(self):
+        if self.over:
+            return []
+        self.ticks += 1
+        self.lane_offset = (self.lane_offset + 5) % 35
+        self.lane_pulse = (self.lane_pulse + 1) % 20
+        start_x = self.player_car['x']
+        if self.move_left and self.player_car['x'] > self.road_rect[0]:
+            self.player_car['x'] -= PLAYER_STEP
+        if self.move_right and self.player_car['x'] < self.road_rect[0] + self.road_rect[2] - self.car_w:
+            self.player_car['x'] += PLAYER_STEP
+
+        cars = self.opponent_cars
+        motion = np.where(cars.alive, cars.speed + self.speed_increase, 0)
+        if self.check_collision(start_x, motion):
+            # Ends the run once, however many cars were hit in the step
+            self.over = True
+            return ['crash']
+        events = []
+        cars.y += motion
+        passed = cars.despawn(cars.y > self.height)
+        if passed:
+            self.score += passed * PASS_POINTS[self.difficulty]
+            events.append('pass')
+
+        self.spawn_timer += 1
+        if self.spawn_timer >= self.spawn_interval:
+            self.spawn_enemy()
+            self.spawn_timer = 0
+            if self.spawn_interval > 30:
+                self.spawn_interval -= 1
+                self.speed_increase += 0.1
+
+        self.score += 1
+        return events
@@ -0,0 +1,271 @@
+import argparse
+import concurrent.futures
+import csv
+import datetime
+import json
+import math
+import multiprocessing
+import os
+import time
+import chess
+import chess.pgn
+from chess_engine import SearchEngine, TranspositionTable, MATE_SCORE
+from chess_tablebase import get_tablebase
+
+# Every finished game from ChessGame is appended here, next to this module whatever the working directory
+GAME_ARCHIVE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "chess_games.pgn")
+ANALYSIS_NODES = 20000
+ANALYSIS_TT_MB = 16
+# Positions per task, so long games spread over several workers
+CHUNK_SIZE = 16
+# Tasks in flight per worker; bounds memory however long the PGN is
+QUEUE_DEPTH = 4
+PROGRESS_INTERVAL = 10.0
+# Centipawn loss thresholds for one move
+INACCURACY, MISTAKE, BLUNDER = 50, 100, 300
+# Scores beyond this (mates) are clipped before computing losses
+MAX_CP = 1500
+
+CSV_FIELDS = ["game", "white", "black", "result", "difficulty", "plies",
+              "white_acpl", "white_accuracy", "white_inaccuracies", "white_mistakes", "white_blunders",
+              "black_acpl", "black_accuracy", "black_inaccuracies", "black_mistakes", "black_blunders"]
+
+
+def append_game(board, headers, path=GAME_ARCHIVE_PATH):
+    try:
+        game = chess.pgn.Game.from_board(board)
+        for name, value in headers.items():
+            game.headers[name] = value
+        game.headers["Date"] = datetime.date.today().strftime("%Y.%m.%d")
+        with open(path, "a") as archive:
+            print(game, file=archive, end="\n\n")
+    except Exception as e:
+        print(f"Failed to archive game: {e}")
+
+
+def iter_games(pgn_path, skip=0):
+    # Streams games one at a time, so memory stays flat for any file size.
+    # Games already analysed on an earlier run are skipped without parsing moves.
+    with open(pgn_path) as pgn:
+        for _ in range(skip):
+            if not chess.pgn.skip_game(pgn):
+                return
+        while True:
+            game = chess.pgn.read_game(pgn)
+            if game is None:
+                return
+            yield game
+
+
+# Per-process engine, set up once by _init_worker
+_engine = None
+
+
+def _init_worker(tt_size_mb):
+    global _engine
+    _engine = SearchEngine(tt=TranspositionTable(size_mb=tt_size_mb), tablebase=get_tablebase())
+
+
+def _analyse_chunk(index, fen, moves, start, end, nodes):
+    # Scores positions start..end of one game for the side to move. The board
+    # is rebuilt from the full move list so repetitions are still seen.
+    board = chess.Board(fen)
+    for uci in moves[:start]:
+        board.push_uci(uci)
+    scores = []
+    nodes_searched = 0
+    for ply in range(start, end):
+        if board.is_checkmate():
+            scores.append(-MATE_SCORE)
+        elif board.is_game_over():
+            scores.append(0)
+        else:
+            result = _engine.search(board, node_limit=nodes)
+            scores.append(result.score)
+            nodes_searched += result.nodes
+        if ply < len(moves):
+            board.push_uci(moves[ply])
+    return index, start, scores, nodes_searched
+
+
+def win_percent(cp):
+    return 50 + 50 * (2 / (1 + math.exp(-0.00368208 * cp)) - 1)
+
+
+def move_accuracy(before, after):
+    # Accuracy of one move from the mover's winning chances before and after it
+    drop = max(0.0, win_percent(before) - win_percent(after))
+    return max(0.0, min(100.0, 103.1668 * math.exp(-0.04354 * drop) - 3.1669))
+
+
+def game_stats(index, headers, scores):
+    # scores[i] is the search score of position i for the side to move, so the
+    # move played from it is worth -scores[i + 1] and loses their sum.
+    row = {
+        "game": index,
+        "white": headers.get("White", "?"),
+        "black": headers.get("Black", "?"),
+        "result": headers.get("Result", "*"),
+        "difficulty": headers.get("Difficulty", ""),
+        "plies": len(scores) - 1
+    }
+    for color, name in ((chess.WHITE, "white"), (chess.BLACK, "black")):
+        first = 0 if color == chess.WHITE else 1
+        losses, accuracies = [], []
+        for ply in range(first, len(scores) - 1, 2):
+            before = max(-MAX_CP, min(MAX_CP, scores[ply]))
+            after = max(-MAX_CP, min(MAX_CP, -scores[ply + 1]))
+            losses.append(max(0, before - after))
+            accuracies.append(move_accuracy(before, after))
+        row[f"{name}_acpl"] = round(sum(losses) / len(losses), 1) if losses else 0.0
+        row[f"{name}_accuracy"] = round(sum(accuracies) / len(accuracies), 1) if accuracies else 100.0
+        row[f"{name}_inaccuracies"] = sum(1 for loss in losses if INACCURACY <= loss < MISTAKE)
+        row[f"{name}_mistakes"] = sum(1 for loss in losses if MISTAKE <= loss < BLUNDER)
+        row[f"{name}_blunders"] = sum(1 for loss in losses if loss >= BLUNDER)
+    return row
+
+
+class ResultWriter:
+    # Appends one row per game, in game order, flushed as it goes. Reopening
+    # an existing file resumes after the last complete row.
+    def __init__(self, path, restart=False):
+        self.path = path
+        self.csv = path.endswith(".csv")
+        self.done = 0 if restart else self.count_existing()
+        self.file = open(path, "w" if restart else "a", newline="")
+        self.writer = None
+        if self.csv:
+            self.writer = csv.DictWriter(self.file, fieldnames=CSV_FIELDS)
+            # Only an empty file needs the header; one holding just the header already has it
+            if os.path.getsize(path) == 0:
+                self.writer.writeheader()
+                self.file.flush()
+
+    def count_existing(self):
+        if not os.path.exists(self.path):
+            return 0
+        with open(self.path, "rb") as existing:
+            data = existing.read()
+        # Drop a row cut off by an interrupted run
+        complete = data[:data.rfind(b"\n") + 1]
+        if len(complete) != len(data):
+            with open(self.path, "wb") as existing:
+                existing.write(complete)
+        rows = complete.count(b"\n")
+        if self.csv and rows:
+            rows -= 1
+        return rows
+
+    def write(self, row):
+        if self.csv:
+            self.writer.writerow(row)
+        else:
+            self.file.write(json.dumps(row) + "\n")
+        self.file.flush()
+        self.done += 1
+
+    def close(self):
+        self.file.close()
+
+
+def analyse_pgn(pgn_path, output_path, nodes=ANALYSIS_NODES, workers=None, restart=False):
+    workers = workers or os.cpu_count() or 1
+    writer = ResultWriter(output_path, restart)
+    if writer.done:
+        print(f"Resuming after {writer.done} games already in {output_path}")
+    games = enumerate(iter_games(pgn_path, writer.done), writer.done)
+    # Games being analysed: index -> [headers, scores, chunks still pending]
+    active = {}
+    next_write = writer.done
+    positions = total_nodes = 0
+    start = last_report = time.time()
+    context = multiprocessing.get_context("spawn")
+    pool = concurrent.futures.ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                                  initializer=_init_worker, initargs=(ANALYSIS_TT_MB,))
+    pending = set()
+    try:
+        chunks = _iter_chunks(games, active, nodes)
+        exhausted = False
+        while pending or not exhausted:
+            while not exhausted and len(pending) < workers * QUEUE_DEPTH:
+                task = next(chunks, None)
+                if task is None:
+                    exhausted = True
+                else:
+                    pending.add(pool.submit(_analyse_chunk, *task))
+            done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                index, chunk_start, scores, chunk_nodes = future.result()
+                game = active[index]
+                game[1][chunk_start:chunk_start + len(scores)] = scores
+                game[2] -= 1
+                positions += len(scores)
+                total_nodes += chunk_nodes
+            # Rows go out in game order, so the row count is the resume point
+            while next_write in active and active[next_write][2] == 0:
+                headers, scores, _ = active.pop(next_write)
+                writer.write(game_stats(next_write, headers, scores))
+                next_write += 1
+            if time.time() - last_report >= PROGRESS_INTERVAL:
+                last_report = time.time()
+                elapsed = last_report - start
+                print(f"{writer.done} games, {positions} positions, {positions / elapsed:.1f} positions/sec, "
+                      f"{total_nodes / elapsed:.0f} nodes/sec")
+    except KeyboardInterrupt:
+        print(f"Interrupted; rerun to resume after game {writer.done}")
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+        writer.close()
+    elapsed = time.time() - start
+    print(f"Analysed {writer.done} games, {positions} positions in {elapsed:.1f}s")
+    return writer.done
+
+
+def _iter_chunks(games, active, nodes):
+    for index, game in games:
+        fen = game.board().fen()
+        moves = [move.uci() for move in game.mainline_moves()]
+        # One score per position, including the final one
+        count = len(moves) + 1
+        chunk_starts = range(0, count, CHUNK_SIZE)
+        active[index] = [dict(game.headers), [0] * count, len(chunk_starts)]
+        for chunk_start in chunk_starts:
+            yield index, fen, moves, chunk_start, min(count, chunk_start + CHUNK_SIZE), nodes
+
+
+def summarize(output_path):
+    # Average accuracy and blunders per game for each difficulty, from the
+    # side of the human player (White in ChessGame)
+    totals = {}
+    with open(output_path, newline="") as results:
+        if output_path.endswith(".csv"):
+            rows = csv.DictReader(results)
+        else:
+            rows = (json.loads(line) for line in results)
+        for row in rows:
+            entry = totals.setdefault(row["difficulty"] or "unknown", [0, 0.0, 0])
+            entry[0] += 1
+            entry[1] += float(row["white_accuracy"])
+            entry[2] += int(row["white_blunders"])
+    for difficulty, (games, accuracy, blunders) in sorted(totals.items()):
+        print(f"{difficulty:10} {games:6} games  accuracy {accuracy / games:5.1f}  "
+              f"blunders/game {blunders / games:.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Batch-analyse chess games from a PGN file")
+    parser.add_argument("pgn", nargs="?", default=GAME_ARCHIVE_PATH)
+    parser.add_argument("--output", default="chess_analysis.jsonl", help=".jsonl or .csv")
+    parser.add_argument("--nodes", type=int, default=ANALYSIS_NODES, help="search nodes per position")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--restart", action="store_true", help="overwrite the output instead of resuming")
+    parser.add_argument("--summary", action="store_true", help="only print per-difficulty averages")
+    args = parser.parse_args(argv)
+
+    if not args.summary:
+        analyse_pgn(args.pgn, args.output, args.nodes, args.workers, args.restart)
+    summarize(args.output)
+
+
+if __name__ == "__main__":
+    main()
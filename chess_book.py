@@ -0,0 +1,117 @@
+import os
+import random
+import struct
+import sys
+import chess
+import chess.pgn
+import chess.polyglot
+
+BOOK_PATH = os.path.join("assets", "book.bin")
+BOOK_PGN_PATH = os.path.join("assets", "openings.pgn")
+# Only the first plies of each game go into a generated book
+BOOK_BUILD_PLY = 16
+
+# Per-difficulty book use: how deep into the game the book is trusted, and
+# how many of the most played moves are candidates (None = all of them)
+BOOK_LIMITS = {
+    'easy': {'max_ply': 4, 'top_moves': None},
+    'medium': {'max_ply': 10, 'top_moves': 3},
+    'hard': {'max_ply': 16, 'top_moves': 2}
+}
+
+# Polyglot entry: key, move, weight, learn
+ENTRY_STRUCT = struct.Struct(">QHHI")
+PROMOTION_CODES = {chess.KNIGHT: 1, chess.BISHOP: 2, chess.ROOK: 3, chess.QUEEN: 4}
+
+
+class OpeningBook:
+    # Polyglot book read through python-chess's mmap reader, so lookups are a
+    # binary search over the mapped file with nothing loaded up front.
+    def __init__(self, path=BOOK_PATH, rng=None):
+        self.path = path
+        self.reader = chess.polyglot.open_reader(path)
+        self.rng = rng or random.Random()
+
+    def choose(self, board, max_ply=None, top_moves=None):
+        ply = 2 * (board.fullmove_number - 1) + (board.turn == chess.BLACK)
+        if max_ply is not None and ply >= max_ply:
+            return None
+        entries = list(self.reader.find_all(board))
+        if not entries:
+            return None
+        if top_moves:
+            entries.sort(key=lambda entry: entry.weight, reverse=True)
+            entries = entries[:top_moves]
+        # Weighted random pick, so popular lines come up more often; a book
+        # that weights every move 0 still lists them, so pick one uniformly
+        total = sum(entry.weight for entry in entries)
+        if total == 0:
+            return self.rng.choice(entries).move
+        pick = self.rng.randint(0, total - 1)
+        for entry in entries:
+            pick -= entry.weight
+            if pick < 0:
+                return entry.move
+        return entries[-1].move
+
+    def close(self):
+        self.reader.close()
+
+
+_shared_book = None
+
+
+def get_opening_book(path=BOOK_PATH):
+    # One mapping per process, shared by every open chess window
+    global _shared_book
+    if _shared_book is None:
+        try:
+            _shared_book = OpeningBook(path)
+        except Exception as e:
+            print(f"Failed to open opening book {path}: {e}")
+            _shared_book = False
+    return _shared_book or None
+
+
+def encode_move(board, move):
+    # Polyglot stores castling as king-takes-rook (e1h1)
+    move = board._to_chess960(move)
+    raw = move.to_square | (move.from_square << 6)
+    if move.promotion:
+        raw |= PROMOTION_CODES[move.promotion] << 12
+    return raw
+
+
+def build_book(pgn_path=BOOK_PGN_PATH, book_path=BOOK_PATH, max_ply=BOOK_BUILD_PLY):
+    # Counts how often each move was played from each position in the PGN
+    # and writes the result as a sorted Polyglot book.
+    weights = {}
+    games = 0
+    with open(pgn_path) as pgn:
+        while True:
+            game = chess.pgn.read_game(pgn)
+            if game is None:
+                break
+            games += 1
+            board = game.board()
+            for ply, move in enumerate(game.mainline_moves()):
+                if ply >= max_ply:
+                    break
+                entry_key = (chess.polyglot.zobrist_hash(board), encode_move(board, move))
+                weights[entry_key] = weights.get(entry_key, 0) + 1
+                board.push(move)
+
+    top = max(weights.values(), default=1)
+    scale = 65535 / top if top > 65535 else 1
+    entries = sorted(weights.items(), key=lambda item: (item[0][0], -item[1]))
+    with open(book_path, "wb") as book:
+        for (key, raw_move), weight in entries:
+            book.write(ENTRY_STRUCT.pack(key, raw_move, max(1, int(weight * scale)), 0))
+    return games, len(entries)
+
+
+if __name__ == "__main__":
+    pgn_path = sys.argv[1] if len(sys.argv) > 1 else BOOK_PGN_PATH
+    book_path = sys.argv[2] if len(sys.argv) > 2 else BOOK_PATH
+    games, entries = build_book(pgn_path, book_path)
+    print(f"Wrote {entries} entries from {games} games to {book_path}")
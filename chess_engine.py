@@ -0,0 +1,418 @@
+import threading
+import time
+import chess
+import chess.polyglot
+from chess_eval import Evaluator, PIECE_VALUES, piece_changes
+
+MATE_SCORE = 100000
+MATE_THRESHOLD = MATE_SCORE - 1000
+INFINITY = 1000000
+MAX_PLY = 64
+
+# Difficulty maps to a search budget instead of a fixed depth
+SEARCH_LIMITS = {
+    'easy': {'time_limit': 0.15, 'node_limit': 2000, 'max_depth': 2},
+    'medium': {'time_limit': 0.75, 'node_limit': 30000, 'max_depth': 5},
+    'hard': {'time_limit': 2.0, 'node_limit': 300000, 'max_depth': MAX_PLY}
+}
+
+# How often (in nodes) the clock is checked during a search
+CHECK_INTERVAL = 1024
+
+# Transposition table bound types
+EXACT, LOWER, UPPER = 0, 1, 2
+# Rough size of one stored entry (tuple + ints + move) used for the memory cap
+TT_ENTRY_BYTES = 200
+TT_DEFAULT_MB = 32
+
+ZOBRIST = chess.polyglot.POLYGLOT_RANDOM_ARRAY
+_hasher = chess.polyglot.ZobristHasher(ZOBRIST)
+
+
+def zobrist_key(board):
+    return chess.polyglot.zobrist_hash(board)
+
+
+def push_with_key(board, key, move):
+    # Pushes the move and returns the child's Polyglot key, updated from the
+    # parent key instead of rehashing all 64 squares.
+    key ^= _hasher.hash_castling(board) ^ _hasher.hash_ep_square(board) ^ _hasher.hash_turn(board)
+    for piece_type, color, square, _ in piece_changes(board, move):
+        key ^= ZOBRIST[64 * ((piece_type - 1) * 2 + color) + square]
+    board.push(move)
+    return key ^ _hasher.hash_castling(board) ^ _hasher.hash_ep_square(board) ^ _hasher.hash_turn(board)
+
+
+def expected_reply(board, tt, move):
+    # The opponent's best reply after move, as left in the table by the search
+    board.push(move)
+    reply = tt.best_move(zobrist_key(board))
+    if reply is not None and not board.is_legal(reply):
+        reply = None
+    board.pop()
+    return reply
+
+
+def score_to_tt(score, ply):
+    # Mate scores are stored relative to the node, not the root
+    if score >= MATE_THRESHOLD:
+        return score + ply
+    if score <= -MATE_THRESHOLD:
+        return score - ply
+    return score
+
+
+def score_from_tt(score, ply):
+    if score >= MATE_THRESHOLD:
+        return score - ply
+    if score <= -MATE_THRESHOLD:
+        return score + ply
+    return score
+
+
+class TranspositionTable:
+    def __init__(self, size_mb=TT_DEFAULT_MB):
+        self.size = max(1024, int(size_mb * 1024 * 1024) // TT_ENTRY_BYTES)
+        self.slots = [None] * self.size
+        self.age = 0
+        self.probes = 0
+        self.hits = 0
+
+    def new_search(self):
+        # Entries from older searches are the first to be replaced
+        self.age = (self.age + 1) & 0xFF
+
+    def clear(self):
+        self.slots = [None] * self.size
+        self.age = 0
+
+    def probe(self, key):
+        self.probes += 1
+        entry = self.slots[key % self.size]
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry
+        return None
+
+    def store(self, key, depth, flag, score, move):
+        # Entry layout: (key, depth, flag, score, move, age)
+        index = key % self.size
+        entry = self.slots[index]
+        if entry is not None and entry[0] != key and entry[5] == self.age and entry[1] > depth:
+            return
+        if move is None and entry is not None and entry[0] == key:
+            move = entry[4]
+        self.slots[index] = (key, depth, flag, score, move, self.age)
+
+    def best_move(self, key):
+        entry = self.slots[key % self.size]
+        return entry[4] if entry is not None and entry[0] == key else None
+
+    def hashfull(self):
+        # Permille of the first 1000 slots used by the current search, as in UCI
+        sample = self.slots[:1000]
+        return sum(1 for entry in sample if entry is not None and entry[5] == self.age) * 1000 // len(sample)
+
+
+class SearchTimeout(Exception):
+    pass
+
+
+class SearchResult:
+    def __init__(self, move, score, depth, nodes, elapsed, ponder=None):
+        self.move = move
+        self.score = score
+        self.depth = depth
+        self.nodes = nodes
+        self.elapsed = elapsed
+        # Expected reply to move, if the search has one
+        self.ponder = ponder
+
+    @property
+    def nps(self):
+        return self.nodes / self.elapsed if self.elapsed > 0 else 0.0
+
+    def __repr__(self):
+        return (f"SearchResult(move={self.move}, score={self.score}, depth={self.depth}, "
+                f"nodes={self.nodes}, nps={self.nps:.0f})")
+
+
+class SearchEngine:
+    def __init__(self, evaluator=None, tt=None, tablebase=None):
+        self.evaluator = evaluator if evaluator is not None else Evaluator()
+        # Optional chess_tablebase.EndgameTablebase, probed at the root and in the tree
+        self.tablebase = tablebase
+        # The table outlives a single search so the next move starts warm
+        self.tt = tt if tt is not None else TranspositionTable()
+        self.killers = [[None, None] for _ in range(MAX_PLY + 1)]
+        self.history = {}
+        self.nodes = 0
+        self.deadline = None
+        self.node_limit = None
+        self.stop_event = None
+        self.search_start = 0.0
+
+    def search(self, board, time_limit=None, node_limit=None, max_depth=MAX_PLY, on_iteration=None,
+               stop_event=None, root_moves=None):
+        # Iterative deepening: every finished iteration leaves a usable best move,
+        # so the search can be cut off by the time or node budget at any point.
+        board = board.copy()
+        start = self.search_start = time.perf_counter()
+        self.nodes = 0
+        self.deadline = start + time_limit if time_limit else None
+        self.node_limit = node_limit
+        self.stop_event = stop_event
+        self.reset_heuristics()
+        self.tt.new_search()
+
+        root_key = zobrist_key(board)
+        root_state = self.evaluator.initial_state(board)
+        # Callers that already generated the legal moves can pass them in
+        if root_moves is None:
+            root_moves = board.legal_moves
+        root_moves = self.order_moves(board, root_moves, 0, self.tt.best_move(root_key))
+        if not root_moves:
+            return SearchResult(None, 0, 0, 0, 0.0)
+        if self.tablebase is not None:
+            tb_move = self.tablebase.root_move(board)
+            if tb_move is not None:
+                wdl = self.tablebase.probe_wdl(board, root_key)
+                score = self.tablebase.wdl_score(wdl, 0) if wdl is not None else 0
+                return SearchResult(tb_move, score, 0, 0, time.perf_counter() - start)
+        best_move, best_score, reached = root_moves[0], -INFINITY, 0
+        if len(root_moves) == 1:
+            max_depth = 1
+
+        root_ply = len(board.move_stack)
+        for depth in range(1, max_depth + 1):
+            try:
+                score, move = self.search_root(board, root_key, root_state, root_moves, depth)
+            except SearchTimeout:
+                # Unwind whatever the interrupted iteration left pushed
+                while len(board.move_stack) > root_ply:
+                    board.pop()
+                break
+            best_move, best_score, reached = move, score, depth
+            # Search the previous best move first on the next iteration
+            root_moves.remove(move)
+            root_moves.insert(0, move)
+            if on_iteration:
+                on_iteration(SearchResult(best_move, best_score, depth, self.nodes,
+                                          time.perf_counter() - start))
+            if abs(score) >= MATE_THRESHOLD:
+                break
+        return SearchResult(best_move, best_score, reached, self.nodes, time.perf_counter() - start,
+                            expected_reply(board, self.tt, best_move))
+
+    def reset_heuristics(self):
+        self.killers = [[None, None] for _ in range(MAX_PLY + 1)]
+        self.history.clear()
+
+    def search_move(self, board, move, depth, alpha, node_limit=None, stop_event=None):
+        # Searches a single root move with a lower bound found elsewhere (used
+        # by chess_parallel). Returns the score, which is only an upper bound
+        # when it is <= alpha, and the opponent's best reply from the table.
+        self.nodes = 0
+        self.deadline = None
+        self.node_limit = node_limit
+        self.stop_event = stop_event
+        key = zobrist_key(board)
+        child_state = self.evaluator.apply(board, self.evaluator.initial_state(board), move)
+        child_key = push_with_key(board, key, move)
+        try:
+            score = -self.negamax(board, child_key, child_state, depth - 1, -INFINITY, -alpha, 1)
+            reply = self.tt.best_move(child_key)
+        finally:
+            board.pop()
+        return score, reply
+
+    def close(self):
+        # Nothing to release for the in-process engine; see ParallelSearch.close
+        pass
+
+    def ponderhit(self, time_limit=None, node_limit=None, max_depth=None):
+        # Turns a running, unlimited ponder search into a normal one. Time and
+        # nodes already spent pondering count towards the budget, so a long
+        # ponder can answer straight away. max_depth was fixed at ponder start.
+        self.deadline = self.search_start + time_limit if time_limit else None
+        self.node_limit = node_limit
+
+    def search_root(self, board, root_key, root_state, root_moves, depth):
+        alpha, beta = -INFINITY, INFINITY
+        best_move = root_moves[0]
+        for move in root_moves:
+            child_state = self.evaluator.apply(board, root_state, move)
+            child_key = push_with_key(board, root_key, move)
+            try:
+                score = -self.negamax(board, child_key, child_state, depth - 1, -beta, -alpha, 1)
+            finally:
+                board.pop()
+            if score > alpha:
+                alpha = score
+                best_move = move
+        self.tt.store(root_key, depth, EXACT, alpha, best_move)
+        return alpha, best_move
+
+    def check_limits(self):
+        if self.nodes % CHECK_INTERVAL == 0:
+            if self.deadline is not None and time.perf_counter() >= self.deadline:
+                raise SearchTimeout()
+            if self.stop_event is not None and self.stop_event.is_set():
+                raise SearchTimeout()
+        if self.node_limit is not None and self.nodes >= self.node_limit:
+            raise SearchTimeout()
+
+    def is_draw(self, board):
+        if board.halfmove_clock >= 100:
+            return True
+        return board.halfmove_clock >= 4 and board.is_repetition(2)
+
+    def negamax(self, board, key, state, depth, alpha, beta, ply):
+        self.nodes += 1
+        self.check_limits()
+
+        if self.is_draw(board):
+            return 0
+        if self.tablebase is not None:
+            wdl = self.tablebase.probe_wdl(board, key)
+            if wdl is not None:
+                return self.tablebase.wdl_score(wdl, ply)
+        in_check = board.is_check()
+        if in_check and ply < MAX_PLY:
+            depth += 1
+        if depth <= 0 or ply >= MAX_PLY:
+            return self.quiescence(board, state, alpha, beta, ply)
+
+        tt_move = None
+        entry = self.tt.probe(key)
+        if entry is not None:
+            tt_move = entry[4]
+            if entry[1] >= depth:
+                score = score_from_tt(entry[3], ply)
+                flag = entry[2]
+                if flag == EXACT or (flag == LOWER and score >= beta) or (flag == UPPER and score <= alpha):
+                    return score
+
+        moves = self.order_moves(board, board.legal_moves, ply, tt_move)
+        if not moves:
+            return -(MATE_SCORE - ply) if in_check else 0
+
+        alpha_orig = alpha
+        best_score = -INFINITY
+        best_move = None
+        for move in moves:
+            capture = board.is_capture(move)
+            child_state = self.evaluator.apply(board, state, move)
+            child_key = push_with_key(board, key, move)
+            score = -self.negamax(board, child_key, child_state, depth - 1, -beta, -alpha, ply + 1)
+            board.pop()
+            if score > best_score:
+                best_score = score
+                best_move = move
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                if not capture:
+                    self.store_killer(move, ply)
+                    history_key = (board.turn, move.from_square, move.to_square)
+                    self.history[history_key] = self.history.get(history_key, 0) + depth * depth
+                break
+
+        if best_score <= alpha_orig:
+            flag = UPPER
+        elif best_score >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.tt.store(key, depth, flag, score_to_tt(best_score, ply), best_move)
+        return best_score
+
+    def quiescence(self, board, state, alpha, beta, ply):
+        self.nodes += 1
+        self.check_limits()
+
+        stand_pat = self.evaluator.score(state, board.turn)
+        if stand_pat >= beta or ply >= MAX_PLY:
+            return stand_pat
+        if stand_pat > alpha:
+            alpha = stand_pat
+
+        for move in self.order_captures(board, board.generate_legal_captures()):
+            child_state = self.evaluator.apply(board, state, move)
+            board.push(move)
+            score = -self.quiescence(board, child_state, -beta, -alpha, ply + 1)
+            board.pop()
+            if score >= beta:
+                return score
+            if score > alpha:
+                alpha = score
+        return alpha
+
+    def store_killer(self, move, ply):
+        killers = self.killers[ply]
+        if killers[0] != move:
+            killers[1] = killers[0]
+            killers[0] = move
+
+    def mvv_lva(self, board, move):
+        victim = chess.PAWN if board.is_en_passant(move) else board.piece_type_at(move.to_square)
+        attacker = board.piece_type_at(move.from_square)
+        return PIECE_VALUES.get(victim, 0) * 10 - PIECE_VALUES.get(attacker, 0) // 10
+
+    def order_captures(self, board, moves):
+        return sorted(moves, key=lambda move: self.mvv_lva(board, move), reverse=True)
+
+    def order_moves(self, board, moves, ply, first=None):
+        # Ordering: hash/PV move, captures by MVV-LVA, promotions, killers, history
+        killers = self.killers[ply] if ply <= MAX_PLY else (None, None)
+        turn = board.turn
+        scored = []
+        for move in moves:
+            if move == first:
+                score = 10 ** 9
+            elif board.is_capture(move):
+                score = 10 ** 8 + self.mvv_lva(board, move)
+            elif move.promotion:
+                score = 10 ** 8 - 1 + PIECE_VALUES[move.promotion]
+            elif move == killers[0]:
+                score = 10 ** 7
+            elif move == killers[1]:
+                score = 10 ** 7 - 1
+            else:
+                score = self.history.get((turn, move.from_square, move.to_square), 0)
+            scored.append((score, move))
+        scored.sort(key=lambda item: item[0], reverse=True)
+        return [move for _, move in scored]
+
+
+class SearchWorker:
+    # Runs one search on a background thread so the Tk loop keeps running.
+    # The caller polls done() from the Tk thread and reads result afterwards.
+    def __init__(self, engine, board, limits):
+        self.engine = engine
+        self.stop_event = threading.Event()
+        self.result = None
+        self.error = None
+        self.thread = threading.Thread(target=self.run, args=(board.copy(), limits), daemon=True)
+        self.thread.start()
+
+    def run(self, board, limits):
+        try:
+            self.result = self.engine.search(board, stop_event=self.stop_event, **limits)
+        except Exception as e:
+            self.error = e
+
+    def done(self):
+        return not self.thread.is_alive()
+
+    def cancel(self):
+        self.stop_event.set()
+
+    def stop(self):
+        # Cancel and wait, so the engine is free for the next search
+        self.stop_event.set()
+        self.thread.join()
+
+    @property
+    def cancelled(self):
+        return self.stop_event.is_set()
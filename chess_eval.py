@@ -0,0 +1,254 @@
+import random
+import chess
+
+PIECE_VALUES = {
+    chess.PAWN: 100,
+    chess.KNIGHT: 320,
+    chess.BISHOP: 330,
+    chess.ROOK: 500,
+    chess.QUEEN: 900,
+    chess.KING: 0
+}
+# Plain pawn-unit material, as stored with Chess scores
+MATERIAL_POINTS = {chess.PAWN: 1, chess.KNIGHT: 3, chess.BISHOP: 3, chess.ROOK: 5, chess.QUEEN: 9, chess.KING: 0}
+
+# Game phase weights: 24 with all minor/major pieces on the board, 0 in a pawn ending
+PHASE_WEIGHTS = {chess.PAWN: 0, chess.KNIGHT: 1, chess.BISHOP: 1, chess.ROOK: 2, chess.QUEEN: 4, chess.KING: 0}
+MAX_PHASE = 24
+
+# Piece-square tables from White's point of view, written rank 8 first
+PAWN_TABLE = [
+    0, 0, 0, 0, 0, 0, 0, 0,
+    50, 50, 50, 50, 50, 50, 50, 50,
+    10, 10, 20, 30, 30, 20, 10, 10,
+    5, 5, 10, 25, 25, 10, 5, 5,
+    0, 0, 0, 20, 20, 0, 0, 0,
+    5, -5, -10, 0, 0, -10, -5, 5,
+    5, 10, 10, -20, -20, 10, 10, 5,
+    0, 0, 0, 0, 0, 0, 0, 0
+]
+KNIGHT_TABLE = [
+    -50, -40, -30, -30, -30, -30, -40, -50,
+    -40, -20, 0, 0, 0, 0, -20, -40,
+    -30, 0, 10, 15, 15, 10, 0, -30,
+    -30, 5, 15, 20, 20, 15, 5, -30,
+    -30, 0, 15, 20, 20, 15, 0, -30,
+    -30, 5, 10, 15, 15, 10, 5, -30,
+    -40, -20, 0, 5, 5, 0, -20, -40,
+    -50, -40, -30, -30, -30, -30, -40, -50
+]
+BISHOP_TABLE = [
+    -20, -10, -10, -10, -10, -10, -10, -20,
+    -10, 0, 0, 0, 0, 0, 0, -10,
+    -10, 0, 5, 10, 10, 5, 0, -10,
+    -10, 5, 5, 10, 10, 5, 5, -10,
+    -10, 0, 10, 10, 10, 10, 0, -10,
+    -10, 10, 10, 10, 10, 10, 10, -10,
+    -10, 5, 0, 0, 0, 0, 5, -10,
+    -20, -10, -10, -10, -10, -10, -10, -20
+]
+ROOK_TABLE = [
+    0, 0, 0, 0, 0, 0, 0, 0,
+    5, 10, 10, 10, 10, 10, 10, 5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    0, 0, 0, 5, 5, 0, 0, 0
+]
+QUEEN_TABLE = [
+    -20, -10, -10, -5, -5, -10, -10, -20,
+    -10, 0, 0, 0, 0, 0, 0, -10,
+    -10, 0, 5, 5, 5, 5, 0, -10,
+    -5, 0, 5, 5, 5, 5, 0, -5,
+    0, 0, 5, 5, 5, 5, 0, -5,
+    -10, 5, 5, 5, 5, 5, 0, -10,
+    -10, 0, 5, 0, 0, 0, 0, -10,
+    -20, -10, -10, -5, -5, -10, -10, -20
+]
+KING_MIDDLEGAME_TABLE = [
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -20, -30, -30, -40, -40, -30, -30, -20,
+    -10, -20, -20, -20, -20, -20, -20, -10,
+    20, 20, 0, 0, 0, 0, 20, 20,
+    20, 30, 10, 0, 0, 10, 30, 20
+]
+KING_ENDGAME_TABLE = [
+    -50, -40, -30, -20, -20, -30, -40, -50,
+    -30, -20, -10, 0, 0, -10, -20, -30,
+    -30, -10, 20, 30, 30, 20, -10, -30,
+    -30, -10, 30, 40, 40, 30, -10, -30,
+    -30, -10, 30, 40, 40, 30, -10, -30,
+    -30, -10, 20, 30, 30, 20, -10, -30,
+    -30, -30, 0, 0, 0, 0, -30, -30,
+    -50, -30, -30, -30, -30, -30, -30, -50
+]
+
+MIDDLEGAME_TABLES = {
+    chess.PAWN: PAWN_TABLE,
+    chess.KNIGHT: KNIGHT_TABLE,
+    chess.BISHOP: BISHOP_TABLE,
+    chess.ROOK: ROOK_TABLE,
+    chess.QUEEN: QUEEN_TABLE,
+    chess.KING: KING_MIDDLEGAME_TABLE
+}
+ENDGAME_TABLES = dict(MIDDLEGAME_TABLES)
+ENDGAME_TABLES[chess.KING] = KING_ENDGAME_TABLE
+
+
+def _build_square_values(tables):
+    # values[color][piece_type][square] = signed material + table bonus,
+    # positive for White, so both colours share one addition.
+    values = [[None] * 7, [None] * 7]
+    for piece_type, table in tables.items():
+        base = PIECE_VALUES[piece_type]
+        values[chess.WHITE][piece_type] = [base + table[square ^ 56] for square in chess.SQUARES]
+        values[chess.BLACK][piece_type] = [-(base + table[square]) for square in chess.SQUARES]
+    return values
+
+
+MG_VALUES = _build_square_values(MIDDLEGAME_TABLES)
+EG_VALUES = _build_square_values(ENDGAME_TABLES)
+
+
+def material_balance(board):
+    # White minus Black material in pawn units
+    score = 0
+    for piece_type, value in MATERIAL_POINTS.items():
+        if value:
+            score += value * (chess.popcount(board.pieces_mask(piece_type, chess.WHITE)) -
+                              chess.popcount(board.pieces_mask(piece_type, chess.BLACK)))
+    return score
+
+
+def piece_changes(board, move):
+    # (piece_type, color, square, added) for every piece the move removes or
+    # places. Must be called before the move is pushed.
+    turn = board.turn
+    piece_type = board.piece_type_at(move.from_square)
+    changes = [(piece_type, turn, move.from_square, False)]
+    if board.is_castling(move):
+        rank = chess.square_rank(move.from_square)
+        if chess.square_file(move.to_square) > chess.square_file(move.from_square):
+            rook_from, rook_to, king_to = chess.square(7, rank), chess.square(5, rank), chess.square(6, rank)
+        else:
+            rook_from, rook_to, king_to = chess.square(0, rank), chess.square(3, rank), chess.square(2, rank)
+        changes.append((chess.ROOK, turn, rook_from, False))
+        changes.append((chess.ROOK, turn, rook_to, True))
+        changes.append((chess.KING, turn, king_to, True))
+        return changes
+    if board.is_en_passant(move):
+        captured_square = move.to_square - 8 if turn == chess.WHITE else move.to_square + 8
+        changes.append((chess.PAWN, not turn, captured_square, False))
+    else:
+        captured = board.piece_type_at(move.to_square)
+        if captured:
+            changes.append((captured, not turn, move.to_square, False))
+    changes.append((move.promotion or piece_type, turn, move.to_square, True))
+    return changes
+
+
+class Evaluator:
+    # Tapered piece-square evaluation. The search carries an (mg, eg, phase)
+    # state that is updated per move, so a leaf costs a few integer ops.
+
+    def initial_state(self, board):
+        # Full computation straight from the piece bitboards
+        mg = eg = phase = 0
+        for color in chess.COLORS:
+            for piece_type in chess.PIECE_TYPES:
+                mask = board.pieces_mask(piece_type, color)
+                if not mask:
+                    continue
+                mg_values = MG_VALUES[color][piece_type]
+                eg_values = EG_VALUES[color][piece_type]
+                for square in chess.scan_forward(mask):
+                    mg += mg_values[square]
+                    eg += eg_values[square]
+                phase += PHASE_WEIGHTS[piece_type] * chess.popcount(mask)
+        return mg, eg, phase
+
+    def apply(self, board, state, move):
+        # State after the move; call before pushing it
+        mg, eg, phase = state
+        for piece_type, color, square, added in piece_changes(board, move):
+            if added:
+                mg += MG_VALUES[color][piece_type][square]
+                eg += EG_VALUES[color][piece_type][square]
+                phase += PHASE_WEIGHTS[piece_type]
+            else:
+                mg -= MG_VALUES[color][piece_type][square]
+                eg -= EG_VALUES[color][piece_type][square]
+                phase -= PHASE_WEIGHTS[piece_type]
+        return mg, eg, phase
+
+    def score(self, state, turn):
+        # Side-to-move score in centipawns
+        mg, eg, phase = state
+        phase = min(phase, MAX_PHASE)
+        value = (mg * phase + eg * (MAX_PHASE - phase)) // MAX_PHASE
+        return value if turn == chess.WHITE else -value
+
+    def evaluate(self, board):
+        return self.score(self.initial_state(board), board.turn)
+
+
+def reference_evaluate(board):
+    # Slow square-by-square scan used to check the bitboard evaluator
+    mg = eg = phase = 0
+    for square in chess.SQUARES:
+        piece = board.piece_at(square)
+        if piece is None:
+            continue
+        table_square = square ^ 56 if piece.color == chess.WHITE else square
+        sign = 1 if piece.color == chess.WHITE else -1
+        base = PIECE_VALUES[piece.piece_type]
+        mg += sign * (base + MIDDLEGAME_TABLES[piece.piece_type][table_square])
+        eg += sign * (base + ENDGAME_TABLES[piece.piece_type][table_square])
+        phase += PHASE_WEIGHTS[piece.piece_type]
+    phase = min(phase, MAX_PHASE)
+    value = (mg * phase + eg * (MAX_PHASE - phase)) // MAX_PHASE
+    return value if board.turn == chess.WHITE else -value
+
+
+def reference_material(board):
+    score = 0
+    for square in chess.SQUARES:
+        piece = board.piece_at(square)
+        if piece:
+            value = MATERIAL_POINTS[piece.piece_type]
+            score += value if piece.color == chess.WHITE else -value
+    return score
+
+
+def check_against_reference(games=200, max_plies=160, seed=0):
+    # Plays random games, updating the state incrementally, and compares it
+    # with both a fresh bitboard evaluation and the reference scan.
+    rng = random.Random(seed)
+    evaluator = Evaluator()
+    positions = 0
+    for _ in range(games):
+        board = chess.Board()
+        state = evaluator.initial_state(board)
+        for _ in range(max_plies):
+            moves = list(board.legal_moves)
+            if not moves:
+                break
+            move = rng.choice(moves)
+            state = evaluator.apply(board, state, move)
+            board.push(move)
+            expected = reference_evaluate(board)
+            if evaluator.score(state, board.turn) != expected or evaluator.evaluate(board) != expected:
+                raise AssertionError(f"Evaluation mismatch at {board.fen()}")
+            if material_balance(board) != reference_material(board):
+                raise AssertionError(f"Material mismatch at {board.fen()}")
+            positions += 1
+    return positions
+
+
+if __name__ == "__main__":
+    print(f"Evaluator matches the reference scan on {check_against_reference()} positions")
@@ -4,8 +4,27 @@ import chess
 import random
 import datetime
 from db_config import get_db_connection
-from PIL import Image, ImageTk
+from PIL import Image, ImageDraw
 import os
+from chess_eval import material_balance
+from chess_book import get_opening_book, BOOK_LIMITS
+from chess_tablebase import get_tablebase
+from chess_position import PositionCache
+from chess_engine import SearchEngine, SearchWorker, TranspositionTable, SEARCH_LIMITS, TT_DEFAULT_MB, INFINITY
+from chess_uci import UCIClient, get_engine_pool
+from chess_analysis import append_game
+from utils.scene import Scene
+from utils.compositor import Compositor
+from utils.assets import get_assets
+
+# How often the Tk loop checks on a running AI search (ms)
+AI_POLL_MS = 30
+# Difficulties where the AI keeps searching during the human's turn
+PONDER_LEVELS = ["hard"]
+# Set CHESS_STATS=1 to print the AI's book moves, ponder hits and search stats
+CHESS_STATS = os.environ.get("CHESS_STATS") == "1"
+# Light and dark square colours
+BOARD_THEMES = {"green": ("#FFFFFF", "#769656")}
 
 class ChessGame:
     def __init__(self, parent, difficulty, username):
@@ -19,6 +38,9 @@ class ChessGame:
         self.window.configure(bg="#D3D3D3")
         
         self.board = chess.Board()
+        # Moves and status of the current position, recomputed only after a push
+        self.positions = PositionCache()
+        self.position = self.positions.get(self.board)
         self.square_size = 50
         self.selected_square = None
         self.legal_moves = []
@@ -27,9 +49,14 @@ class ChessGame:
         
         self.canvas = tk.Canvas(self.window, bg="#D3D3D3", highlightthickness=0)
         self.canvas.pack(fill="both", expand=True)
+        self.scene = Scene(self.canvas, ["board", "pieces", "marks", "hud"], "Chess")
         
+        self.assets = get_assets()
         self.piece_images = {}
         self.load_piece_images()
+        # The 64 squares as one image per square size
+        self.board_theme = "green"
+        self.boards = Compositor(self.render_board)
         
         # Timer variables (5 minutes = 300 seconds)
         self.white_time = 300
@@ -42,14 +69,35 @@ class ChessGame:
         self.canvas.bind("<Motion>", self.on_mouse_move)
         self.canvas.bind("<Leave>", self.on_mouse_leave)
         self.window.bind("<KeyPress>", self.on_key_press)
+        self.window.protocol("WM_DELETE_WINDOW", self.quit_game)
         
-        self.max_depth = {"easy": 1, "medium": 2, "hard": 3}[difficulty]
+        self.engine = self.create_engine()
+        self.search_limits = SEARCH_LIMITS[difficulty]
+        self.book = get_opening_book()
+        self.book_limits = BOOK_LIMITS[difficulty]
+        self.search_worker = None
+        self.search_poll_id = None
+        self.thinking_frame = 0
+        self.ponder_enabled = difficulty in PONDER_LEVELS
+        self.ponder_worker = None
+        self.ponder_move = None
+        # The human's expected reply to the last AI move, from its search
+        self.expected_reply = None
         
         self.draw_board()
         self.start_timer()
         if not self.board.turn:
             self.ai_move()
 
+    def create_engine(self):
+        def fallback():
+            # One table per game session, so each search starts from the previous one's work
+            return SearchEngine(tt=TranspositionTable(size_mb=TT_DEFAULT_MB), tablebase=get_tablebase())
+
+        # A pooled UCI engine process, kept for the whole game and reused by the
+        # next one. It is started by the first search, off the Tk thread.
+        return UCIClient(get_engine_pool(), {'Hash': TT_DEFAULT_MB}, fallback)
+
     def load_piece_images(self):
         pieces = {
             'P': 'wP.png',
@@ -65,18 +113,11 @@ class ChessGame:
             'q': 'bQ.png',
             'k': 'bK.png'
         }
-        base_path = os.path.join("assets")
+        # Scaled pieces from the shared asset cache; a missing file gets a lettered placeholder
+        size = (self.square_size, self.square_size)
         for piece, filename in pieces.items():
-            try:
-                img_path = os.path.join(base_path, filename)
-                if not os.path.exists(img_path):
-                    raise FileNotFoundError(f"Image file {img_path} not found")
-                img = Image.open(img_path)
-                img = img.resize((self.square_size, self.square_size), Image.LANCZOS)
-                self.piece_images[piece] = ImageTk.PhotoImage(img)
-            except Exception as e:
-                print(f"Failed to load image for {piece}: {e}")
-                self.piece_images[piece] = None
+            colors = ("#FFFFFF", "#000000") if piece.isupper() else ("#000000", "#FFFFFF")
+            self.piece_images[piece] = self.assets.photo(filename, size, colors + (piece.upper(),))
 
     def start_timer(self):
         if self.timer_running:
@@ -87,12 +128,14 @@ class ChessGame:
             self.draw_board()
             if self.white_time <= 0:
                 self.timer_running = False
+                self.shutdown_ai()
                 messagebox.showinfo("Game Over", "Time's up! Black wins")
                 self.save_score(outcome="0-1")
                 self.window.destroy()
                 return
             if self.black_time <= 0:
                 self.timer_running = False
+                self.shutdown_ai()
                 messagebox.showinfo("Game Over", "Time's up! White wins")
                 self.save_score(outcome="1-0")
                 self.window.destroy()
@@ -100,6 +143,15 @@ class ChessGame:
             self.timer_id = self.window.after(1000, self.start_timer)
 
     def save_score(self, outcome=None):
+        # Finished games go to the PGN archive for chess_analysis, signed in or not;
+        # ones abandoned before a result or a single move would only add empty games
+        if outcome and self.board.move_stack:
+            append_game(self.board, {
+                "White": self.username or "Guest",
+                "Black": f"AI ({self.difficulty})",
+                "Result": outcome,
+                "Difficulty": self.difficulty
+            })
         if not self.username:
             return
         try:
@@ -125,17 +177,7 @@ class ChessGame:
             print(f"Failed to save score: {e}")
 
     def calculate_material_score(self):
-        piece_values = {'p': 1, 'n': 3, 'b': 3, 'r': 5, 'q': 9, 'k': 0}
-        score = 0
-        for square in chess.SQUARES:
-            piece = self.board.piece_at(square)
-            if piece:
-                value = piece_values.get(piece.symbol().lower(), 0)
-                if piece.color == chess.WHITE:
-                    score += value
-                else:
-                    score -= value
-        return score
+        return material_balance(self.board)
 
     def on_mouse_move(self, event):
         col = event.x // self.square_size
@@ -144,10 +186,9 @@ class ChessGame:
         
         if square != self.hovered_square:
             self.hovered_square = square
-            piece = self.board.piece_at(square)
             self.hovered_legal_moves = []
-            if piece and piece.color == chess.WHITE:
-                self.hovered_legal_moves = [move for move in self.board.legal_moves if move.from_square == square]
+            if self.board.color_at(square) == chess.WHITE:
+                self.hovered_legal_moves = self.position.moves_from(square)
             self.draw_board()
 
     def on_mouse_leave(self, event):
@@ -156,15 +197,12 @@ class ChessGame:
         self.draw_board()
 
     def draw_board(self):
-        self.canvas.delete("all")
+        # Redrawn on every mouse move and clock tick, so only changed canvas items are touched
+        scene = self.scene
         self.square_size = min(self.canvas.winfo_width(), self.canvas.winfo_height()) // 8
         
-        for row in range(8):
-            for col in range(8):
-                x1, y1 = col * self.square_size, (7 - row) * self.square_size
-                x2, y2 = x1 + self.square_size, y1 + self.square_size
-                color = "#FFFFFF" if (row + col) % 2 == 0 else "#769656"
-                self.canvas.create_rectangle(x1, y1, x2, y2, fill=color)
+        scene.draw("squares", "board", "image", (0, 0), image=self.boards.get(self.square_size, self.board_theme),
+                   anchor="nw")
         
         for square in chess.SQUARES:
             piece = self.board.piece_at(square)
@@ -172,42 +210,75 @@ class ChessGame:
                 row, col = 7 - chess.square_rank(square), chess.square_file(square)
                 x, y = col * self.square_size + self.square_size // 2, row * self.square_size + self.square_size // 2
                 if self.piece_images.get(piece.symbol()):
-                    self.canvas.create_image(x, y, image=self.piece_images[piece.symbol()])
+                    scene.draw(f"piece{square}", "pieces", "image", (x, y), image=self.piece_images[piece.symbol()])
                 else:
-                    self.canvas.create_text(x, y, text=piece.symbol(), font=("Arial", self.square_size // 2), fill="#800000")
+                    scene.draw(f"label{square}", "pieces", "text", (x, y), text=piece.symbol(),
+                               font=("Arial", self.square_size // 2), fill="#800000")
         
+        if self.position.in_check and self.position.king_square is not None:
+            row, col = 7 - chess.square_rank(self.position.king_square), chess.square_file(self.position.king_square)
+            x1, y1 = col * self.square_size, row * self.square_size
+            scene.draw("check", "marks", "rectangle", (x1, y1, x1 + self.square_size, y1 + self.square_size),
+                       outline="#FF0000", width=3)
+
+        dots = []
         if self.selected_square is not None:
             row, col = 7 - chess.square_rank(self.selected_square), chess.square_file(self.selected_square)
             x1, y1 = col * self.square_size, row * self.square_size
-            self.canvas.create_rectangle(x1, y1, x1 + self.square_size, y1 + self.square_size, outline="#CD5C5C", width=3)
-            
-            for move in self.legal_moves:
-                dest_square = move.to_square
-                row, col = 7 - chess.square_rank(dest_square), chess.square_file(dest_square)
-                x, y = col * self.square_size + self.square_size // 2, row * self.square_size + self.square_size // 2
-                self.canvas.create_oval(x - 10, y - 10, x + 10, y + 10, fill="#00FFFF", outline="")
+            scene.draw("selected", "marks", "rectangle", (x1, y1, x1 + self.square_size, y1 + self.square_size),
+                       outline="#CD5C5C", width=3)
+            dots.extend(move.to_square for move in self.legal_moves)
         
         if self.hovered_square is not None:
             row, col = 7 - chess.square_rank(self.hovered_square), chess.square_file(self.hovered_square)
             x1, y1 = col * self.square_size, row * self.square_size
-            self.canvas.create_rectangle(x1, y1, x1 + self.square_size, y1 + self.square_size, outline="#00FFFF", width=2)
-            for move in self.hovered_legal_moves:
-                dest_square = move.to_square
-                row, col = 7 - chess.square_rank(dest_square), chess.square_file(dest_square)
-                x, y = col * self.square_size + self.square_size // 2, row * self.square_size + self.square_size // 2
-                self.canvas.create_oval(x - 10, y - 10, x + 10, y + 10, fill="#00FFFF", outline="")
+            # A hovered white piece under attack gets a warning outline
+            attacked = (self.board.color_at(self.hovered_square) == chess.WHITE and
+                        self.position.attack_maps(self.board)[chess.BLACK] & chess.BB_SQUARES[self.hovered_square])
+            outline = "#CD5C5C" if attacked else "#00FFFF"
+            scene.draw("hovered", "marks", "rectangle", (x1, y1, x1 + self.square_size, y1 + self.square_size),
+                       outline=outline, width=2)
+            dots.extend(move.to_square for move in self.hovered_legal_moves)
+
+        for i, dest_square in enumerate(dots):
+            row, col = 7 - chess.square_rank(dest_square), chess.square_file(dest_square)
+            x, y = col * self.square_size + self.square_size // 2, row * self.square_size + self.square_size // 2
+            scene.draw(f"dot{i}", "marks", "oval", (x - 10, y - 10, x + 10, y + 10), fill="#00FFFF", outline="")
         
         # Draw timers
         white_time_str = f"White: {self.white_time // 60}:{self.white_time % 60:02d}"
         black_time_str = f"Black: {self.black_time // 60}:{self.black_time % 60:02d}"
-        self.canvas.create_text(10, 10, text=white_time_str, anchor="nw", font=("Arial", 12), fill="#800000")
-        self.canvas.create_text(10, self.canvas.winfo_height() - 10, text=black_time_str, anchor="sw", font=("Arial", 12), fill="#800000")
+        scene.draw("white_time", "hud", "text", (10, 10), text=white_time_str, anchor="nw",
+                   font=("Arial", 12), fill="#800000")
+        scene.draw("black_time", "hud", "text", (10, self.canvas.winfo_height() - 10), text=black_time_str,
+                   anchor="sw", font=("Arial", 12), fill="#800000")
+        if self.search_worker is not None:
+            scene.draw(
+                "thinking", "hud", "text", (self.canvas.winfo_width() - 10, 10), text=self.thinking_text(),
+                anchor="ne", font=("Arial", 12, "bold"), fill="#800000"
+            )
+        scene.commit()
+
+    def render_board(self, square_size, theme):
+        light, dark = BOARD_THEMES[theme]
+        image = Image.new("RGB", (square_size * 8 + 1, square_size * 8 + 1), "#D3D3D3")
+        draw = ImageDraw.Draw(image)
+        for row in range(8):
+            for col in range(8):
+                x1, y1 = col * square_size, (7 - row) * square_size
+                x2, y2 = x1 + square_size, y1 + square_size
+                color = light if (row + col) % 2 == 0 else dark
+                draw.rectangle((x1, y1, x2, y2), fill=color, outline="#000000")
+        return image
+
+    def thinking_text(self):
+        return "AI thinking" + "." * (self.thinking_frame % 4)
 
     def on_resize(self, event):
         old_size = self.square_size
         self.square_size = min(self.canvas.winfo_width(), self.canvas.winfo_height()) // 8
         if self.square_size != old_size:
-            self.load_piece_images()  # Reload images for new size
+            self.load_piece_images()  # Sizes seen before come from the cache
         self.draw_board()
 
     def on_click(self, event):
@@ -226,110 +297,150 @@ class ChessGame:
             piece = self.board.piece_at(square)
             if piece and piece.color == chess.WHITE:
                 self.selected_square = square
-                self.legal_moves = list(self.board.legal_moves)
-                self.legal_moves = [move for move in self.legal_moves if move.from_square == square]
+                self.legal_moves = self.position.moves_from(square)
                 self.draw_board()
             else:
                 for move in self.legal_moves:
                     if move.to_square == square:
-                        self.board.push(move)
+                        self.push_move(move)
                         self.selected_square = None
                         self.legal_moves = []
                         self.draw_board()
-                        if self.board.is_game_over():
+                        if self.position.game_over(self.board):
                             self.handle_game_over()
                         elif self.board.turn == chess.BLACK:
                             self.ai_move()
 
     def on_key_press(self, event):
         if event.keysym == "Escape":
-            self.timer_running = False
-            if self.timer_id:
-                self.window.after_cancel(self.timer_id)
-            self.save_score()
-            self.window.destroy()
+            self.quit_game()
+        elif event.keysym == "p":
+            # Toggle pondering; turning it off stops any background search
+            self.ponder_enabled = not self.ponder_enabled
+            if not self.ponder_enabled:
+                self.stop_pondering()
+            if CHESS_STATS:
+                print(f"AI pondering {'on' if self.ponder_enabled else 'off'}")
+
+    def quit_game(self):
+        self.timer_running = False
+        self.shutdown_ai()
+        if self.timer_id:
+            self.window.after_cancel(self.timer_id)
+        self.save_score()
+        self.window.destroy()
+
+    def push_move(self, move):
+        self.board.push(move)
+        self.position = self.positions.get(self.board)
 
     def handle_game_over(self):
         self.timer_running = False
+        self.shutdown_ai()
         if self.timer_id:
             self.window.after_cancel(self.timer_id)
-        outcome = self.board.outcome()
-        if outcome:
-            if outcome.winner == chess.WHITE:
-                message = "Checkmate! White wins"
-            elif outcome.winner == chess.BLACK:
-                message = "Checkmate! Black wins"
-            else:
-                if self.board.is_stalemate():
-                    message = "Stalemate! Draw"
-                elif self.board.is_insufficient_material():
-                    message = "Draw by insufficient material"
-                elif self.board.is_seventyfive_moves():
-                    message = "Draw by 75-move rule"
-                elif self.board.is_fivefold_repetition():
-                    message = "Draw by fivefold repetition"
-                else:
-                    message = "Draw"
+        status = self.position.game_over(self.board)
+        if status:
+            result, message = status
             messagebox.showinfo("Game Over", message)
-            self.save_score(outcome=outcome.result())
+            self.save_score(outcome=result)
         else:
             messagebox.showinfo("Game Over", "Game ended")
             self.save_score()
         self.window.destroy()
 
     def ai_move(self):
-        if not self.timer_running:
+        if not self.timer_running or self.search_worker is not None:
+            return
+        if self.ponder_worker is not None and self.board.move_stack and self.board.peek() == self.ponder_move:
+            # Ponder hit: the background search is already on this position
+            if CHESS_STATS:
+                print(f"AI ponder hit: {self.ponder_move}")
+            self.search_worker = self.ponder_worker
+            self.ponder_worker = None
+            self.ponder_move = None
+            self.engine.ponderhit(**self.search_limits)
+        else:
+            # On a miss the ponder search still leaves its work in the transposition table
+            self.stop_pondering()
+            # Book moves need no search at all
+            book_move = self.book.choose(self.board, **self.book_limits) if self.book else None
+            if book_move:
+                if CHESS_STATS:
+                    print(f"AI book move: {book_move}")
+                self.expected_reply = None
+                self.push_move(book_move)
+                self.draw_board()
+                self.start_pondering()
+                return
+            # Search on a worker thread; the result is picked up by poll_ai_move
+            limits = dict(self.search_limits, root_moves=self.position.legal_moves)
+            self.search_worker = SearchWorker(self.engine, self.board, limits)
+        self.thinking_frame = 0
+        self.draw_board()
+        self.search_poll_id = self.window.after(AI_POLL_MS, self.poll_ai_move)
+
+    def poll_ai_move(self):
+        worker = self.search_worker
+        if worker is None:
             return
-        legal_moves = list(self.board.legal_moves)
-        if not legal_moves:
+        if not worker.done():
+            self.thinking_frame += 1
+            self.scene.config("thinking", text=self.thinking_text())
+            self.search_poll_id = self.window.after(AI_POLL_MS, self.poll_ai_move)
             return
-        
-        def evaluate_board(board):
-            piece_values = {'P': 1, 'N': 3, 'B': 3, 'R': 5, 'Q': 9, 'K': 0}
-            score = 0
-            for square in chess.SQUARES:
-                piece = board.piece_at(square)
-                if piece:
-                    value = piece_values.get(piece.symbol().lower(), 0)
-                    if piece.color == chess.WHITE:
-                        score += value
-                    else:
-                        score -= value
-            return score
+        self.search_worker = None
+        self.search_poll_id = None
+        if worker.cancelled or not self.timer_running:
+            return
+        if worker.error:
+            print(f"AI search failed: {worker.error}")
+            return
+        result = worker.result
+        if CHESS_STATS:
+            # A search stopped before its first iteration finished has no score
+            score = result.score if result.score > -INFINITY else "none"
+            print(f"AI search: depth {result.depth}, {result.nodes} nodes, "
+                  f"{result.nps:.0f} nodes/sec, score {score}")
+        self.expected_reply = result.ponder
+        if result.move:
+            self.push_move(result.move)
+        self.draw_board()
+        if self.position.game_over(self.board):
+            self.handle_game_over()
+        else:
+            self.start_pondering()
 
-        def minimax(board, depth, maximizing_player):
-            if depth == 0 or board.is_game_over():
-                return evaluate_board(board)
-            
-            if maximizing_player:
-                max_eval = float('-inf')
-                for move in board.legal_moves:
-                    board.push(move)
-                    eval_score = minimax(board, depth - 1, False)
-                    board.pop()
-                    max_eval = max(max_eval, eval_score)
-                return max_eval
-            else:
-                min_eval = float('inf')
-                for move in board.legal_moves:
-                    board.push(move)
-                    eval_score = minimax(board, depth - 1, True)
-                    board.pop()
-                min_eval = min(min_eval, eval_score)
-                return min_eval
+    def start_pondering(self):
+        # Search the position after the human's expected reply, as reported
+        # by the last search, until the human actually moves
+        if not self.ponder_enabled or not self.timer_running or self.ponder_worker is not None:
+            return
+        predicted = self.expected_reply
+        if predicted is None or not self.board.is_legal(predicted):
+            return
+        board = self.board.copy()
+        board.push(predicted)
+        if self.positions.get(board).game_over(board):
+            return
+        self.ponder_move = predicted
+        self.ponder_worker = SearchWorker(self.engine, board, {'max_depth': self.search_limits['max_depth']})
 
-        best_score = float('inf')
-        best_move = None
-        for move in legal_moves:
-            self.board.push(move)
-            score = minimax(self.board, self.max_depth - 1, True)
-            self.board.pop()
-            if score < best_score:
-                best_score = score
-                best_move = move
-        
-        if best_move:
-            self.board.push(best_move)
-            self.draw_board()
-            if self.board.is_game_over():
-                self.handle_game_over()
\ No newline at end of file
+    def stop_pondering(self):
+        if self.ponder_worker is not None:
+            self.ponder_worker.stop()
+            self.ponder_worker = None
+        self.ponder_move = None
+
+    def shutdown_ai(self):
+        self.cancel_ai_search()
+        self.engine.close()
+
+    def cancel_ai_search(self):
+        self.stop_pondering()
+        if self.search_worker is not None:
+            self.search_worker.cancel()
+            self.search_worker = None
+        if self.search_poll_id:
+            self.window.after_cancel(self.search_poll_id)
+            self.search_poll_id = None
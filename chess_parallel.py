@@ -0,0 +1,213 @@
+import concurrent.futures
+import multiprocessing
+import os
+import time
+import chess
+from chess_engine import (SearchEngine, SearchResult, SearchTimeout, TranspositionTable, EXACT,
+                          INFINITY, MATE_THRESHOLD, MAX_PLY, expected_reply, zobrist_key)
+from chess_tablebase import get_tablebase
+
+# Transposition table size for each worker process
+WORKER_TT_MB = 16
+# How often the coordinating thread checks its clock and stop flag (seconds)
+POLL_INTERVAL = 0.02
+
+# Per-process state, set up once by _init_worker and reused for every task
+_engine = None
+_limits = None
+_alpha = None
+_root = None
+
+
+class SharedLimits:
+    # Stop flag and deadline shared with the workers. The engine only needs
+    # is_set(), so this stands in for its stop event. The deadline is on the
+    # monotonic clock, which every process reads alike and which a wall-clock
+    # change cannot move.
+    def __init__(self, stop_flag, deadline):
+        self.stop_flag = stop_flag
+        self.deadline = deadline
+
+    def is_set(self):
+        if self.stop_flag.value:
+            return True
+        deadline = self.deadline.value
+        return deadline > 0 and time.monotonic() >= deadline
+
+
+def _init_worker(alpha, stop_flag, deadline, tt_size_mb):
+    global _engine, _limits, _alpha
+    _engine = SearchEngine(tt=TranspositionTable(size_mb=tt_size_mb), tablebase=get_tablebase())
+    _limits = SharedLimits(stop_flag, deadline)
+    _alpha = alpha
+
+
+def _search_move(root_fen, move_stack, move_uci, depth, node_limit):
+    # Runs in a worker: rebuild the position from FEN plus the move stack (so
+    # repetitions are still seen), then search one root move against the
+    # best score any worker has found so far at this depth.
+    global _root
+    board = chess.Board(root_fen)
+    for uci in move_stack:
+        board.push_uci(uci)
+    root = (root_fen, tuple(move_stack))
+    if root != _root:
+        _root = root
+        _engine.tt.new_search()
+        _engine.reset_heuristics()
+    if _limits.is_set():
+        return move_uci, None, 0, None, False
+    alpha = _alpha.value
+    try:
+        score, reply = _engine.search_move(board, chess.Move.from_uci(move_uci), depth, alpha,
+                                           node_limit=node_limit, stop_event=_limits)
+    except SearchTimeout:
+        return move_uci, None, _engine.nodes, None, False
+    # At or below alpha the score is only an upper bound
+    exact = score > alpha
+    if exact:
+        with _alpha.get_lock():
+            if score > _alpha.value:
+                _alpha.value = score
+    return move_uci, score, _engine.nodes, reply.uci() if reply else None, exact
+
+
+class ParallelSearch:
+    # Root-splitting search over a process pool. The first (PV) move of each
+    # iteration is searched alone to set a bound, then the remaining moves go
+    # out to all workers at once, sharing alpha through a synchronized value.
+    # Same search()/ponderhit() interface as SearchEngine.
+    def __init__(self, workers=None, tt_size_mb=WORKER_TT_MB, tablebase=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.tt_size_mb = tt_size_mb
+        self.tablebase = tablebase
+        # Spawned rather than forked so workers never inherit Tk or thread state
+        self.context = multiprocessing.get_context("spawn")
+        self.alpha = self.context.Value('i', -INFINITY)
+        self.stop_flag = self.context.Value('b', 0)
+        self.deadline = self.context.Value('d', 0.0)
+        self.pool = None
+        # Root scores and expected replies, so pondering can predict a move
+        self.tt = TranspositionTable(size_mb=1)
+        self.orderer = SearchEngine(tt=TranspositionTable(size_mb=0))
+        self.node_limit = None
+        self.search_start = 0.0
+
+    def start(self):
+        # Workers start once and are reused for every later search
+        if self.pool is None:
+            self.pool = concurrent.futures.ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=self.context, initializer=_init_worker,
+                initargs=(self.alpha, self.stop_flag, self.deadline, self.tt_size_mb)
+            )
+        return self
+
+    def close(self):
+        if self.pool is not None:
+            self.stop_flag.value = 1
+            self.pool.shutdown(wait=False, cancel_futures=True)
+            self.pool = None
+
+    def ponderhit(self, time_limit=None, node_limit=None, max_depth=None):
+        self.deadline.value = self.search_start + time_limit if time_limit else 0.0
+        self.node_limit = node_limit
+
+    def search(self, board, time_limit=None, node_limit=None, max_depth=MAX_PLY, on_iteration=None,
+               stop_event=None, root_moves=None):
+        self.start()
+        board = board.copy()
+        start = self.search_start = time.monotonic()
+        self.deadline.value = start + time_limit if time_limit else 0.0
+        self.node_limit = node_limit
+        self.stop_flag.value = 0
+        self.tt.new_search()
+
+        root_key = zobrist_key(board)
+        # Callers that already generated the legal moves can pass them in
+        if root_moves is None:
+            root_moves = board.legal_moves
+        root_moves = self.orderer.order_moves(board, root_moves, 0, self.tt.best_move(root_key))
+        if not root_moves:
+            return SearchResult(None, 0, 0, 0, 0.0)
+        if self.tablebase is not None:
+            tb_move = self.tablebase.root_move(board)
+            if tb_move is not None:
+                wdl = self.tablebase.probe_wdl(board, root_key)
+                score = self.tablebase.wdl_score(wdl, 0) if wdl is not None else 0
+                return SearchResult(tb_move, score, 0, 0, time.monotonic() - start)
+        if len(root_moves) == 1:
+            max_depth = 1
+
+        root_fen = board.root().fen()
+        move_stack = [move.uci() for move in board.move_stack]
+        best_move, best_score, reached = root_moves[0], -INFINITY, 0
+        nodes = 0
+        for depth in range(1, max_depth + 1):
+            self.alpha.value = -INFINITY
+            scores = {}
+            replies = {}
+            exact = {}
+            # Young brothers wait: the PV move sets alpha before the rest are split
+            pv_move = root_moves[0]
+            nodes += self.run_batch(root_fen, move_stack, [pv_move], depth, nodes, scores, replies, exact,
+                                    stop_event)
+            if pv_move not in scores:
+                break
+            if len(root_moves) > 1 and not self.stop_flag.value:
+                nodes += self.run_batch(root_fen, move_stack, root_moves[1:], depth, nodes, scores, replies, exact,
+                                        stop_event)
+
+            # A fail-low bound can equal an exact score; the exact one wins the tie
+            move = max(scores, key=lambda m: (scores[m], exact[m]))
+            complete = len(scores) == len(root_moves)
+            if complete or scores[move] > scores[pv_move]:
+                best_move, best_score = move, scores[move]
+                if complete:
+                    reached = depth
+                board.push(best_move)
+                reply = replies.get(best_move)
+                self.tt.store(zobrist_key(board), depth, EXACT, -best_score,
+                              chess.Move.from_uci(reply) if reply else None)
+                board.pop()
+                self.tt.store(root_key, depth, EXACT, best_score, best_move)
+            if not complete:
+                break
+            root_moves.remove(best_move)
+            root_moves.insert(0, best_move)
+            if on_iteration:
+                on_iteration(SearchResult(best_move, best_score, depth, nodes, time.monotonic() - start))
+            if abs(best_score) >= MATE_THRESHOLD:
+                break
+            if self.node_limit is not None and nodes >= self.node_limit:
+                break
+        return SearchResult(best_move, best_score, reached, nodes, time.monotonic() - start,
+                            expected_reply(board, self.tt, best_move))
+
+    def run_batch(self, root_fen, move_stack, moves, depth, nodes_so_far, scores, replies, exact, stop_event):
+        # Submits one task per move and waits, watching the caller's stop
+        # event and the deadline. Timed-out moves are left out of scores;
+        # exact records which scores are exact rather than fail-low bounds.
+        node_limit = None
+        if self.node_limit is not None:
+            node_limit = max(1, self.node_limit - nodes_so_far)
+        by_uci = {move.uci(): move for move in moves}
+        pending = {self.pool.submit(_search_move, root_fen, move_stack, uci, depth, node_limit) for uci in by_uci}
+        nodes = 0
+        while pending:
+            done, pending = concurrent.futures.wait(pending, timeout=POLL_INTERVAL,
+                                                    return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                uci, score, task_nodes, reply, is_exact = future.result()
+                nodes += task_nodes
+                if score is not None:
+                    scores[by_uci[uci]] = score
+                    replies[by_uci[uci]] = reply
+                    exact[by_uci[uci]] = is_exact
+            if stop_event is not None and stop_event.is_set():
+                self.stop_flag.value = 1
+            deadline = self.deadline.value
+            if deadline > 0 and time.monotonic() >= deadline:
+                self.stop_flag.value = 1
+            if self.node_limit is not None and nodes_so_far + nodes >= self.node_limit:
+                self.stop_flag.value = 1
+        return nodes
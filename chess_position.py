@@ -0,0 +1,78 @@
+import collections
+import chess
+import chess.polyglot
+
+POSITION_CACHE_SIZE = 4096
+
+
+class PositionInfo:
+    # Everything the UI and the AI ask about one position, computed once:
+    # legal moves (also grouped by from-square), check and end-of-game status.
+    def __init__(self, board):
+        self.turn = board.turn
+        self.legal_moves = list(board.legal_moves)
+        self.moves_by_square = {}
+        for move in self.legal_moves:
+            self.moves_by_square.setdefault(move.from_square, []).append(move)
+        self.in_check = board.is_check()
+        self.king_square = board.king(board.turn)
+        self.checkmate = self.in_check and not self.legal_moves
+        self.stalemate = not self.in_check and not self.legal_moves
+        self.insufficient_material = board.is_insufficient_material()
+        self.attacks = None
+        self.occupied_co = list(board.occupied_co)
+        self.board_fen = board.board_fen()
+
+    def moves_from(self, square):
+        return self.moves_by_square.get(square, [])
+
+    def attack_maps(self, board):
+        # Squares attacked by each colour, as bitboards; built on first use
+        if self.attacks is None:
+            self.attacks = {chess.WHITE: 0, chess.BLACK: 0}
+            for color in chess.COLORS:
+                for square in chess.scan_forward(self.occupied_co[color]):
+                    self.attacks[color] |= board.attacks_mask(square)
+        return self.attacks
+
+    def game_over(self, board):
+        # (result, message) once the game has ended, otherwise None. The
+        # 75-move and fivefold checks depend on history, so they use the board.
+        if self.checkmate:
+            if self.turn == chess.WHITE:
+                return "0-1", "Checkmate! Black wins"
+            return "1-0", "Checkmate! White wins"
+        if self.stalemate:
+            return "1/2-1/2", "Stalemate! Draw"
+        if self.insufficient_material:
+            return "1/2-1/2", "Draw by insufficient material"
+        if board.halfmove_clock >= 150:
+            return "1/2-1/2", "Draw by 75-move rule"
+        if board.is_fivefold_repetition():
+            return "1/2-1/2", "Draw by fivefold repetition"
+        return None
+
+
+class PositionCache:
+    # LRU of PositionInfo keyed by Zobrist hash, shared by the hover highlight,
+    # the click handler, the AI root and the game-over check
+    def __init__(self, size=POSITION_CACHE_SIZE):
+        self.size = size
+        self.entries = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, board, key=None):
+        if key is None:
+            key = chess.polyglot.zobrist_hash(board)
+        info = self.entries.get(key)
+        if info is not None and info.board_fen == board.board_fen():
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return info
+        self.misses += 1
+        info = PositionInfo(board)
+        self.entries[key] = info
+        if len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+        return info
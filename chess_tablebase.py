@@ -0,0 +1,111 @@
+import collections
+import os
+import threading
+import chess
+import chess.polyglot
+import chess.syzygy
+
+# Local Syzygy directories; SYZYGY_PATH may list more, separated like PATH
+SYZYGY_DIRS = [os.path.join("assets", "syzygy")]
+TB_CACHE_SIZE = 100000
+# Tablebase wins score below mates so mate-in-N found by the search still wins
+TB_WIN_SCORE = 20000
+
+
+class EndgameTablebase:
+    def __init__(self, directories, cache_size=TB_CACHE_SIZE):
+        self.tablebase = chess.syzygy.Tablebase()
+        self.tables = 0
+        for directory in directories:
+            if os.path.isdir(directory):
+                self.tables += self.tablebase.add_directory(directory)
+        # Largest piece count covered, e.g. 5 for KRPvKR
+        self.max_pieces = max((len(name) - 1 for name in self.tablebase.wdl), default=0)
+        self.cache = collections.OrderedDict()
+        self.cache_lock = threading.Lock()
+        self.cache_size = cache_size
+        self.probes = 0
+        self.hits = 0
+
+    def covers(self, board):
+        return (self.max_pieces and not board.castling_rights and
+                chess.popcount(board.occupied) <= self.max_pieces)
+
+    def probe_wdl(self, board, key=None):
+        # Win/draw/loss for the side to move (-2..2), or None when not covered.
+        # Results are kept in an LRU keyed by the position's Polyglot Zobrist
+        # key, the same key the search passes in, so root and tree share entries.
+        if not self.covers(board):
+            return None
+        if key is None:
+            key = chess.polyglot.zobrist_hash(board)
+        with self.cache_lock:
+            self.probes += 1
+            if key in self.cache:
+                self.hits += 1
+                self.cache.move_to_end(key)
+                return self.cache[key]
+        wdl = self.tablebase.get_wdl(board)
+        with self.cache_lock:
+            self.cache[key] = wdl
+            if len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+        return wdl
+
+    def root_move(self, board):
+        # Best move by WDL, then DTZ: win as fast as possible, lose as slowly as possible
+        if not self.covers(board):
+            return None
+        board = board.copy()
+        best_move, best_rank = None, None
+        for move in board.legal_moves:
+            board.push(move)
+            try:
+                if board.is_checkmate():
+                    rank = (3, 0)
+                else:
+                    wdl = self.tablebase.get_wdl(board)
+                    dtz = self.tablebase.get_dtz(board)
+                    # A child without its table is left out rather than spoiling the probe
+                    if wdl is None or dtz is None:
+                        continue
+                    # Scores come back from the opponent's point of view
+                    wdl, dtz = -wdl, -dtz
+                    rank = (wdl, -abs(dtz) if wdl > 0 else abs(dtz))
+            finally:
+                board.pop()
+            if best_rank is None or rank > best_rank:
+                best_move, best_rank = move, rank
+        return best_move
+
+    def wdl_score(self, wdl, ply):
+        # Cursed wins and blessed losses (+-1) are draws under the 50-move rule
+        if wdl >= 2:
+            return TB_WIN_SCORE - ply
+        if wdl <= -2:
+            return -TB_WIN_SCORE + ply
+        return 0
+
+    def close(self):
+        self.tablebase.close()
+
+
+_shared_tablebase = None
+
+
+def get_tablebase(directories=None):
+    # Returns None when no tables are installed, so callers just skip probing
+    global _shared_tablebase
+    if _shared_tablebase is None:
+        if directories is None:
+            directories = SYZYGY_DIRS + [d for d in os.environ.get("SYZYGY_PATH", "").split(os.pathsep) if d]
+        try:
+            tablebase = EndgameTablebase(directories)
+        except Exception as e:
+            print(f"Failed to open Syzygy tablebases: {e}")
+            tablebase = None
+        if tablebase is not None and not tablebase.tables:
+            tablebase.close()
+            tablebase = None
+        _shared_tablebase = tablebase or False
+    return _shared_tablebase or None
@@ -0,0 +1,472 @@
+import argparse
+import os
+import shlex
+import sys
+import threading
+import time
+import chess
+import chess.engine
+from chess_engine import (SearchEngine, SearchResult, TranspositionTable, MATE_SCORE, MATE_THRESHOLD,
+                          MAX_PLY, TT_DEFAULT_MB)
+from chess_parallel import ParallelSearch
+from chess_tablebase import get_tablebase
+
+ENGINE_NAME = "GameZone Chess"
+ENGINE_AUTHOR = "GameZone Portal"
+# Idle engine processes kept alive for the next game
+ENGINE_POOL_SIZE = 4
+# Time kept back per move for process and pipe latency (seconds)
+MOVE_OVERHEAD = 0.05
+# How often a client checks its stop event and deadline (seconds)
+CLIENT_POLL_INTERVAL = 0.01
+
+
+class UCIFrontEnd:
+    # Speaks UCI on stdin/stdout for the built-in engine. Searches run on a
+    # thread so stop and ponderhit are handled while the engine thinks.
+    def __init__(self, input_stream=None, output_stream=None):
+        self.input = input_stream or sys.stdin
+        self.output = output_stream or sys.stdout
+        self.output_lock = threading.Lock()
+        self.hash_mb = TT_DEFAULT_MB
+        self.threads = 1
+        self.engine = None
+        self.board = chess.Board()
+        self.search_thread = None
+        self.stop_event = threading.Event()
+        self.ponderhit_event = threading.Event()
+        self.ponder_limits = None
+
+    def send(self, line):
+        with self.output_lock:
+            self.output.write(line + "\n")
+            self.output.flush()
+
+    def run(self):
+        for line in self.input:
+            if not self.handle(line.strip()):
+                break
+        self.stop_search()
+        self.drop_engine()
+
+    def drop_engine(self):
+        # Rebuilt on the next go, with a fresh table and the current options
+        if self.engine is not None:
+            self.engine.close()
+            self.engine = None
+
+    def create_engine(self):
+        if self.threads > 1:
+            # Hash is the total for the engine, split across the worker tables
+            self.engine = ParallelSearch(workers=self.threads, tt_size_mb=max(1, self.hash_mb // self.threads),
+                                         tablebase=get_tablebase())
+        else:
+            self.engine = SearchEngine(tt=TranspositionTable(size_mb=self.hash_mb), tablebase=get_tablebase())
+
+    def handle(self, line):
+        tokens = line.split()
+        if not tokens:
+            return True
+        command = tokens[0]
+        if command == "uci":
+            self.send(f"id name {ENGINE_NAME}")
+            self.send(f"id author {ENGINE_AUTHOR}")
+            self.send(f"option name Hash type spin default {TT_DEFAULT_MB} min 1 max 4096")
+            self.send(f"option name Threads type spin default 1 min 1 max {max(1, os.cpu_count() or 1)}")
+            self.send("option name Ponder type check default false")
+            self.send("uciok")
+        elif command == "isready":
+            self.send("readyok")
+        elif command == "setoption":
+            self.set_option(tokens)
+        elif command == "ucinewgame":
+            self.stop_search()
+            self.drop_engine()
+        elif command == "position":
+            self.stop_search()
+            self.set_position(tokens)
+        elif command == "go":
+            self.stop_search()
+            self.go(tokens)
+        elif command == "stop":
+            self.stop_search()
+        elif command == "ponderhit":
+            self.ponderhit()
+        elif command == "quit":
+            return False
+        return True
+
+    def set_option(self, tokens):
+        if "name" not in tokens:
+            return
+        name_end = tokens.index("value") if "value" in tokens else len(tokens)
+        name = " ".join(tokens[tokens.index("name") + 1:name_end]).lower()
+        value = " ".join(tokens[name_end + 1:])
+        try:
+            if name == "hash":
+                self.hash_mb = max(1, int(value))
+                self.drop_engine()
+            elif name == "threads":
+                self.threads = max(1, int(value))
+                self.drop_engine()
+        except ValueError:
+            self.send(f"info string invalid value for {name}: {value}")
+
+    def set_position(self, tokens):
+        if len(tokens) < 2:
+            return
+        moves_at = tokens.index("moves") if "moves" in tokens else len(tokens)
+        if tokens[1] == "startpos":
+            board = chess.Board()
+        elif tokens[1] == "fen":
+            board = chess.Board(" ".join(tokens[2:moves_at]))
+        else:
+            return
+        for uci in tokens[moves_at + 1:]:
+            board.push_uci(uci)
+        self.board = board
+
+    def go(self, tokens):
+        params = {}
+        search_moves = []
+        flags = set()
+        i = 1
+        while i < len(tokens):
+            token = tokens[i]
+            if token in ("infinite", "ponder"):
+                flags.add(token)
+            elif token == "searchmoves":
+                while i + 1 < len(tokens) and tokens[i + 1] not in ("wtime", "btime", "winc", "binc", "movestogo",
+                                                                    "depth", "nodes", "movetime", "infinite", "ponder"):
+                    i += 1
+                    search_moves.append(chess.Move.from_uci(tokens[i]))
+            elif i + 1 < len(tokens):
+                try:
+                    params[token] = int(tokens[i + 1])
+                except ValueError:
+                    pass
+                i += 1
+            i += 1
+
+        limits = {
+            'time_limit': self.allocate_time(params),
+            'node_limit': params.get('nodes'),
+            'max_depth': min(params.get('depth', MAX_PLY), MAX_PLY)
+        }
+        waits = bool(flags)
+        if "ponder" in flags:
+            # Run unlimited until ponderhit, then apply the clock we were given
+            self.ponder_limits = limits
+            limits = {'max_depth': limits['max_depth']}
+        elif "infinite" in flags:
+            limits = {'max_depth': limits['max_depth']}
+        if self.engine is None:
+            self.create_engine()
+        self.stop_event = threading.Event()
+        self.ponderhit_event = threading.Event()
+        self.search_thread = threading.Thread(
+            target=self.run_search, args=(self.board.copy(), limits, search_moves or None, waits), daemon=True
+        )
+        self.search_thread.start()
+
+    def allocate_time(self, params):
+        if "movetime" in params:
+            return max(0.001, params["movetime"] / 1000 - MOVE_OVERHEAD)
+        remaining = params.get("wtime" if self.board.turn == chess.WHITE else "btime")
+        if remaining is None:
+            return None
+        increment = params.get("winc" if self.board.turn == chess.WHITE else "binc", 0)
+        moves_to_go = params.get("movestogo", 30)
+        budget = remaining / max(1, moves_to_go) + increment * 0.75
+        return max(0.01, min(budget, remaining * 0.5) / 1000 - MOVE_OVERHEAD)
+
+    def run_search(self, board, limits, search_moves, waits):
+        result = self.engine.search(board, on_iteration=self.report, stop_event=self.stop_event,
+                                    root_moves=search_moves, **limits)
+        if waits:
+            # UCI: no bestmove for infinite/ponder searches until stop or ponderhit
+            while not self.stop_event.is_set() and not self.ponderhit_event.is_set():
+                self.stop_event.wait(CLIENT_POLL_INTERVAL)
+        if result.move is None:
+            self.send("bestmove 0000")
+        elif result.ponder is not None:
+            self.send(f"bestmove {result.move.uci()} ponder {result.ponder.uci()}")
+        else:
+            self.send(f"bestmove {result.move.uci()}")
+
+    def report(self, result):
+        self.send(f"info depth {result.depth} score {format_score(result.score)} nodes {result.nodes} "
+                  f"nps {result.nps:.0f} time {int(result.elapsed * 1000)} pv {result.move.uci()}")
+
+    def ponderhit(self):
+        if self.search_thread is not None and self.ponder_limits is not None:
+            self.engine.ponderhit(**self.ponder_limits)
+            self.ponder_limits = None
+            self.ponderhit_event.set()
+
+    def stop_search(self):
+        if self.search_thread is not None:
+            self.stop_event.set()
+            self.search_thread.join()
+            self.search_thread = None
+        self.ponder_limits = None
+
+
+def format_score(score):
+    if abs(score) >= MATE_THRESHOLD:
+        plies = MATE_SCORE - abs(score)
+        moves = (plies + 1) // 2
+        return f"mate {moves if score > 0 else -moves}"
+    return f"cp {score}"
+
+
+def builtin_engine_command():
+    return [sys.executable, os.path.abspath(__file__), "uci"]
+
+
+class UCIEnginePool:
+    # Long-lived UCI engine processes, handed out to one client at a time and
+    # kept running between games instead of being spawned per move or game
+    def __init__(self, command=None, size=ENGINE_POOL_SIZE):
+        self.command = command or builtin_engine_command()
+        self.size = size
+        self.idle = []
+        # Every live process, including ones handed out, so close() can stop them all
+        self.engines = []
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        with self.lock:
+            if self.idle:
+                return self.idle.pop()
+        engine = chess.engine.SimpleEngine.popen_uci(self.command)
+        with self.lock:
+            self.engines.append(engine)
+        return engine
+
+    def release(self, engine, options=()):
+        # options are the names the client set. They go back to the engine's
+        # defaults before it idles, so the next game inherits none of them; for
+        # the built-in engine that also drops its table and worker processes.
+        with self.lock:
+            if engine not in self.engines:
+                return
+        try:
+            defaults = {name: engine.options[name].default for name in options}
+            if defaults:
+                engine.configure(defaults)
+            engine.ping()
+            with self.lock:
+                if engine in self.engines and len(self.idle) < self.size:
+                    self.idle.append(engine)
+                    return
+        except Exception as e:
+            print(f"Failed to reset UCI engine: {e}")
+        with self.lock:
+            if engine in self.engines:
+                self.engines.remove(engine)
+        try:
+            engine.quit()
+        except Exception as e:
+            print(f"Failed to stop UCI engine: {e}")
+
+    def close(self):
+        with self.lock:
+            engines, self.engines, self.idle = self.engines, [], []
+        for engine in engines:
+            try:
+                engine.quit()
+            except Exception as e:
+                print(f"Failed to stop UCI engine: {e}")
+
+
+_shared_pool = None
+
+
+def _close_on_exit(pool):
+    threading.main_thread().join()
+    pool.close()
+
+
+def get_engine_pool():
+    # CHESS_ENGINE_COMMAND swaps in any local UCI binary for the built-in engine
+    global _shared_pool
+    if _shared_pool is None:
+        command = os.environ.get("CHESS_ENGINE_COMMAND")
+        _shared_pool = UCIEnginePool(shlex.split(command) if command else None)
+        # python-chess talks to each engine on a non-daemon thread, which the
+        # interpreter waits for before atexit handlers run; close the pool as
+        # soon as the main thread finishes instead
+        threading.Thread(target=_close_on_exit, args=(_shared_pool,), daemon=True).start()
+    return _shared_pool
+
+
+class UCIClient:
+    # One pooled engine process held for a game, with the same search()/
+    # ponderhit()/close() interface as SearchEngine. The time budget is kept
+    # here rather than sent to the engine, so ponderhit can still change it.
+    # The process is taken on the first search, on the caller's search thread;
+    # if it cannot be started, fallback() builds an in-process engine instead.
+    def __init__(self, pool, options=None, fallback=None):
+        self.pool = pool
+        self.options = options or {}
+        self.fallback = fallback
+        self.engine = None
+        self.local = None
+        # Options actually set on the engine, reset when it goes back to the pool
+        self.configured = []
+        self.deadline = None
+        self.node_limit = None
+        self.search_start = 0.0
+        # Held for the length of a search, so close() never hands a busy engine back
+        self.search_lock = threading.Lock()
+        # Set for good by close(); only reopen() clears it
+        self.closing = threading.Event()
+
+    def start(self):
+        if self.engine is None and self.local is None:
+            try:
+                self.engine = self.pool.acquire()
+                # Only set options the engine actually has, within its range
+                engine_options = self.engine.options
+                options = {}
+                for name, value in self.options.items():
+                    if name in engine_options:
+                        option = engine_options[name]
+                        if option.type == "spin":
+                            value = max(option.min, min(value, option.max))
+                        options[name] = value
+                if options:
+                    self.engine.configure(options)
+                self.configured = list(options)
+            except Exception as e:
+                if self.engine is not None:
+                    self.pool.release(self.engine)
+                    self.engine = None
+                if self.fallback is None:
+                    raise
+                print(f"Failed to start UCI engine, searching in-process: {e}")
+                self.local = self.fallback()
+        return self
+
+    def close(self):
+        self.closing.set()
+        with self.search_lock:
+            if self.engine is not None:
+                self.pool.release(self.engine, self.configured)
+                self.engine = None
+        if self.local is not None:
+            self.local.close()
+
+    def reopen(self):
+        # Lets a closed client search again; it takes a new engine from the pool
+        self.closing.clear()
+        return self
+
+    def ponderhit(self, time_limit=None, node_limit=None, max_depth=None):
+        if self.local is not None:
+            self.local.ponderhit(time_limit, node_limit, max_depth)
+            return
+        # A ponder search was sent with no limits, so both budgets are enforced
+        # by the watcher; max_depth was fixed at ponder start, as in SearchEngine
+        self.deadline = self.search_start + time_limit if time_limit else None
+        self.node_limit = node_limit
+
+    def search(self, board, time_limit=None, node_limit=None, max_depth=MAX_PLY, on_iteration=None,
+               stop_event=None, root_moves=None):
+        # root_moves (e.g. the legal moves from the game's position cache) go to
+        # the engine as searchmoves, so it searches exactly the caller's list
+        with self.search_lock:
+            if self.closing.is_set():
+                # Closed while this search waited for the lock: no engine is taken, so none can leak
+                return SearchResult(None, 0, 0, 0, 0.0)
+            self.start()
+            if self.local is not None:
+                return self.local.search(board, time_limit, node_limit, max_depth, on_iteration, stop_event, root_moves)
+            self.search_start = time.perf_counter()
+            self.deadline = self.search_start + time_limit if time_limit else None
+            self.node_limit = node_limit
+            limit = chess.engine.Limit(nodes=node_limit, depth=max_depth if max_depth < MAX_PLY else None)
+            # game=self: the engine gets ucinewgame whenever it changes clients
+            root_moves = list(root_moves) if root_moves else None
+            with self.engine.analysis(board, limit, game=self, root_moves=root_moves) as analysis:
+                finished = threading.Event()
+                watcher = threading.Thread(target=self.watch, args=(analysis, stop_event, finished), daemon=True)
+                watcher.start()
+                best = analysis.wait()
+                finished.set()
+                info = analysis.info
+        elapsed = time.perf_counter() - self.search_start
+        score = info.get("score")
+        score = score.relative.score(mate_score=MATE_SCORE) if score is not None else 0
+        return SearchResult(best.move, score, info.get("depth", 0), info.get("nodes", 0), elapsed, best.ponder)
+
+    def watch(self, analysis, stop_event, finished):
+        # Stops the engine when the caller cancels, the deadline passes or the
+        # engine's reported node count reaches the limit set by ponderhit
+        while not finished.wait(CLIENT_POLL_INTERVAL):
+            deadline, node_limit = self.deadline, self.node_limit
+            stopped = self.closing.is_set() or (stop_event is not None and stop_event.is_set())
+            if node_limit is not None and analysis.info.get("nodes", 0) >= node_limit:
+                stopped = True
+            if stopped or (deadline is not None and time.perf_counter() >= deadline):
+                analysis.stop()
+                return
+
+
+def run_match(games, movetime, white_command=None, black_command=None):
+    # Headless engine-vs-engine games over pooled processes, for throughput runs
+    pools = [UCIEnginePool(white_command, size=1), UCIEnginePool(black_command, size=1)]
+    clients = [UCIClient(pool) for pool in pools]
+    results = {"1-0": 0, "0-1": 0, "1/2-1/2": 0}
+    plies = nodes = 0
+    start = time.perf_counter()
+    try:
+        for game in range(games):
+            board = chess.Board()
+            # Alternate colours so neither side always moves first
+            players = clients if game % 2 == 0 else clients[::-1]
+            while not board.is_game_over() and len(board.move_stack) < 400:
+                result = players[0 if board.turn == chess.WHITE else 1].search(board, time_limit=movetime)
+                board.push(result.move)
+                plies += 1
+                nodes += result.nodes
+            outcome = board.result(claim_draw=True)
+            outcome = outcome if outcome in results else "1/2-1/2"
+            if game % 2 == 1 and outcome != "1/2-1/2":
+                outcome = "0-1" if outcome == "1-0" else "1-0"
+            results[outcome] += 1
+            print(f"game {game + 1}: {board.result(claim_draw=True)} in {len(board.move_stack)} plies")
+    finally:
+        for client in clients:
+            client.close()
+        for pool in pools:
+            pool.close()
+    elapsed = time.perf_counter() - start
+    print(f"{games} games, {plies} moves in {elapsed:.1f}s ({plies / elapsed:.1f} moves/sec, "
+          f"{nodes / elapsed:.0f} nodes/sec)")
+    print(f"first engine: +{results['1-0']} -{results['0-1']} ={results['1/2-1/2']}")
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="GameZone chess engine")
+    subparsers = parser.add_subparsers(dest="command")
+    subparsers.add_parser("uci", help="speak UCI on stdin/stdout")
+    match = subparsers.add_parser("match", help="play engine-vs-engine games headless")
+    match.add_argument("--games", type=int, default=2)
+    match.add_argument("--movetime", type=float, default=0.1, help="seconds per move")
+    match.add_argument("--white", help="engine command (default: built-in engine)")
+    match.add_argument("--black", help="engine command (default: built-in engine)")
+    args = parser.parse_args(argv)
+
+    if args.command == "match":
+        run_match(args.games, args.movetime,
+                  shlex.split(args.white) if args.white else None,
+                  shlex.split(args.black) if args.black else None)
+    else:
+        UCIFrontEnd().run()
+
+
+if __name__ == "__main__":
+    main()
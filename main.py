@@ -2,12 +2,21 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 from utils.auth import LoginWindow, SignupWindow, ContactWindow
 from db_config import get_db_connection
-from tic_tac_toe import TicTacToeGame
+from tic_tac_toe import TicTacToeGame, VARIANTS
 from snake_game import SnakeGame
+from snake_arena_game import SnakeArenaGame
 from car_racing import CarRacingGame
 from chess_game import ChessGame
+from utils.assets import get_assets
+import importlib.util
+import os
+import subprocess
+import sys
 import traceback
 
+# Games with a pygame renderer, run in their own process by pygame_games.py
+PYGAME_GAMES = {"Snake (pygame)": "Snake", "Car Racing (pygame)": "Car Racing"}
+
 print("Starting main.py...")
 
 try:
@@ -20,6 +29,8 @@ try:
             self.root.minsize(600, 400)
             self.root.configure(bg="#1a1a2e")  # Dark gaming theme background
             self.username = None  # Initialize username as None
+            # Decode the game images in the background, so opening a game does not wait on disk
+            get_assets().preload()
 
             self.root.grid_columnconfigure(0, weight=1)
             self.root.grid_rowconfigure(0, weight=1)
@@ -76,7 +87,7 @@ try:
             self.game_dropdown = ttk.Combobox(
                 self.root,
                 textvariable=self.game_var,
-                values=["Tic Tac Toe", "Snake", "Car Racing", "Chess"],
+                values=list(VARIANTS) + ["Snake", "Snake Arena", "Car Racing", "Chess"] + list(PYGAME_GAMES),
                 state="readonly",
                 font=("Arial Black", 12),
                 width=15
@@ -207,14 +218,30 @@ try:
             print("Starting game:", self.game_var.get(), "Difficulty:", self.difficulty_var.get())
             game = self.game_var.get()
             difficulty = self.difficulty_var.get().lower()
-            if game == "Tic Tac Toe":
-                TicTacToeGame(self.root, difficulty, self.username)
+            if game in VARIANTS:
+                size, win_length = VARIANTS[game]
+                TicTacToeGame(self.root, difficulty, self.username, size, win_length)
             elif game == "Snake":
                 SnakeGame(self.root, difficulty, self.username)
+            elif game == "Snake Arena":
+                SnakeArenaGame(self.root, difficulty, self.username)
             elif game == "Car Racing":
                 CarRacingGame(self.root, difficulty, self.username)
             elif game == "Chess":
                 ChessGame(self.root, difficulty, self.username)
+            elif game in PYGAME_GAMES:
+                self.start_pygame(PYGAME_GAMES[game], difficulty)
+
+        def start_pygame(self, game, difficulty):
+            # pygame needs the main thread's event loop just like Tk, so the game gets its own process
+            if importlib.util.find_spec("pygame") is None:
+                messagebox.showerror("Error", "pygame is not installed")
+                return
+            script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pygame_games.py")
+            try:
+                subprocess.Popen([sys.executable, script, game, difficulty, self.username or ""])
+            except Exception as e:
+                print(f"Failed to start {game}: {e}")
 
     if __name__ == "__main__":
         print("Creating Tkinter root...")
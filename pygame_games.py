@@ -0,0 +1,401 @@
+import datetime
+import os
+import sys
+import time
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+import pygame
+from db_config import get_db_connection
+from snake_engine import SnakeEngine
+from car_racing_engine import CarRacingEngine
+from utils.game_loop import MAX_STEPS
+from utils.sound import get_sound
+
+# Frames drawn a second at most; the games step at their own fixed rate
+FRAME_RATE = 60
+BACKDROP = "#1a1a2e"
+# Menu and game over text swaps between these once a second
+TEXT_COLORS = ["#00ffcc", "#ffcc00"]
+
+
+class DirtyScene:
+    # Named sprites over a static background, sent to the display as dirty
+    # rects: a sprite drawn again unchanged costs nothing, a moved or changed
+    # one is erased with the background under it and blitted again, and only
+    # those rects are updated. Sprites are blitted in the order they are drawn.
+    def __init__(self, screen, dirty_rects=True):
+        self.screen = screen
+        self.dirty_rects = dirty_rects
+        self.background = None
+        self.sprites = {}
+        self.frame = {}
+        self.full = True
+
+    def set_background(self, background):
+        # The next commit redraws and flips the whole screen
+        self.background = background
+        self.sprites = {}
+        self.full = True
+
+    def draw(self, name, surface, pos, anchor="topleft"):
+        self.frame[name] = (surface, surface.get_rect(**{anchor: pos}))
+
+    def commit(self):
+        screen, frame, sprites = self.screen, self.frame, self.sprites
+        if self.full or not self.dirty_rects:
+            screen.blit(self.background, (0, 0))
+            for surface, rect in frame.values():
+                screen.blit(surface, rect)
+            pygame.display.flip()
+            dirty = [screen.get_rect()]
+        else:
+            # Where changed sprites were and where they are now
+            dirty = [sprite[1] for name, sprite in sprites.items() if frame.get(name) != sprite]
+            dirty.extend(sprite[1] for name, sprite in frame.items() if sprites.get(name) != sprite)
+            if dirty:
+                # Each area is cleared and everything over it blitted again in
+                # order, clipped to it, so blended edges never build up
+                drawn = list(frame.values())
+                rects = [rect for surface, rect in drawn]
+                for area in dirty:
+                    screen.set_clip(area)
+                    screen.blit(self.background, area, area)
+                    for i in area.collidelistall(rects):
+                        screen.blit(*drawn[i])
+                screen.set_clip(None)
+                pygame.display.update(dirty)
+        self.sprites, self.frame, self.full = frame, {}, False
+        return len(dirty)
+
+
+class PygameGame:
+    # Window, fixed-timestep loop, menu and game over screens shared by the
+    # pygame games. Subclasses set name, title and a headless engine, and
+    # provide on_resize, on_game_key, update and draw_game.
+    name = None
+    title = None
+
+    def __init__(self, difficulty, username, size, rate, dirty_rects=True):
+        pygame.init()
+        self.difficulty = difficulty
+        self.username = username
+        self.rate = rate
+        self.screen = pygame.display.set_mode(size, pygame.RESIZABLE)
+        pygame.display.set_caption(self.title)
+        self.scene = DirtyScene(self.screen, dirty_rects)
+        self.clock = pygame.time.Clock()
+        self.sound = get_sound()
+        self.images = {}
+        self.fonts = {}
+        self.texts = {}
+        self.state = "menu"
+        self.paused = False
+        self.running = False
+        self.resize(*size)
+
+    def load_image(self, key, path):
+        # Loaded and convert()-ed once; None when the file cannot be read
+        if key not in self.images:
+            try:
+                self.images[key] = pygame.image.load(path).convert_alpha()
+            except Exception as e:
+                print(f"Failed to load {key}: {e}")
+                self.images[key] = None
+        return self.images[key]
+
+    def load_sprite(self, key, path, size, fill, outline):
+        # Scaled once per window size; a missing image becomes the box the Tk view draws
+        image = self.load_image(key, path)
+        if image is None:
+            surface = pygame.Surface(size)
+            surface.fill(fill)
+            pygame.draw.rect(surface, outline, surface.get_rect(), 1)
+            return surface.convert()
+        return pygame.transform.smoothscale(image, size).convert_alpha()
+
+    def font(self, family, size):
+        if (family, size) not in self.fonts:
+            self.fonts[(family, size)] = pygame.font.SysFont(family, size, bold=True)
+        return self.fonts[(family, size)]
+
+    def text(self, name, text, size, color, pos, anchor="center", family="Arial Black"):
+        # Rendered again only when the text or its style changes
+        key = (text, size, color, family)
+        cached = self.texts.get(name)
+        if cached is None or cached[0] != key:
+            cached = self.texts[name] = (key, self.font(family, size).render(text, True, color))
+        self.scene.draw(name, cached[1], pos, anchor)
+
+    def resize(self, width, height):
+        self.width, self.height = width, height
+        self.screen = self.scene.screen = pygame.display.get_surface()
+        self.font_size = max(16, width // 30)
+        self.backdrop = pygame.Surface((width, height)).convert()
+        self.backdrop.fill(BACKDROP)
+        self.on_resize()
+        self.enter(self.state)
+
+    def enter(self, state):
+        self.state = state
+        self.scene.set_background(self.background if state == "playing" else self.backdrop)
+
+    def save_score(self):
+        if not self.username:
+            return
+        try:
+            conn = get_db_connection()
+            cursor = conn.cursor()
+            cursor.execute("SELECT id FROM users WHERE username = %s", (self.username,))
+            user_id = cursor.fetchone()
+            if user_id:
+                cursor.execute(
+                    "INSERT INTO game_scores (user_id, game_name, difficulty_level, score, played_at) "
+                    "VALUES (%s, %s, %s, %s, %s)",
+                    (user_id[0], self.name, self.difficulty, self.engine.score, datetime.datetime.now())
+                )
+                conn.commit()
+            cursor.close()
+            conn.close()
+        except Exception as e:
+            print(f"Failed to save score: {e}")
+
+    def quit(self):
+        self.running = False
+        self.save_score()
+
+    def reset(self):
+        self.engine.reset()
+        self.paused = False
+        self.enter("playing")
+
+    def handle_events(self):
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                self.quit()
+            elif event.type == pygame.VIDEORESIZE:
+                self.resize(max(1, event.w), max(1, event.h))
+            elif event.type == pygame.KEYDOWN:
+                self.on_key_press(event.key)
+            elif event.type == pygame.KEYUP and self.state == "playing":
+                self.on_game_key(event.key, False)
+
+    def on_key_press(self, key):
+        if key == pygame.K_ESCAPE:
+            self.quit()
+        elif self.state == "menu":
+            if key == pygame.K_SPACE:
+                self.sound.play(1000, 100)
+                self.enter("playing")
+        elif self.state == "gameover":
+            if key == pygame.K_r:
+                self.sound.play(1000, 100)
+                self.reset()
+        elif self.state == "playing":
+            if key == pygame.K_p:
+                self.paused = not self.paused
+            else:
+                self.on_game_key(key, True)
+
+    def gameover_text(self):
+        return "Game Over!"
+
+    def draw_screen(self, title, subtitle, hint):
+        color = TEXT_COLORS[int(time.perf_counter()) % 2]
+        self.text("text1", title, self.font_size + 4, color, (self.width // 2, 200), family="Impact")
+        self.text("text2", subtitle, self.font_size, color, (self.width // 2, 250))
+        self.text("text3", hint, self.font_size, color, (self.width // 2, 290))
+
+    def render(self, alpha):
+        if self.state == "playing":
+            self.draw_game(alpha)
+            self.text("score", f"Score: {self.engine.score}", self.font_size, "#ffcc00", (10, 10), "topleft")
+            if self.paused:
+                self.text("paused", "Paused - [P] to Resume", self.font_size, "#ffcc00",
+                          (self.width // 2, self.height // 2))
+        elif self.state == "menu":
+            self.draw_screen(self.title, "Press [SPACE] to Start", "Press [ESC] to Quit")
+        else:
+            self.draw_screen(self.gameover_text(), f"Score: {self.engine.score}", "Press [R] to Retry or [ESC] to Quit")
+        return self.scene.commit()
+
+    def run(self):
+        # Fixed-timestep loop as in utils.game_loop.GameLoop, but pygame owns
+        # the event loop here: up to MAX_STEPS steps of 1/rate seconds per
+        # frame, older backlog dropped, then one render capped at FRAME_RATE
+        step = 1.0 / self.rate
+        accumulator = 0.0
+        last = time.perf_counter()
+        self.running = True
+        while self.running:
+            self.handle_events()
+            now = time.perf_counter()
+            if self.paused:
+                accumulator = 0.0
+            else:
+                accumulator += now - last
+                steps = 0
+                while accumulator >= step and steps < MAX_STEPS and self.running:
+                    self.update()
+                    accumulator -= step
+                    steps += 1
+                if accumulator >= step:
+                    accumulator %= step
+            last = now
+            if self.running:
+                self.render(0.0 if self.paused else accumulator / step)
+                self.clock.tick(FRAME_RATE)
+
+
+class SnakePygame(PygameGame):
+    name = "Snake"
+    title = "Snake Game"
+
+    def __init__(self, difficulty, username, dirty_rects=True):
+        self.grid_size = 20
+        self.engine = SnakeEngine(800 // self.grid_size, 600 // self.grid_size)
+        PygameGame.__init__(self, difficulty, username, (800, 600),
+                            {'easy': 10, 'medium': 15, 'hard': 20}[difficulty], dirty_rects)
+
+    def on_resize(self):
+        self.grid_size = max(1, min(self.width, self.height) // 20)
+        self.engine.resize(self.width // self.grid_size, self.height // self.grid_size)
+        size = (self.grid_size, self.grid_size)
+        self.snake_image = self.load_sprite('snake_image', os.path.join('assets', 'snake.png'), size,
+                                            "#00ffcc", "#ff0066")
+        self.fruit_image = self.load_sprite('fruit_image', os.path.join('assets', 'fruit.png'), size,
+                                            "#ff0066", "#ffffff")
+        self.background = self.render_background()
+
+    def render_background(self):
+        # Grass and grid overlay, as in the Tk view
+        grass = self.load_image('bg_image', os.path.join('assets', 'grass.png'))
+        if grass:
+            background = pygame.transform.smoothscale(grass, (self.width, self.height)).convert()
+        else:
+            background = self.backdrop.copy()
+        for x in range(0, self.width, self.grid_size):
+            pygame.draw.line(background, "#2e2e4e", (x, 0), (x, self.height))
+        for y in range(0, self.height, self.grid_size):
+            pygame.draw.line(background, "#2e2e4e", (0, y), (self.width, y))
+        return background
+
+    def on_game_key(self, key, pressed):
+        direction = {pygame.K_UP: 'up', pygame.K_DOWN: 'down', pygame.K_LEFT: 'left', pygame.K_RIGHT: 'right'}.get(key)
+        if pressed and direction:
+            self.engine.turn(direction)
+
+    def gameover_text(self):
+        return "You Win!" if self.engine.won else "Game Over!"
+
+    def draw_game(self, alpha):
+        # Segments are named by cell, so a step erases one and blits one
+        size = self.grid_size
+        for x, y in self.engine.snake:
+            self.scene.draw(f"snake{x}_{y}", self.snake_image, (x * size, y * size))
+        fruit = self.engine.fruit
+        if fruit is not None:
+            self.scene.draw("fruit", self.fruit_image, (fruit[0] * size, fruit[1] * size))
+
+    def update(self):
+        if self.state == "playing":
+            events = self.engine.step()
+            if 'eat' in events:
+                self.sound.play(1200, 100)
+            if self.engine.over:
+                self.save_score()
+                self.enter("gameover")
+
+
+class CarRacingPygame(PygameGame):
+    name = "Car Racing"
+    title = "Car Racing"
+
+    def __init__(self, difficulty, username, dirty_rects=True):
+        self.engine = CarRacingEngine(difficulty, 500, 700)
+        PygameGame.__init__(self, difficulty, username, (500, 700), 60, dirty_rects)
+
+    def on_resize(self):
+        self.engine.resize(self.width, self.height)
+        size = (self.width // 10, self.width // 5)
+        self.car_img = self.load_sprite('car_img', os.path.join('assets', 'car.png'), size, "#ff0066", "#00ffcc")
+        self.enemy_img = self.load_sprite('enemy_img', os.path.join('assets', 'enemy_car.png'), size,
+                                          "#ffcc00", "#00ffcc")
+        self.marks = {}
+        for color in ("#ffffff", "#cccccc"):
+            self.marks[color] = pygame.Surface((5, 20)).convert()
+            self.marks[color].fill(color)
+        self.background = self.render_background()
+
+    def render_background(self):
+        # Verge, road, grass tiles and their grid, as in the Tk view
+        width, height = self.width, self.height
+        background = pygame.Surface((width, height)).convert()
+        background.fill("#646464")
+        road = pygame.Rect(width // 5, 0, width * 3 // 5, height)
+        background.fill(BACKDROP, road)
+        pygame.draw.rect(background, "#00ffcc", road, 3)
+        tile = max(1, width // 5)
+        grass = self.load_image('grass_img', os.path.join('assets', 'grass.png'))
+        if grass:
+            grass = pygame.transform.smoothscale(grass, (tile, tile)).convert()
+        for y in range(0, height, tile):
+            for x in (0, width * 4 // 5):
+                if grass:
+                    background.blit(grass, (x, y))
+                else:
+                    background.fill("#228B22", (x, y, tile, tile))
+                    pygame.draw.rect(background, "#000000", (x, y, tile, tile), 1)
+        for x in range(0, width // 5, 20):
+            pygame.draw.line(background, "#2e2e4e", (x, 0), (x, height))
+            pygame.draw.line(background, "#2e2e4e", (width * 4 // 5 + x, 0), (width * 4 // 5 + x, height))
+        for y in range(0, height, 20):
+            pygame.draw.line(background, "#2e2e4e", (0, y), (width // 5, y))
+            pygame.draw.line(background, "#2e2e4e", (width * 4 // 5, y), (width, y))
+        return background
+
+    def on_game_key(self, key, pressed):
+        if key == pygame.K_LEFT:
+            self.engine.move_left = pressed
+        elif key == pygame.K_RIGHT:
+            self.engine.move_right = pressed
+
+    def draw_game(self, alpha):
+        # Opponents are named by their slot in the store and drawn alpha of a step further on
+        engine, scene = self.engine, self.scene
+        road_rect = engine.road_rect
+        mark = self.marks["#ffffff" if engine.lane_pulse < 10 else "#cccccc"]
+        for i, y in enumerate(range(-int(engine.lane_offset), self.height, 35)):
+            scene.draw(f"mark{i}", mark, (road_rect[0] + road_rect[2] // 2 - 2, y))
+        scene.draw("player", self.car_img, (engine.player_car['x'], engine.player_car['y']))
+        cars = engine.opponent_cars
+        slots = cars.active()
+        ys = cars.y[slots] + alpha * (cars.speed[slots] + engine.speed_increase)
+        for slot, x, y in zip(slots.tolist(), cars.x[slots].tolist(), ys.tolist()):
+            scene.draw(f"car{slot}", self.enemy_img, (x, y))
+
+    def update(self):
+        if self.state == "playing":
+            events = self.engine.step()
+            if 'crash' in events:
+                self.sound.play(800, 200)
+                self.enter("gameover")
+            elif 'pass' in events:
+                self.sound.play(1200, 100)
+
+
+GAMES = {"Snake": SnakePygame, "Car Racing": CarRacingPygame}
+
+
+def main(argv):
+    # Started by the portal in its own process, as pygame and Tk each need
+    # the main thread's event loop: pygame_games.py <game> <difficulty> [username]
+    if len(argv) < 3 or argv[1] not in GAMES:
+        print(f"Usage: {argv[0]} <{'|'.join(GAMES)}> <easy|medium|hard> [username]")
+        return 1
+    username = argv[3] if len(argv) > 3 and argv[3] else None
+    GAMES[argv[1]](argv[2], username).run()
+    pygame.quit()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
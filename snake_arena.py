@@ -0,0 +1,303 @@
+import collections
+import heapq
+import random
+import numpy as np
+
+# Arena settings per difficulty: more bots and fruit on harder levels
+ARENA_SETTINGS = {
+    'easy': {'bots': 50, 'fruits': 150},
+    'medium': {'bots': 150, 'fruits': 300},
+    'hard': {'bots': 300, 'fruits': 500}
+}
+ARENA_COLS, ARENA_ROWS = 200, 200
+START_LENGTH = 3
+# Ticks a dead bot waits before it respawns
+RESPAWN_TICKS = 30
+# A* searches per tick; bots over the budget take a greedy step instead
+REPLAN_BUDGET = 40
+MAX_EXPANSIONS = 400
+# Cells a safety flood fill counts before calling a move safe
+SAFETY_CAP = 40
+
+# Directions as (dx, dy), in the column order of the neighbour array
+DIRECTIONS = {'up': (0, -1), 'down': (0, 1), 'left': (-1, 0), 'right': (1, 0)}
+
+
+class Snake:
+    def __init__(self, snake_id, cells, player=False):
+        self.id = snake_id
+        # Flat cell indices (y * cols + x), head first
+        self.body = collections.deque(cells)
+        self.player = player
+        # Set by SnakeArena.place once the snake is on the grid
+        self.alive = False
+        self.respawn_at = 0
+        self.score = 0
+        # Planned cells still to walk, next one last, and the fruit they lead to
+        self.path = []
+        self.target = None
+
+    @property
+    def head(self):
+        return self.body[0]
+
+
+class SnakeArena:
+    # Many snakes on one wrapping grid. The grid holds the id of the snake on
+    # each cell (0 = empty), bots plan over it with A*, and each tick's moves
+    # and collisions are resolved for all snakes at once with NumPy.
+    def __init__(self, cols=ARENA_COLS, rows=ARENA_ROWS, bots=150, fruits=300, seed=None):
+        self.cols, self.rows = cols, rows
+        cells = cols * rows
+        self.grid = np.zeros(cells, dtype=np.int32)
+        self.fruit = np.zeros(cells, dtype=bool)
+        self.fruit_target = fruits
+        index = np.arange(cells)
+        x, y = index % cols, index // cols
+        # Neighbour of every cell in each direction, wrapping at the edges
+        self.neighbours = np.stack([
+            ((y - 1) % rows) * cols + x,
+            ((y + 1) % rows) * cols + x,
+            y * cols + (x - 1) % cols,
+            y * cols + (x + 1) % cols
+        ], axis=1).astype(np.int32)
+        # Plain lists for the per-cell loops of the planner
+        self.neighbour_lists = self.neighbours.tolist()
+        self.rng = random.Random(seed)
+        self.np_rng = np.random.default_rng(seed)
+        self.snakes = []
+        # Per cell, how many live heads are next to it (refreshed every tick)
+        self.danger = np.zeros(cells, dtype=np.int32)
+        self.tick_count = 0
+        self.player = None
+        for _ in range(bots):
+            self.add_snake()
+        self.spawn_fruit()
+
+    def cell(self, x, y):
+        return (y % self.rows) * self.cols + x % self.cols
+
+    def position(self, cell):
+        return cell % self.cols, cell // self.cols
+
+    def free_cells(self):
+        return np.flatnonzero((self.grid == 0) & ~self.fruit)
+
+    def place(self, snake, free=None):
+        # Drops the snake on a free cell, laid out behind its head
+        if free is None:
+            free = self.free_cells()
+        if not len(free):
+            return False
+        for _ in range(20):
+            head = int(free[self.rng.randrange(len(free))])
+            # free may predate snakes placed earlier in the same tick
+            if self.grid[head] or self.fruit[head]:
+                continue
+            cells = [head]
+            for _ in range(START_LENGTH - 1):
+                nxt = self.neighbour_lists[cells[-1]][2]
+                if self.grid[nxt] or self.fruit[nxt] or nxt in cells:
+                    break
+                cells.append(nxt)
+            else:
+                snake.body = collections.deque(cells)
+                self.grid[cells] = snake.id
+                snake.alive = True
+                snake.path, snake.target = [], None
+                return True
+        return False
+
+    def add_snake(self, player=False):
+        snake = Snake(len(self.snakes) + 1, [], player)
+        self.snakes.append(snake)
+        if not self.place(snake):
+            # No room now: a bot retries with the next respawns
+            snake.respawn_at = self.tick_count
+        if player:
+            self.player = snake
+        return snake
+
+    def spawn_fruit(self, free=None):
+        missing = self.fruit_target - int(self.fruit.sum())
+        if missing <= 0:
+            return
+        if free is None:
+            free = self.free_cells()
+        if len(free):
+            picks = self.np_rng.choice(free, size=min(missing, len(free)), replace=False)
+            self.fruit[picks] = True
+
+    def distance(self, a, b):
+        # Manhattan distance on the wrapping grid
+        ax, ay = a % self.cols, a // self.cols
+        bx, by = b % self.cols, b // self.cols
+        dx, dy = abs(ax - bx), abs(ay - by)
+        return min(dx, self.cols - dx) + min(dy, self.rows - dy)
+
+    def nearest_fruit(self, cell):
+        fruits = np.flatnonzero(self.fruit)
+        if not len(fruits):
+            return None
+        x, y = cell % self.cols, cell // self.cols
+        dx = np.abs(fruits % self.cols - x)
+        dy = np.abs(fruits // self.cols - y)
+        dist = np.minimum(dx, self.cols - dx) + np.minimum(dy, self.rows - dy)
+        return int(fruits[dist.argmin()])
+
+    def astar(self, snake, target):
+        # Shortest path to target over empty cells, or None past the
+        # expansion limit. Returned reversed so the next cell is last.
+        start = snake.head
+        grid, neighbours = self.grid, self.neighbour_lists
+        came_from = {start: None}
+        cost = {start: 0}
+        heap = [(self.distance(start, target), 0, start)]
+        expansions = 0
+        while heap:
+            _, g, cell = heapq.heappop(heap)
+            if cell == target:
+                path = []
+                while cell != start:
+                    path.append(cell)
+                    cell = came_from[cell]
+                return path
+            expansions += 1
+            if expansions > MAX_EXPANSIONS:
+                return None
+            for nxt in neighbours[cell]:
+                if grid[nxt] or g + 1 >= cost.get(nxt, 1 << 30):
+                    continue
+                cost[nxt] = g + 1
+                came_from[nxt] = cell
+                heapq.heappush(heap, (g + 1 + self.distance(nxt, target), g + 1, nxt))
+        return None
+
+    def space(self, snake, start):
+        # Empty cells reachable from start, counted up to SAFETY_CAP; reaching
+        # the snake's own tail counts as safe, since it moves out of the way
+        cap = min(len(snake.body) + 1, SAFETY_CAP)
+        tail = snake.body[-1]
+        grid, neighbours = self.grid, self.neighbour_lists
+        seen = {start}
+        queue = [start]
+        for cell in queue:
+            for nxt in neighbours[cell]:
+                if nxt == tail and nxt != start:
+                    return cap
+                if nxt not in seen and not grid[nxt]:
+                    seen.add(nxt)
+                    queue.append(nxt)
+                    if len(seen) >= cap:
+                        return cap
+        return len(seen)
+
+    def greedy_step(self, snake, safe=False):
+        # Free neighbour closest to the target; with safe, the one with the
+        # most room first (chasing its own tail when boxed in)
+        options = [cell for cell in self.neighbour_lists[snake.head] if not self.grid[cell]]
+        if not options:
+            return self.neighbour_lists[snake.head][0]
+        # Keep out of reach of other heads when possible (counts include our own)
+        options = [cell for cell in options if self.danger[cell] <= 1] or options
+        target = snake.target if snake.target is not None else snake.head
+        if safe:
+            return max(options, key=lambda cell: (self.space(snake, cell), -self.distance(cell, target)))
+        return min(options, key=lambda cell: self.distance(cell, target))
+
+    def plan(self, snake, budget):
+        # Next cell for a bot. Follows its cached path while it stays clear
+        # and still leads to a fruit, otherwise replans with A* if the tick's
+        # budget allows. Returns the cell and the remaining budget.
+        path = snake.path
+        if path and (self.grid[path[-1]] or snake.target is None or not self.fruit[snake.target]):
+            path.clear()
+        if not path and budget > 0:
+            budget -= 1
+            snake.target = self.nearest_fruit(snake.head)
+            if snake.target is not None:
+                snake.path = path = self.astar(snake, snake.target) or []
+        if path:
+            nxt = path[-1]
+            if self.danger[nxt] > 1:
+                # Another head could move there too; step aside and replan later
+                path.clear()
+                return self.greedy_step(snake, safe=True), budget
+            # Crowded next cell: make sure it does not lead into a dead end
+            crowded = sum(1 for cell in self.neighbour_lists[nxt] if self.grid[cell]) >= 2
+            if not crowded or self.space(snake, nxt) >= min(len(snake.body) + 1, SAFETY_CAP):
+                path.pop()
+                return nxt, budget
+            path.clear()
+            return self.greedy_step(snake, safe=True), budget
+        return self.greedy_step(snake), budget
+
+    def tick(self, player_direction=None):
+        # Advances every live snake one cell. The player snake steers with
+        # player_direction, or plans like a bot when it is None (autopilot).
+        self.tick_count += 1
+        movers = [snake for snake in self.snakes if snake.alive]
+        heads = np.array([snake.head for snake in movers], dtype=np.int32)
+        self.danger = np.bincount(self.neighbours[heads].ravel(), minlength=len(self.grid))
+        nexts = np.empty(len(movers), dtype=np.int32)
+        budget = REPLAN_BUDGET
+        for i, snake in enumerate(movers):
+            if snake.player and player_direction is not None:
+                nexts[i] = self.neighbour_lists[snake.head][list(DIRECTIONS).index(player_direction)]
+                snake.path.clear()
+            else:
+                nexts[i], budget = self.plan(snake, budget)
+
+        ids = np.array([snake.id for snake in movers], dtype=np.int32)
+        tails = np.array([snake.body[-1] for snake in movers], dtype=np.int32)
+        grows = self.fruit[nexts]
+        # Tails move out first, so following a tail is allowed
+        self.grid[tails[~grows]] = 0
+        blocked = self.grid[nexts] != 0
+        head_on = np.bincount(nexts, minlength=len(self.grid))[nexts] > 1
+        dead = blocked | head_on
+        alive = ~dead
+        self.grid[nexts[alive]] = ids[alive]
+        self.fruit[nexts[alive & grows]] = False
+
+        for i, snake in enumerate(movers):
+            if dead[i]:
+                self.kill(snake)
+                continue
+            snake.body.appendleft(int(nexts[i]))
+            if grows[i]:
+                snake.score += 10
+            else:
+                snake.body.pop()
+
+        respawns = [snake for snake in self.snakes
+                    if not snake.alive and not snake.player and snake.respawn_at <= self.tick_count]
+        free = self.free_cells()
+        for snake in respawns:
+            self.place(snake, free)
+        # Cells just taken by respawned snakes are no longer free for fruit
+        self.spawn_fruit(self.free_cells() if respawns else free)
+        return int(dead.sum())
+
+    def kill(self, snake):
+        cells = np.fromiter(snake.body, dtype=np.int32, count=len(snake.body))
+        # Only cells still marked as this snake's (its tail may already be gone)
+        self.grid[cells[self.grid[cells] == snake.id]] = 0
+        snake.alive = False
+        snake.respawn_at = self.tick_count + RESPAWN_TICKS
+        snake.path, snake.target = [], None
+
+    def direction_of(self, snake):
+        # The direction the snake last moved in
+        if len(snake.body) < 2:
+            return None
+        return list(DIRECTIONS)[self.neighbour_lists[snake.body[1]].index(snake.head)]
+
+    def viewport(self, center, cols, rows):
+        # Snake ids and fruit of the cols x rows window around center (wrapping),
+        # as 2D arrays for the view to draw
+        cx, cy = self.position(center)
+        xs = (np.arange(cols) + cx - cols // 2) % self.cols
+        ys = (np.arange(rows) + cy - rows // 2) % self.rows
+        window = np.ix_(ys, xs)
+        return self.grid.reshape(self.rows, self.cols)[window], self.fruit.reshape(self.rows, self.cols)[window]
@@ -0,0 +1,151 @@
+import tkinter as tk
+import time
+import datetime
+import numpy as np
+from db_config import get_db_connection
+from snake_arena import SnakeArena, ARENA_SETTINGS
+from utils.scene import Scene
+from utils.game_loop import GameLoop
+
+# Cells drawn around the player's head; the rest of the arena is never drawn
+VIEW_COLS, VIEW_ROWS = 40, 30
+BOT_COLORS = ["#ff0066", "#ff9933", "#cc66ff", "#3399ff", "#66ff66", "#ff66cc"]
+
+
+class SnakeArenaGame:
+    # Snake against hundreds of path-finding bots on a 200x200 arena. [A]
+    # hands the player's snake to the same planner as the bots (autopilot).
+    def __init__(self, parent, difficulty, username):
+        self.parent = parent
+        self.difficulty = difficulty
+        self.username = username
+        self.window = tk.Toplevel(parent)
+        self.window.title("Snake Arena")
+        self.window.geometry("800x600")
+        self.window.minsize(400, 400)
+        self.window.configure(bg="#1a1a2e")
+
+        self.canvas = tk.Canvas(self.window, bg="#1a1a2e", highlightthickness=0)
+        self.canvas.pack(fill="both", expand=True)
+        self.scene = Scene(self.canvas, ["background", "cells", "hud"], "Snake Arena")
+
+        self.width, self.height = 800, 600
+        self.fps = {'easy': 10, 'medium': 15, 'hard': 20}[difficulty]
+        self.font_size = max(12, self.width // 50)
+        self.loop = GameLoop(self.window, self.update, self.render, self.fps)
+        self.autopilot = False
+        self.tick_ms = 0.0
+        self.new_arena()
+
+        self.window.bind("<KeyPress>", self.on_key_press)
+        self.window.bind("<Configure>", self.on_resize)
+        self.window.protocol("WM_DELETE_WINDOW", self.quit_game)
+        self.loop.start()
+
+    def new_arena(self):
+        self.arena = SnakeArena(**ARENA_SETTINGS[self.difficulty])
+        self.player = self.arena.add_snake(player=True)
+        self.direction = self.next_direction = self.arena.direction_of(self.player) or 'left'
+        self.state = "playing"
+
+    def save_score(self):
+        if not self.username:
+            return
+        try:
+            conn = get_db_connection()
+            cursor = conn.cursor()
+            cursor.execute("SELECT id FROM users WHERE username = %s", (self.username,))
+            user_id = cursor.fetchone()
+            if user_id:
+                cursor.execute(
+                    "INSERT INTO game_scores (user_id, game_name, difficulty_level, score, played_at) "
+                    "VALUES (%s, %s, %s, %s, %s)",
+                    (user_id[0], "Snake Arena", self.difficulty, self.player.score, datetime.datetime.now())
+                )
+                conn.commit()
+            cursor.close()
+            conn.close()
+        except Exception as e:
+            print(f"Failed to save score: {e}")
+
+    def quit_game(self):
+        self.loop.stop()
+        self.save_score()
+        self.window.destroy()
+
+    def on_resize(self, event):
+        self.width = self.canvas.winfo_width()
+        self.height = self.canvas.winfo_height()
+        self.font_size = max(12, self.width // 50)
+        self.draw_game()
+
+    def on_key_press(self, event):
+        if event.keysym == "Escape":
+            self.quit_game()
+        elif self.state == "gameover":
+            if event.keysym == "r":
+                self.new_arena()
+        elif event.keysym in ("a", "A"):
+            self.autopilot = not self.autopilot
+            if not self.autopilot:
+                # Carry on in whatever direction the autopilot was going
+                self.direction = self.next_direction = self.arena.direction_of(self.player) or self.direction
+        elif event.keysym == "Up" and self.direction != 'down':
+            self.next_direction = 'up'
+        elif event.keysym == "Down" and self.direction != 'up':
+            self.next_direction = 'down'
+        elif event.keysym == "Left" and self.direction != 'right':
+            self.next_direction = 'left'
+        elif event.keysym == "Right" and self.direction != 'left':
+            self.next_direction = 'right'
+
+    def draw_game(self):
+        # One sprite per viewport cell, recoloured as the view scrolls
+        scene = self.scene
+        scene.draw("backdrop", "background", "rectangle", (0, 0, self.width, self.height), fill="#1a1a2e")
+        cell = max(1, min(self.width // VIEW_COLS, self.height // VIEW_ROWS))
+        # Centre the viewport on the player, or where it died (a player never placed has no body)
+        center = self.player.head if self.player.body else 0
+        ids, fruit = self.arena.viewport(center, VIEW_COLS, VIEW_ROWS)
+        for y, x in np.argwhere(fruit).tolist():
+            scene.draw(f"fruit{x}_{y}", "cells", "oval",
+                       (x * cell + 2, y * cell + 2, (x + 1) * cell - 2, (y + 1) * cell - 2), fill="#ffcc00", outline="")
+        for y, x in np.argwhere(ids).tolist():
+            snake_id = ids[y, x]
+            color = "#00ffcc" if snake_id == self.player.id else BOT_COLORS[snake_id % len(BOT_COLORS)]
+            scene.draw(f"cell{x}_{y}", "cells", "rectangle", (x * cell, y * cell, (x + 1) * cell, (y + 1) * cell),
+                       fill=color, outline="#1a1a2e")
+        alive = sum(1 for snake in self.arena.snakes if snake.alive and not snake.player)
+        scene.draw(
+            "score", "hud", "text", (10, 10), anchor="nw", fill="#ffcc00", font=("Arial Black", self.font_size, "bold"),
+            text=f"Score: {self.player.score}  Length: {len(self.player.body)}  Bots: {alive}"
+                 f"{'  [AUTOPILOT]' if self.autopilot else ''}"
+        )
+        scene.draw(
+            "tick", "hud", "text", (self.width - 10, 10), anchor="ne", fill="#2e2e4e",
+            font=("Arial", max(8, self.font_size // 2)), text=f"tick {self.tick_ms:.1f} ms"
+        )
+        if self.state == "gameover":
+            scene.draw(
+                "gameover", "hud", "text", (self.width // 2, self.height // 2 - 30), text="Game Over!",
+                fill="#ff0066", font=("Impact", self.font_size + 12, "bold"), anchor="center"
+            )
+            scene.draw(
+                "retry", "hud", "text", (self.width // 2, self.height // 2 + 20),
+                text="Press [R] to Retry or [ESC] to Quit", fill="#ffcc00",
+                font=("Arial Black", self.font_size, "bold"), anchor="center"
+            )
+        scene.commit()
+
+    def render(self, alpha):
+        self.draw_game()
+
+    def update(self):
+        if self.state == "playing":
+            start = time.perf_counter()
+            self.direction = self.next_direction
+            self.arena.tick(None if self.autopilot else self.direction)
+            self.tick_ms = (time.perf_counter() - start) * 1000
+            if not self.player.alive:
+                self.state = "gameover"
+                self.save_score()
@@ -0,0 +1,82 @@
+import collections
+import random
+
+
+class FreeCells:
+    # Cells not covered by the snake, in an array with an index map, so
+    # removing a cell (swap with the last one) and picking a random one are O(1)
+    def __init__(self, cells=()):
+        self.cells = list(cells)
+        self.index = {cell: i for i, cell in enumerate(self.cells)}
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __contains__(self, cell):
+        return cell in self.index
+
+    def add(self, cell):
+        if cell not in self.index:
+            self.index[cell] = len(self.cells)
+            self.cells.append(cell)
+
+    def remove(self, cell):
+        i = self.index.pop(cell, None)
+        if i is None:
+            return
+        last = self.cells.pop()
+        if i < len(self.cells):
+            self.cells[i] = last
+            self.index[last] = i
+
+    def choice(self, rng=random):
+        if not self.cells:
+            return None
+        return self.cells[rng.randrange(len(self.cells))]
+
+
+class SnakeBody:
+    # Segments head-first in a deque, with a set of the cells they cover and
+    # the free cells of the grid kept in step, so each move is O(1)
+    def __init__(self, cols, rows, start):
+        self.segments = collections.deque([start])
+        self.occupied = {start}
+        self.resize(cols, rows)
+
+    def resize(self, cols, rows):
+        # The only O(grid) step; called when the window changes the grid size
+        self.cols, self.rows = cols, rows
+        self.free = FreeCells((x, y) for y in range(rows) for x in range(cols) if (x, y) not in self.occupied)
+
+    def __len__(self):
+        return len(self.segments)
+
+    def __iter__(self):
+        return iter(self.segments)
+
+    def __contains__(self, cell):
+        return cell in self.occupied
+
+    @property
+    def head(self):
+        return self.segments[0]
+
+    def move(self, head, grow=False):
+        # Moves onto head, keeping the tail when growing. The tail leaves
+        # first, so following it is allowed. Returns False on self-collision,
+        # leaving the body unchanged apart from the tail.
+        if not grow:
+            tail = self.segments.pop()
+            self.occupied.discard(tail)
+            if 0 <= tail[0] < self.cols and 0 <= tail[1] < self.rows:
+                self.free.add(tail)
+        if head in self.occupied:
+            return False
+        self.segments.appendleft(head)
+        self.occupied.add(head)
+        self.free.remove(head)
+        return True
+
+    def spawn_fruit(self, rng=random):
+        # A random free cell, or None once the snake fills the grid
+        return self.free.choice(rng)
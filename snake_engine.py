@@ -0,0 +1,66 @@
+import random
+from snake_body import SnakeBody
+
+# Grid step of each direction, and the direction a snake cannot turn back into
+DIRECTIONS = {'up': (0, -1), 'down': (0, 1), 'left': (-1, 0), 'right': (1, 0)}
+OPPOSITE = {'up': 'down', 'down': 'up', 'left': 'right', 'right': 'left'}
+FRUIT_POINTS = 10
+START = (10, 10)
+
+
+class SnakeEngine:
+    # The rules of Snake with no Tk: state plus step(), on a grid that wraps
+    # at the edges. All randomness comes from one seeded Random, so a seed and
+    # the turns made replay a game exactly. step() returns the events of the
+    # tick ('eat', 'crash', 'win') for the view to play sounds on.
+    def __init__(self, cols=40, rows=30, seed=None):
+        self.rng = random.Random(seed)
+        self.cols, self.rows = cols, rows
+        self.reset()
+
+    def reset(self):
+        self.snake = SnakeBody(self.cols, self.rows, START)
+        self.fruit = self.snake.spawn_fruit(self.rng)
+        self.direction = 'right'
+        self.next_direction = 'right'
+        self.score = 0
+        self.won = False
+        self.over = False
+        self.ticks = 0
+
+    def resize(self, cols, rows):
+        if (cols, rows) == (self.cols, self.rows):
+            return
+        self.cols, self.rows = cols, rows
+        self.snake.resize(cols, rows)
+        if self.fruit is not None and (self.fruit[0] >= cols or self.fruit[1] >= rows):
+            self.fruit = self.snake.spawn_fruit(self.rng)
+
+    def turn(self, direction):
+        # Takes effect on the next step; turning straight back is ignored
+        if direction != OPPOSITE[self.direction]:
+            self.next_direction = direction
+
+    def step(self):
+        if self.over:
+            return []
+        self.ticks += 1
+        self.direction = self.next_direction
+        dx, dy = DIRECTIONS[self.direction]
+        x, y = self.snake.head
+        head = ((x + dx) % self.cols, (y + dy) % self.rows)
+        ate = head == self.fruit
+
+        if not self.snake.move(head, grow=ate):
+            self.over = True
+            return ['crash']
+        if not ate:
+            return []
+        self.score += FRUIT_POINTS
+        self.fruit = self.snake.spawn_fruit(self.rng)
+        if self.fruit is None:
+            # The snake covers the whole board
+            self.won = True
+            self.over = True
+            return ['eat', 'win']
+        return ['eat']
@@ -4,40 +4,40 @@ from tkinter import messagebox
 import random
 from db_config import get_db_connection
 import datetime
+from tic_tac_toe_engine import KInARowEngine, SEARCH_LIMITS, best_move
+from utils.scene import Scene
+
+# Board variants offered by the portal: (board size, stones in a row to win)
+VARIANTS = {
+    "Tic Tac Toe": (3, 3),
+    "Tic Tac Toe 7x7": (7, 5),
+    "Gomoku 15x15": (15, 5)
+}
+PLAYERS = "XO"
 
 class TicTacToeGame:
-    def __init__(self, parent, difficulty, username):
+    def __init__(self, parent, difficulty, username, size=3, win_length=3):
         self.parent = parent
         self.difficulty = difficulty
         self.username = username
+        self.size = size
         self.window = tk.Toplevel(parent)
-        self.window.title("Tic Tac Toe")
-        self.window.geometry("400x400")
+        self.window.title("Tic Tac Toe" if size == 3 else f"Tic Tac Toe {size}x{size} ({win_length} in a row)")
+        self.window.geometry(f"{max(400, size * 45)}x{max(400, size * 45)}")
         self.window.minsize(300, 300)
         self.window.configure(bg="#D3D3D3")
         
-        self.board = [""] * 9
+        self.board = [""] * (size * size)
+        # The same board as bitmasks, for the AI and for win checks through the last move
+        self.engine = KInARowEngine(size, win_length)
+        self.winner = None
         self.current_player = "X"
-        self.buttons = []
-        self.window.grid_columnconfigure(tuple(range(3)), weight=1)
-        self.window.grid_rowconfigure(tuple(range(3)), weight=1)
-        self.window.grid_rowconfigure(3, weight=1)
+        self.hovered = None
         
         self.font_size = 16
-        for i in range(3):
-            row = []
-            for j in range(3):
-                button = tk.Button(
-                    self.window,
-                    text="",
-                    font=("Arial", self.font_size),
-                    bg="#eeeed2",
-                    activebackground="#00FFFF",
-                    command=lambda x=i, y=j: self.button_click(x, y)
-                )
-                button.grid(row=i, column=j, sticky="nsew", padx=5, pady=5)
-                row.append(button)
-            self.buttons.append(row)
+        # Smaller gaps keep large boards inside the window
+        self.pad = 5 if size <= 5 else 1
+        self.cell_size = 0
         
         self.status_label = tk.Label(
             self.window,
@@ -46,7 +46,15 @@ class TicTacToeGame:
             fg="#800000",
             font=("Arial", 12)
         )
-        self.status_label.grid(row=3, column=0, columnspan=3, pady=10)
+        self.status_label.pack(side="bottom", pady=10)
+        
+        # The board is one canvas whose cells and marks are created once and then updated
+        self.canvas = tk.Canvas(self.window, bg="#D3D3D3", highlightthickness=0)
+        self.canvas.pack(fill="both", expand=True)
+        self.scene = Scene(self.canvas, ["cells", "marks"], "Tic Tac Toe")
+        self.canvas.bind("<Button-1>", self.on_click)
+        self.canvas.bind("<Motion>", self.on_mouse_move)
+        self.canvas.bind("<Leave>", self.on_mouse_leave)
         
         self.window.bind("<Configure>", self.on_resize)
         if self.difficulty == 'easy' and random.choice([True, False]):
@@ -74,22 +82,60 @@ class TicTacToeGame:
             print(f"Failed to save score: {e}")
 
     def on_resize(self, event):
-        self.font_size = max(12, min(20, self.window.winfo_width() // 20))
-        for row in self.buttons:
-            for button in row:
-                button.config(font=("Arial", self.font_size))
+        self.font_size = max(8 if self.size > 3 else 12, min(20, self.window.winfo_width() // (self.size * 7)))
         self.status_label.config(font=("Arial", self.font_size // 2))
+        self.draw_board()
+
+    def draw_board(self):
+        self.cell_size = max(1, min(self.canvas.winfo_width(), self.canvas.winfo_height()) // self.size)
+        size, pad = self.cell_size, self.pad
+        for square, mark in enumerate(self.board):
+            row, col = divmod(square, self.size)
+            x, y = col * size, row * size
+            fill = "#00FFFF" if square == self.hovered else "#eeeed2"
+            self.scene.draw(f"cell{square}", "cells", "rectangle", (x + pad, y + pad, x + size - pad, y + size - pad),
+                            fill=fill, outline="#A9A9A9")
+            if mark:
+                self.scene.draw(f"mark{square}", "marks", "text", (x + size // 2, y + size // 2), text=mark,
+                                font=("Arial", self.font_size), fill="#800000" if mark == "X" else "#CD5C5C")
+        self.scene.commit()
+
+    def square_at(self, event):
+        row, col = event.y // max(1, self.cell_size), event.x // max(1, self.cell_size)
+        if row < self.size and col < self.size:
+            return row * self.size + col
+        return None
+
+    def on_mouse_move(self, event):
+        square = self.square_at(event)
+        if square != self.hovered:
+            self.hovered = square
+            self.draw_board()
+
+    def on_mouse_leave(self, event):
+        self.hovered = None
+        self.draw_board()
 
-    def button_click(self, row, col):
-        if self.board[row * 3 + col] == "":
-            self.board[row * 3 + col] = self.current_player
-            self.buttons[row][col].config(text=self.current_player, fg="#800000" if self.current_player == "X" else "#CD5C5C")
+    def on_click(self, event):
+        square = self.square_at(event)
+        if square is not None:
+            self.cell_click(*divmod(square, self.size))
+
+    def place(self, square, player):
+        self.board[square] = player
+        if self.engine.play(square, PLAYERS.index(player)):
+            self.winner = player
+        self.draw_board()
+
+    def cell_click(self, row, col):
+        if self.board[row * self.size + col] == "":
+            self.place(row * self.size + col, self.current_player)
             if self.check_winner(self.current_player):
                 self.save_score()
                 messagebox.showinfo("Game Over", f"Player {self.current_player} wins!")
                 self.window.destroy()
                 return
-            if "" not in self.board:
+            if self.engine.full():
                 self.save_score()
                 messagebox.showinfo("Game Over", "It's a tie!")
                 self.window.destroy()
@@ -105,19 +151,19 @@ class TicTacToeGame:
             return
         if self.difficulty == "easy":
             move = random.choice(moves)
-        elif self.difficulty == "medium":
-            move = self.best_move(3) or random.choice(moves)
+        elif self.size == 3 and self.engine.win_length == 3:
+            # Classic board: perfect play straight from the precomputed table
+            x_mask, o_mask = self.engine.bits
+            move = best_move(x_mask, o_mask, 3 if self.difficulty == "medium" else 9)
         else:
-            move = self.best_move(9) or random.choice(moves)
-        self.board[move] = "O"
-        row, col = divmod(move, 3)
-        self.buttons[row][col].config(text="O", fg="#CD5C5C")
+            move = self.engine.best_move(PLAYERS.index("O"), **SEARCH_LIMITS[self.difficulty])
+        self.place(move, "O")
         if self.check_winner("O"):
             self.save_score()
             messagebox.showinfo("Game Over", "AI (O) wins!")
             self.window.destroy()
             return
-        if "" not in self.board:
+        if self.engine.full():
             self.save_score()
             messagebox.showinfo("Game Over", "It's a tie!")
             self.window.destroy()
@@ -126,41 +172,4 @@ class TicTacToeGame:
         self.status_label.config(text="Your turn (X)")
 
     def check_winner(self, player):
-        win_conditions = [(0, 1, 2), (3, 4, 5), (6, 7, 8), (0, 3, 6), (1, 4, 7), (2, 5, 8), (0, 4, 8), (2, 4, 6)]
-        return any(self.board[a] == self.board[b] == self.board[c] == player for a, b, c in win_conditions)
-
-    def best_move(self, depth):
-        best_score = float('-inf')
-        best_move = None
-        for move in [i for i, x in enumerate(self.board) if x == ""]:
-            self.board[move] = "O"
-            score = self.minimax(depth - 1, False)
-            self.board[move] = ""
-            if score > best_score:
-                best_score = score
-                best_move = move
-        return best_move
-
-    def minimax(self, depth, is_maximizing):
-        if self.check_winner("O"):
-            return 1
-        if self.check_winner("X"):
-            return -1
-        if "" not in self.board or depth == 0:
-            return 0
-        if is_maximizing:
-            best_score = float('-inf')
-            for move in [i for i, x in enumerate(self.board) if x == ""]:
-                self.board[move] = "O"
-                score = self.minimax(depth - 1, False)
-                self.board[move] = ""
-                best_score = max(best_score, score)
-            return best_score
-        else:
-            best_score = float('inf')
-            for move in [i for i, x in enumerate(self.board) if x == ""]:
-                self.board[move] = "X"
-                score = self.minimax(depth - 1, True)
-                self.board[move] = ""
-                best_score = min(best_score, score)
-            return best_score
+        return self.winner == player
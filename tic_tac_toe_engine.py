@@ -0,0 +1,395 @@
+import functools
+import random
+import time
+
+# Boards are two 9-bit masks, one per player; bit i is square i (row * 3 + col)
+FULL = 0x1FF
+WIN_LINES = [(0, 1, 2), (3, 4, 5), (6, 7, 8), (0, 3, 6), (1, 4, 7), (2, 5, 8), (0, 4, 8), (2, 4, 6)]
+WIN_MASKS = [(1 << a) | (1 << b) | (1 << c) for a, b, c in WIN_LINES]
+# WINNING[mask] is True when mask contains a full line
+WINNING = [any(mask & line == line for line in WIN_MASKS) for mask in range(FULL + 1)]
+POPCOUNT = [bin(mask).count("1") for mask in range(FULL + 1)]
+
+# The 8 symmetries of the square (rotations and reflections), each as the
+# source square for every target square
+SYMMETRIES = [
+    [0, 1, 2, 3, 4, 5, 6, 7, 8],
+    [6, 3, 0, 7, 4, 1, 8, 5, 2],
+    [8, 7, 6, 5, 4, 3, 2, 1, 0],
+    [2, 5, 8, 1, 4, 7, 0, 3, 6],
+    [2, 1, 0, 5, 4, 3, 8, 7, 6],
+    [6, 7, 8, 3, 4, 5, 0, 1, 2],
+    [0, 3, 6, 1, 4, 7, 2, 5, 8],
+    [8, 5, 2, 7, 4, 1, 6, 3, 0]
+]
+
+
+def _permute(mask, symmetry):
+    result = 0
+    for target, source in enumerate(symmetry):
+        if mask >> source & 1:
+            result |= 1 << target
+    return result
+
+
+# PERMUTED[s][mask] is mask under symmetry s, so canonicalising is 16 lookups
+PERMUTED = [[_permute(mask, symmetry) for mask in range(FULL + 1)] for symmetry in SYMMETRIES]
+
+
+def canonical(x_mask, o_mask):
+    # The smallest encoding among the 8 symmetric versions of the board
+    return min(table[o_mask] << 9 | table[x_mask] for table in PERMUTED)
+
+
+def empty_squares(x_mask, o_mask):
+    free = FULL & ~(x_mask | o_mask)
+    return [square for square in range(9) if free >> square & 1]
+
+
+@functools.lru_cache(maxsize=None)
+def _value(key, o_to_move, depth):
+    # Minimax value for O (1 win, 0 draw or depth reached, -1 loss) of one
+    # canonical board; symmetric boards share the entry
+    o_mask, x_mask = key >> 9, key & FULL
+    if WINNING[o_mask]:
+        return 1
+    if WINNING[x_mask]:
+        return -1
+    if x_mask | o_mask == FULL or depth == 0:
+        return 0
+    values = []
+    for square in empty_squares(x_mask, o_mask):
+        bit = 1 << square
+        if o_to_move:
+            values.append(value(x_mask, o_mask | bit, False, depth - 1))
+        else:
+            values.append(value(x_mask | bit, o_mask, True, depth - 1))
+    return max(values) if o_to_move else min(values)
+
+
+def value(x_mask, o_mask, o_to_move, depth=9):
+    # Searching deeper than the empty squares changes nothing, so every
+    # depth past that shares the full-depth entry
+    depth = min(depth, 9 - POPCOUNT[x_mask | o_mask])
+    return _value(canonical(x_mask, o_mask), o_to_move, depth)
+
+
+def best_move(x_mask, o_mask, depth=9):
+    # O's move with the highest value, first square wins ties; None when the
+    # board is full
+    best_score = None
+    best = None
+    for square in empty_squares(x_mask, o_mask):
+        score = value(x_mask, o_mask | 1 << square, False, depth - 1)
+        if best_score is None or score > best_score:
+            best_score = score
+            best = square
+    return best
+
+
+def build_table(depths=(9,)):
+    # Fills the memo for every reachable position up front (765 distinct
+    # boards after symmetry), so the first move of a game costs no search
+    for depth in depths:
+        value(0, 0, False, depth)
+        for square in range(9):
+            value(1 << square, 0, True, depth - 1)
+    return _value.cache_info().currsize
+
+
+# Larger boards (e.g. 7x7 connect-5, 15x15 gomoku) are searched instead of
+# tabled: alpha-beta with a transposition table and a time budget
+WIN_SCORE = 1000000
+# Inner nodes only search this many of their best-ordered moves
+BEAM_WIDTH = 8
+ROOT_BEAM_WIDTH = 16
+TT_MAX_ENTRIES = 200000
+# Least a deeper iteration is assumed to cost over the one before it
+ITERATION_GROWTH = 2
+# Seconds kept back from the time limit for unwinding a cut-off search
+# and the last node it was in, so the move comes back within the limit
+SEARCH_RESERVE = 0.01
+SEARCH_LIMITS = {
+    'medium': {'time_limit': 0.1, 'max_depth': 2},
+    'hard': {'time_limit': 0.2, 'max_depth': 10}
+}
+EXACT, LOWER, UPPER = 0, 1, 2
+
+
+class SearchTimeout(Exception):
+    pass
+
+
+class KInARowEngine:
+    # Board of size x size squares (square = row * size + col) as one int
+    # bitmask per player, 0 for X and 1 for O. Every run of win_length squares
+    # is a window; a square's windows are all the lines through it, so win
+    # checks and the evaluation only touch the windows of the last move.
+    def __init__(self, size, win_length):
+        self.size = size
+        self.win_length = win_length
+        self.squares = size * size
+        self.windows = [[] for _ in range(self.squares)]
+        for row in range(size):
+            for col in range(size):
+                for d_row, d_col in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                    end_row = row + d_row * (win_length - 1)
+                    end_col = col + d_col * (win_length - 1)
+                    if not (0 <= end_row < size and 0 <= end_col < size):
+                        continue
+                    cells = [(row + d_row * i) * size + col + d_col * i for i in range(win_length)]
+                    mask = sum(1 << cell for cell in cells)
+                    for cell in cells:
+                        self.windows[cell].append(mask)
+        # Squares within one step of each square, for candidate moves
+        self.neighbours = []
+        for square in range(self.squares):
+            row, col = divmod(square, size)
+            mask = 0
+            for d_row in (-1, 0, 1):
+                for d_col in (-1, 0, 1):
+                    if 0 <= row + d_row < size and 0 <= col + d_col < size:
+                        mask |= 1 << ((row + d_row) * size + col + d_col)
+            self.neighbours.append(mask)
+        # Worth of a window holding n stones of one player and none of the other
+        self.weights = [0] + [8 ** n for n in range(win_length - 1)] + [WIN_SCORE]
+        rng = random.Random(0)
+        self.zobrist = [[rng.getrandbits(64) for _ in range(self.squares)] for _ in range(2)]
+        self.tt = {}
+        self.reset()
+
+    def reset(self):
+        self.bits = [0, 0]
+        self.occupied = 0
+        self.candidates = 0
+        self.key = 0
+        # Evaluation from X's point of view, kept up to date by play/undo
+        self.score = 0
+        self.history = []
+
+    def play(self, square, player):
+        # Places a stone and returns True when it completes a line
+        mine, theirs = self.bits[player], self.bits[1 - player]
+        delta = 0
+        won = False
+        for window in self.windows[square]:
+            own = (mine & window).bit_count()
+            other = (theirs & window).bit_count()
+            if other == 0:
+                delta += self.weights[own + 1] - self.weights[own]
+                if own + 1 == self.win_length:
+                    won = True
+            elif own == 0:
+                delta += self.weights[other]
+        if player == 1:
+            delta = -delta
+        bit = 1 << square
+        self.history.append((square, player, delta, self.candidates))
+        self.bits[player] = mine | bit
+        self.occupied |= bit
+        self.candidates = (self.candidates | self.neighbours[square]) & ~self.occupied
+        self.key ^= self.zobrist[player][square]
+        self.score += delta
+        return won
+
+    def undo(self):
+        square, player, delta, candidates = self.history.pop()
+        bit = 1 << square
+        self.bits[player] &= ~bit
+        self.occupied &= ~bit
+        self.candidates = candidates
+        self.key ^= self.zobrist[player][square]
+        self.score -= delta
+
+    def full(self):
+        return self.occupied.bit_count() == self.squares
+
+    def move_threat(self, square, player):
+        # Attack (what the stone builds) plus defence (what it blocks)
+        mine, theirs = self.bits[player], self.bits[1 - player]
+        weights = self.weights
+        threat = 0
+        for window in self.windows[square]:
+            own = (mine & window).bit_count()
+            other = (theirs & window).bit_count()
+            if other == 0:
+                threat += weights[own + 1] - weights[own]
+            elif own == 0:
+                threat += weights[other + 1] - weights[other]
+        return threat
+
+    def ordered_moves(self, player, first=None, width=None):
+        moves = []
+        candidates = self.candidates
+        while candidates:
+            low = candidates & -candidates
+            square = low.bit_length() - 1
+            candidates ^= low
+            moves.append((self.move_threat(square, player), square))
+        moves.sort(reverse=True)
+        moves = [square for _, square in moves[:width]]
+        if first is not None and first in moves:
+            moves.remove(first)
+            moves.insert(0, first)
+        return moves
+
+    def best_move(self, player, time_limit=0.2, max_depth=10):
+        # Iterative deepening until the time budget runs out; returns the best
+        # move of the deepest finished iteration
+        if not self.occupied:
+            return self.squares // 2
+        start = time.perf_counter()
+        time_limit = max(time_limit - SEARCH_RESERVE, time_limit / 2)
+        self.deadline = start + time_limit
+        self.nodes = 0
+        if len(self.tt) > TT_MAX_ENTRIES:
+            self.tt.clear()
+        moves = self.ordered_moves(player, width=ROOT_BEAM_WIDTH)
+        best = moves[0]
+        previous = last = None
+        for depth in range(1, max_depth + 1):
+            # Don't start an iteration that can't finish: the next one is
+            # guessed to grow by the same factor as the last one did
+            elapsed = time.perf_counter() - start
+            if last is not None:
+                growth = max(ITERATION_GROWTH, last / previous) if previous else ITERATION_GROWTH
+                if elapsed + last * growth > time_limit:
+                    break
+            try:
+                score, move = self.search_root(moves, player, depth)
+            except SearchTimeout:
+                break
+            previous, last = last, time.perf_counter() - start - elapsed
+            best = move
+            moves.remove(move)
+            moves.insert(0, move)
+            if abs(score) >= WIN_SCORE // 2:
+                break
+        return best
+
+    def search_root(self, moves, player, depth):
+        alpha, beta = -WIN_SCORE * 2, WIN_SCORE * 2
+        best_move = moves[0]
+        for square in moves:
+            won = self.play(square, player)
+            try:
+                if won:
+                    score = WIN_SCORE
+                else:
+                    score = -self.negamax(1 - player, depth - 1, -beta, -alpha, 1)
+            finally:
+                self.undo()
+            if score > alpha:
+                alpha, best_move = score, square
+        return alpha, best_move
+
+    def negamax(self, player, depth, alpha, beta, ply):
+        self.nodes += 1
+        # Every node orders its moves, so a clock read is cheap next to it and
+        # keeps the overrun past the deadline to one node
+        if time.perf_counter() >= self.deadline:
+            raise SearchTimeout()
+        if self.full():
+            return 0
+        if depth == 0:
+            return self.score if player == 0 else -self.score
+
+        entry = self.tt.get(self.key)
+        tt_move = None
+        if entry is not None:
+            entry_depth, flag, score, tt_move = entry
+            if entry_depth >= depth:
+                if flag == EXACT:
+                    return score
+                if flag == LOWER and score >= beta:
+                    return score
+                if flag == UPPER and score <= alpha:
+                    return score
+
+        original_alpha = alpha
+        best_score, best_move = -WIN_SCORE * 2, None
+        for square in self.ordered_moves(player, tt_move, BEAM_WIDTH):
+            won = self.play(square, player)
+            try:
+                if won:
+                    score = WIN_SCORE - ply
+                else:
+                    score = -self.negamax(1 - player, depth - 1, -beta, -alpha, ply + 1)
+            finally:
+                self.undo()
+            if score > best_score:
+                best_score, best_move = score, square
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                break
+
+        if best_score <= original_alpha:
+            flag = UPPER
+        elif best_score >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        # Win scores depend on ply, so only bounds of ordinary scores are kept
+        if abs(best_score) < WIN_SCORE // 2:
+            self.tt[self.key] = (depth, flag, best_score, best_move)
+        return best_score
+
+
+def reference_best_move(board, depth):
+    # The original list-of-strings minimax, kept to check the table against
+    def winner(player):
+        return any(board[a] == board[b] == board[c] == player for a, b, c in WIN_LINES)
+
+    def minimax(depth, is_maximizing):
+        if winner("O"):
+            return 1
+        if winner("X"):
+            return -1
+        if "" not in board or depth == 0:
+            return 0
+        scores = []
+        for move in [i for i, x in enumerate(board) if x == ""]:
+            board[move] = "O" if is_maximizing else "X"
+            scores.append(minimax(depth - 1, not is_maximizing))
+            board[move] = ""
+        return max(scores) if is_maximizing else min(scores)
+
+    best_score = float('-inf')
+    best = None
+    for move in [i for i, x in enumerate(board) if x == ""]:
+        board[move] = "O"
+        score = minimax(depth - 1, False)
+        board[move] = ""
+        if score > best_score:
+            best_score = score
+            best = move
+    return best
+
+
+def check_against_reference(depths=(3, 9)):
+    # Compares best_move with the reference minimax on every position where
+    # O is to move (X started) and nobody has won yet
+    checked = 0
+    for code in range(3 ** 9):
+        board, x_mask, o_mask = [], 0, 0
+        for square in range(9):
+            code, cell = divmod(code, 3)
+            board.append(["", "X", "O"][cell])
+            if cell == 1:
+                x_mask |= 1 << square
+            elif cell == 2:
+                o_mask |= 1 << square
+        if POPCOUNT[x_mask] != POPCOUNT[o_mask] + 1 or WINNING[x_mask] or WINNING[o_mask]:
+            continue
+        for depth in depths:
+            expected = reference_best_move(board, depth)
+            actual = best_move(x_mask, o_mask, depth)
+            assert actual == expected, f"{board} depth {depth}: {actual} != {expected}"
+            checked += 1
+    return checked
+
+
+if __name__ == "__main__":
+    print(f"{build_table((3, 9))} table entries")
+    print(f"best_move matches the reference minimax on {check_against_reference()} positions")
@@ -0,0 +1,135 @@
+import argparse
+import itertools
+import time
+import numpy as np
+from tic_tac_toe_engine import WIN_LINES, WINNING, POPCOUNT, best_move
+
+# Cell values in the batch arrays
+EMPTY, X, O = 0, 1, 2
+# win_counts = (boards == player) @ WIN_MATRIX; a 3 in any column is a win
+WIN_MATRIX = np.zeros((9, len(WIN_LINES)), dtype=np.int8)
+for _line, _cells in enumerate(WIN_LINES):
+    WIN_MATRIX[list(_cells), _line] = 1
+# Base-3 digits of a board, so a whole batch is encoded with one matrix product
+POWERS = 3 ** np.arange(9, dtype=np.int32)
+# Minimax depth for each difficulty; easy plays at random, as in TicTacToeGame
+DEPTHS = {'easy': None, 'medium': 3, 'hard': 9}
+BATCH_SIZE = 100000
+
+
+def build_move_table(depth):
+    # The table AI's move for every board code, for whichever side is to move
+    # (X moves first). -1 marks boards that are finished or cannot occur.
+    table = np.full(3 ** 9, -1, dtype=np.int8)
+    for code in range(3 ** 9):
+        x_mask = o_mask = 0
+        digits = code
+        for square in range(9):
+            digits, cell = divmod(digits, 3)
+            if cell == X:
+                x_mask |= 1 << square
+            elif cell == O:
+                o_mask |= 1 << square
+        x_count, o_count = POPCOUNT[x_mask], POPCOUNT[o_mask]
+        if WINNING[x_mask] or WINNING[o_mask] or x_count + o_count == 9:
+            continue
+        if x_count == o_count + 1:
+            move = best_move(x_mask, o_mask, depth)
+        elif x_count == o_count:
+            # best_move plays O; swapping the masks plays X with the same rules
+            move = best_move(o_mask, x_mask, depth)
+        else:
+            continue
+        table[code] = move
+    return table
+
+
+class BatchSimulator:
+    # Plays many games at once: every array has one row per game and each ply
+    # is a handful of whole-batch NumPy operations
+    def __init__(self, seed=None):
+        self.rng = np.random.default_rng(seed)
+        self.tables = {}
+
+    def move_table(self, depth):
+        if depth not in self.tables:
+            self.tables[depth] = build_move_table(depth)
+        return self.tables[depth]
+
+    def choose(self, boards, difficulty):
+        depth = DEPTHS[difficulty]
+        if depth is None:
+            # Uniform over empty squares: random keys, occupied squares never win the argmax
+            keys = self.rng.random(boards.shape)
+            keys[boards != EMPTY] = -1.0
+            return keys.argmax(axis=1)
+        return self.move_table(depth)[boards.astype(np.int32) @ POWERS]
+
+    def play(self, x_difficulty, o_difficulty, games):
+        # Returns (X wins, draws, O wins)
+        boards = np.zeros((games, 9), dtype=np.int8)
+        # 0 still playing or drawn, X or O for the winner
+        winners = np.zeros(games, dtype=np.int8)
+        active = np.arange(games)
+        for ply in range(9):
+            player, difficulty = (X, x_difficulty) if ply % 2 == 0 else (O, o_difficulty)
+            moves = self.choose(boards[active], difficulty)
+            boards[active, moves] = player
+            lines = (boards[active] == player).astype(np.int8) @ WIN_MATRIX
+            won = (lines == 3).any(axis=1)
+            winners[active[won]] = player
+            active = active[~won]
+            if not len(active):
+                break
+        x_wins = int((winners == X).sum())
+        o_wins = int((winners == O).sum())
+        return x_wins, games - x_wins - o_wins, o_wins
+
+    def run(self, games, batch_size=BATCH_SIZE, difficulties=tuple(DEPTHS)):
+        # Win/draw/loss counts for every (X difficulty, O difficulty) pairing
+        for depth in DEPTHS.values():
+            if depth is not None:
+                self.move_table(depth)
+        results = {}
+        for pairing in itertools.product(difficulties, repeat=2):
+            totals = np.zeros(3, dtype=np.int64)
+            remaining = games
+            while remaining:
+                batch = min(batch_size, remaining)
+                totals += self.play(*pairing, batch)
+                remaining -= batch
+            results[pairing] = tuple(int(count) for count in totals)
+        return results
+
+
+def print_matrix(results, games):
+    difficulties = list(dict.fromkeys(x for x, _ in results))
+    print("X \\ O".ljust(10) + "".join(f"{name:>24}" for name in difficulties))
+    for x_name in difficulties:
+        cells = []
+        for o_name in difficulties:
+            x_wins, draws, o_wins = results[(x_name, o_name)]
+            cells.append(f"{100 * x_wins / games:6.1f}/{100 * draws / games:5.1f}/{100 * o_wins / games:5.1f}%")
+        print(x_name.ljust(10) + "".join(f"{cell:>24}" for cell in cells))
+    print("(X win / draw / O win)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Headless Tic Tac Toe AI-vs-AI batches")
+    parser.add_argument("--games", type=int, default=1000000, help="games per pairing")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    simulator = BatchSimulator(args.seed)
+    start = time.perf_counter()
+    for depth in DEPTHS.values():
+        if depth is not None:
+            simulator.move_table(depth)
+    print(f"Move tables built in {time.perf_counter() - start:.2f}s")
+    start = time.perf_counter()
+    results = simulator.run(args.games, args.batch_size)
+    elapsed = time.perf_counter() - start
+    print_matrix(results, args.games)
+    total = args.games * len(results)
+    print(f"{total} games in {elapsed:.1f}s ({total / elapsed * 60:,.0f} games/min)")
@@ -0,0 +1,134 @@
+import collections
+import concurrent.futures
+import os
+import threading
+from PIL import Image, ImageDraw, ImageTk
+
+ASSET_DIR = "assets"
+# Files the games draw, decoded in the background when the portal starts
+PRELOAD = [
+    "grass.png", "car.png", "enemy_car.png", "snake.png", "fruit.png",
+    "wP.png", "wN.png", "wB.png", "wR.png", "wQ.png", "wK.png",
+    "bP.png", "bN.png", "bB.png", "bR.png", "bQ.png", "bK.png"
+]
+PRELOAD_WORKERS = 4
+# Memory the scaled images may use across all game windows (4 bytes a pixel)
+CACHE_MB = 32
+# Fill and outline of the box drawn for a missing file
+PLACEHOLDER = ("#ff00ff", "#000000")
+
+
+def placeholder(size, fill, outline, label=None):
+    # A box in the sprite's colours, with an optional letter, for a file that is missing
+    image = Image.new("RGBA", size, fill)
+    draw = ImageDraw.Draw(image)
+    draw.rectangle((0, 0, size[0] - 1, size[1] - 1), outline=outline)
+    if label:
+        draw.text((size[0] // 2, size[1] // 2), label, fill=outline, anchor="mm")
+    return image
+
+
+class AssetManager:
+    # Every image file is decoded once per process, whichever window asks
+    # first (or the preload pool), and kept full size. Scaled PhotoImages are
+    # kept in an LRU keyed by (file, size) up to cache_mb, so a resize back to
+    # a size seen before, or a second window at the same size, does no work.
+    def __init__(self, root=ASSET_DIR, cache_mb=CACHE_MB):
+        self.root = root
+        self.cache_bytes = cache_mb * 1024 * 1024
+        self.lock = threading.Lock()
+        self.loading = {}
+        self.cache = collections.OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def resolve(self, name):
+        # The file's path, matching case-insensitively (wP.png is wp.png on disk)
+        path = os.path.join(self.root, name)
+        if os.path.exists(path):
+            return path
+        try:
+            for filename in os.listdir(self.root):
+                if filename.lower() == name.lower():
+                    return os.path.join(self.root, filename)
+        except OSError:
+            pass
+        return None
+
+    def decode(self, name):
+        path = self.resolve(name)
+        try:
+            if path is None:
+                raise FileNotFoundError(f"{os.path.join(self.root, name)} not found")
+            image = Image.open(path)
+            image.load()
+            if image.mode not in ("RGB", "RGBA"):
+                image = image.convert("RGBA")
+            return image
+        except Exception as e:
+            print(f"Failed to load {name}: {e}")
+            return None
+
+    def source(self, name):
+        # The full-size image, or None when the file is missing. A file being
+        # decoded by another thread is waited for rather than decoded again.
+        with self.lock:
+            future = self.loading.get(name)
+            owner = future is None
+            if owner:
+                future = self.loading[name] = concurrent.futures.Future()
+        if owner:
+            future.set_result(self.decode(name))
+        return future.result()
+
+    def preload(self, names=PRELOAD):
+        pool = concurrent.futures.ThreadPoolExecutor(PRELOAD_WORKERS)
+        for name in names:
+            pool.submit(self.source, name)
+        pool.shutdown(wait=False)
+
+    def scaled(self, name, size, placeholder_style=PLACEHOLDER):
+        # The image at size as a PIL image; placeholder_style is (fill, outline[, label])
+        source = self.source(name)
+        if source is None:
+            return placeholder(size, *placeholder_style)
+        return source.resize(size, Image.LANCZOS)
+
+    def photo(self, name, size, placeholder_style=PLACEHOLDER):
+        # Call from the Tk thread: PhotoImages belong to the Tk interpreter
+        size = (max(1, size[0]), max(1, size[1]))
+        key = (name, size)
+        if self.source(name) is None:
+            # A missing file's placeholder depends on the style it was asked in
+            key = (name, size, tuple(placeholder_style))
+        photo = self.cache.get(key)
+        if photo is not None:
+            self.cache.move_to_end(key)
+            self.hits += 1
+            return photo
+        self.misses += 1
+        photo = ImageTk.PhotoImage(self.scaled(name, size, placeholder_style))
+        self.cache[key] = photo
+        self.bytes += size[0] * size[1] * 4
+        # The newest image is in use, so it is never the one evicted
+        while self.bytes > self.cache_bytes and len(self.cache) > 1:
+            old_key, _ = self.cache.popitem(last=False)
+            w, h = old_key[1]
+            self.bytes -= w * h * 4
+        return photo
+
+    def stats(self):
+        return {'decoded': len(self.loading), 'cached': len(self.cache), 'cache_mb': self.bytes / 1024 / 1024,
+                'hits': self.hits, 'misses': self.misses}
+
+
+_assets = None
+
+
+def get_assets():
+    # One asset manager per process, shared by every game window
+    global _assets
+    if _assets is None:
+        _assets = AssetManager()
+    return _assets
@@ -0,0 +1,64 @@
+import math
+import numpy as np
+
+
+class BroadPhase:
+    # Uniform grid for the broad phase. Boxes are bucketed by the cell of their
+    # top-left corner (columns are lanes, rows are bands of cell_h) and sorted
+    # by cell once per build; a query then only looks at the buckets its box
+    # can reach. Cells must be at least as large as any box plus its motion,
+    # so a box never reaches further than the next column and row.
+    def __init__(self, cell_w, cell_h, origin_x=0, cols=1):
+        self.cell_w = max(1, cell_w)
+        self.cell_h = max(1, cell_h)
+        self.origin_x = origin_x
+        self.cols = cols
+        self.keys = np.zeros(0, dtype=np.int64)
+        self.index = np.zeros(0, dtype=np.int64)
+
+    def build(self, x, y, alive=None):
+        index = np.flatnonzero(alive) if alive is not None else np.arange(len(x))
+        # Columns are clamped to the grid, so boxes off to the side share the edge buckets
+        col = np.floor((x[index] - self.origin_x) / self.cell_w).astype(np.int64)
+        np.clip(col, 0, self.cols - 1, out=col)
+        keys = np.floor(y[index] / self.cell_h).astype(np.int64) * self.cols + col
+        order = np.argsort(keys, kind='stable')
+        self.keys, self.index = keys[order], index[order]
+        return self
+
+    def column(self, x):
+        return min(max(math.floor((x - self.origin_x) / self.cell_w), 0), self.cols - 1)
+
+    def query(self, x0, y0, x1, y1):
+        # Indices of the boxes that may overlap [x0, x1) x [y0, y1)
+        c0, c1 = max(self.column(x0) - 1, 0), self.column(x1)
+        rows = range(math.floor(y0 / self.cell_h) - 1, math.floor(y1 / self.cell_h) + 1)
+        bounds = np.searchsorted(self.keys, [key for row in rows for key in (row * self.cols + c0 - 0.5,
+                                                                                   row * self.cols + c1 + 0.5)])
+        spans = [self.index[a:b] for a, b in zip(bounds[::2].tolist(), bounds[1::2].tolist()) if b > a]
+        if not spans:
+            return self.index[:0]
+        return spans[0] if len(spans) == 1 else np.concatenate(spans)
+
+
+def _axis(a, aw, b, bw, d):
+    # Part of the frame in which b, moving by d relative to a, overlaps a on one axis
+    lo = a - (b + bw)
+    hi = a + aw - b
+    if d == 0:
+        return (-math.inf, math.inf) if lo < 0 < hi else (math.inf, -math.inf)
+    if d > 0:
+        return lo / d, hi / d
+    return hi / d, lo / d
+
+
+def swept_aabb(ax, ay, aw, ah, adx, ady, bx, by, bw, bh, bdx, bdy):
+    # Fraction of the frame (0..1) at which box a, moving by (adx, ady), first
+    # touches box b, moving by (bdx, bdy), or None if they stay apart. Boxes
+    # are (x, y, w, h) at the start of the frame.
+    enter_x, leave_x = _axis(ax, aw, bx, bw, bdx - adx)
+    enter_y, leave_y = _axis(ay, ah, by, bh, bdy - ady)
+    enter = max(enter_x, enter_y, 0.0)
+    if enter < min(leave_x, leave_y) and enter <= 1:
+        return enter
+    return None
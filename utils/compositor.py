@@ -0,0 +1,30 @@
+import collections
+from PIL import ImageTk
+
+# Backgrounds kept per compositor: the current window size and a few recent ones
+CACHE_SIZE = 4
+
+
+class Compositor:
+    # Static background layers rendered once with PIL into a single image and
+    # shown as one canvas item. render(*key) builds the PIL image for a key such
+    # as (width, height, grid size, theme); the last few are kept in an LRU, so
+    # only a resize to a new size renders again.
+    def __init__(self, render, size=CACHE_SIZE):
+        self.render = render
+        self.size = size
+        self.cache = collections.OrderedDict()
+        self.builds = 0
+
+    def get(self, *key):
+        photo = self.cache.get(key)
+        if photo is not None:
+            self.cache.move_to_end(key)
+            return photo
+        photo = ImageTk.PhotoImage(self.render(*key))
+        self.builds += 1
+        self.cache[key] = photo
+        # The image on screen is the newest entry, so it is never the one evicted
+        while len(self.cache) > self.size:
+            self.cache.popitem(last=False)
+        return photo
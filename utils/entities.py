@@ -0,0 +1,51 @@
+import numpy as np
+
+
+class EntityStore:
+    # Fixed-capacity struct-of-arrays: one NumPy array per field plus an alive
+    # mask, with a free list of slots so spawning and despawning never
+    # allocate. Fields are read and written as whole arrays, e.g.
+    # store.y[store.alive] += store.speed[store.alive].
+    def __init__(self, capacity, fields):
+        self.capacity = capacity
+        self.fields = dict(fields)
+        for name, dtype in self.fields.items():
+            setattr(self, name, np.zeros(capacity, dtype=dtype))
+        self.alive = np.zeros(capacity, dtype=bool)
+        # Highest slot last, so slots are handed out from 0 upwards
+        self.free = list(range(capacity - 1, -1, -1))
+
+    def __len__(self):
+        return self.capacity - len(self.free)
+
+    def spawn(self, **values):
+        # Returns the new slot, or None when the store is full
+        if not self.free:
+            return None
+        slot = self.free.pop()
+        for name in self.fields:
+            getattr(self, name)[slot] = values.get(name, 0)
+        self.alive[slot] = True
+        return slot
+
+    def despawn(self, mask):
+        # Frees every live slot selected by mask (a bool array or slot indices)
+        slots = np.flatnonzero(self.alive & self.as_mask(mask))
+        self.alive[slots] = False
+        self.free.extend(slots[::-1].tolist())
+        return len(slots)
+
+    def as_mask(self, mask):
+        mask = np.asarray(mask)
+        if mask.dtype == bool:
+            return mask
+        result = np.zeros(self.capacity, dtype=bool)
+        result[mask] = True
+        return result
+
+    def active(self):
+        return np.flatnonzero(self.alive)
+
+    def clear(self):
+        self.alive[:] = False
+        self.free = list(range(self.capacity - 1, -1, -1))
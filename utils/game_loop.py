@@ -0,0 +1,125 @@
+import collections
+import time
+
+# Most simulation steps run in one frame while catching up; older backlog is dropped
+MAX_STEPS = 5
+# Renders skipped in a row at most while running behind
+MAX_SKIPPED = 2
+# Frames kept for the timing stats
+HISTORY = 120
+
+
+class GameLoop:
+    # Fixed-timestep loop on the Tk event loop. update() advances the game by
+    # exactly one step of 1/rate seconds, run as many times as real time
+    # requires (at most MAX_STEPS per frame, so a stall does not snowball), and
+    # render(alpha) draws once per frame, alpha being how far real time is into
+    # the next step. Frames are scheduled against perf_counter deadlines, so
+    # the time spent updating and drawing does not slow the game down.
+    def __init__(self, window, update, render, rate, fps=None):
+        self.window = window
+        self.update = update
+        self.render = render
+        self.step = 1.0 / rate
+        self.frame = 1.0 / (fps or rate)
+        self.accumulator = 0.0
+        self.running = False
+        self.paused = False
+        self.after_id = None
+        self.last = 0.0
+        self.deadline = 0.0
+        self.skipped = 0
+        # Per frame: time since the previous frame and time spent updating and rendering
+        self.intervals = collections.deque(maxlen=HISTORY)
+        self.work = collections.deque(maxlen=HISTORY)
+        self.steps = 0
+        self.dropped_steps = 0
+        self.skipped_renders = 0
+
+    def start(self):
+        if self.running:
+            return
+        self.running = True
+        self.accumulator = 0.0
+        self.last = self.deadline = time.perf_counter()
+        self.after_id = self.window.after(0, self.tick)
+
+    def stop(self):
+        self.running = False
+        if self.after_id is not None:
+            try:
+                self.window.after_cancel(self.after_id)
+            except Exception:
+                pass
+            self.after_id = None
+
+    def pause(self):
+        self.paused = True
+
+    def resume(self):
+        if self.paused:
+            self.paused = False
+            # Time spent paused is not simulated
+            self.accumulator = 0.0
+            self.last = time.perf_counter()
+
+    def toggle_pause(self):
+        if self.paused:
+            self.resume()
+        else:
+            self.pause()
+
+    def tick(self):
+        self.after_id = None
+        if not self.running:
+            return
+        now = time.perf_counter()
+        self.intervals.append(now - self.last)
+        steps = 0
+        if not self.paused:
+            self.accumulator += now - self.last
+            while self.accumulator >= self.step and steps < MAX_STEPS:
+                self.update()
+                self.accumulator -= self.step
+                steps += 1
+                if not self.running:
+                    return
+            if self.accumulator >= self.step:
+                # Too far behind: drop the backlog rather than fast-forward the game
+                dropped = int(self.accumulator // self.step)
+                self.dropped_steps += dropped
+                self.accumulator -= dropped * self.step
+            self.steps += steps
+        self.last = now
+
+        # Behind schedule after a catch-up: skip a render or two to get back on time
+        if steps > 1 and self.skipped < MAX_SKIPPED and time.perf_counter() > self.deadline + self.frame:
+            self.skipped += 1
+            self.skipped_renders += 1
+        else:
+            self.skipped = 0
+            self.render(0.0 if self.paused else self.accumulator / self.step)
+        if not self.running:
+            return
+        self.work.append(time.perf_counter() - now)
+
+        # The next deadline is a fixed frame after the last one, not after this
+        # frame's work; when badly late, start again from now instead of bursting
+        self.deadline += self.frame
+        end = time.perf_counter()
+        if self.deadline < end - self.frame:
+            self.deadline = end
+        self.after_id = self.window.after(max(0, round((self.deadline - end) * 1000)), self.tick)
+
+    def stats(self):
+        # Frame rate and mean frame work (ms) over the last HISTORY frames
+        if not self.intervals:
+            return {'fps': 0.0, 'work_ms': 0.0, 'steps': self.steps, 'dropped_steps': self.dropped_steps,
+                    'skipped_renders': self.skipped_renders}
+        return {
+            'fps': len(self.intervals) / max(sum(self.intervals), 1e-9),
+            'work_ms': sum(self.work) / max(len(self.work), 1) * 1000,
+            'steps': self.steps,
+            'dropped_steps': self.dropped_steps,
+            'skipped_renders': self.skipped_renders
+        }
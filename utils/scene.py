@@ -0,0 +1,116 @@
+import os
+
+# Set SCENE_STATS=1 to print how many canvas items each scene creates and updates per frame
+SCENE_STATS = os.environ.get("SCENE_STATS") == "1"
+# Frames between two stats lines
+STATS_EVERY = 60
+
+
+class Sprite:
+    def __init__(self, item, kind, layer, coords, options):
+        self.item = item
+        self.kind = kind
+        self.layer = layer
+        self.coords = coords
+        self.options = options
+
+
+class Scene:
+    # Retained-mode layer over a tk.Canvas. Every canvas item is a named sprite
+    # in a layer: it is created the first time it is drawn and afterwards only
+    # touched when its coords or options change. commit() ends a frame and
+    # hides (but keeps) every sprite that was not drawn in it, so a frame only
+    # draws what it shows, and nothing is deleted and recreated.
+    def __init__(self, canvas, layers, name="scene"):
+        self.canvas = canvas
+        # Bottom to top; each layer is also a canvas tag on its items
+        self.layers = list(layers)
+        self.layer_counts = dict.fromkeys(self.layers, 0)
+        self.name = name
+        self.sprites = {}
+        self.visible = set()
+        self.drawn = set()
+        self.frame = {'created': 0, 'updated': 0, 'hidden': 0}
+        # Counts of the last committed frame
+        self.stats = dict(self.frame)
+        self.created_total = 0
+        self.commits = 0
+
+    def draw(self, name, layer, kind, coords, **options):
+        # Shows the sprite with these coords and options; options left out keep their last value
+        coords = tuple(coords)
+        sprite = self.sprites.get(name)
+        if sprite is not None and (sprite.kind != kind or sprite.layer != layer):
+            self.remove(name)
+            sprite = None
+        if sprite is None:
+            item = getattr(self.canvas, "create_" + kind)(*coords, tags=(layer, name), **options)
+            self.place(item, layer)
+            self.sprites[name] = Sprite(item, kind, layer, coords, options)
+            self.frame['created'] += 1
+            self.created_total += 1
+        else:
+            changed = {key: value for key, value in options.items() if sprite.options.get(key) != value}
+            moved = coords != sprite.coords
+            if changed:
+                sprite.options.update(changed)
+            if name not in self.visible:
+                changed['state'] = "normal"
+            if moved:
+                self.canvas.coords(sprite.item, *coords)
+                sprite.coords = coords
+            if changed:
+                self.canvas.itemconfig(sprite.item, **changed)
+            if moved or changed:
+                self.frame['updated'] += 1
+        self.drawn.add(name)
+        self.visible.add(name)
+        return self.sprites[name].item
+
+    def place(self, item, layer):
+        # New items start on top; push it under the lowest item of the next layer up
+        self.layer_counts[layer] += 1
+        for upper in self.layers[self.layers.index(layer) + 1:]:
+            if self.layer_counts[upper]:
+                self.canvas.tag_lower(item, upper)
+                break
+
+    def config(self, name, **options):
+        # Changes options of a sprite outside a frame, e.g. a blinking text
+        sprite = self.sprites.get(name)
+        if sprite is None:
+            return
+        changed = {key: value for key, value in options.items() if sprite.options.get(key) != value}
+        if changed:
+            sprite.options.update(changed)
+            self.canvas.itemconfig(sprite.item, **changed)
+
+    def move(self, name, dx, dy):
+        sprite = self.sprites.get(name)
+        if sprite is None:
+            return
+        self.canvas.move(sprite.item, dx, dy)
+        sprite.coords = tuple(c + (dx if i % 2 == 0 else dy) for i, c in enumerate(sprite.coords))
+
+    def remove(self, name):
+        sprite = self.sprites.pop(name)
+        self.canvas.delete(sprite.item)
+        self.layer_counts[sprite.layer] -= 1
+        self.visible.discard(name)
+        self.drawn.discard(name)
+
+    def commit(self):
+        # Ends the frame: hides the sprites it did not draw
+        for name in self.visible - self.drawn:
+            self.canvas.itemconfig(self.sprites[name].item, state="hidden")
+            self.frame['hidden'] += 1
+        self.visible = self.drawn
+        self.drawn = set()
+        self.stats = self.frame
+        self.frame = {'created': 0, 'updated': 0, 'hidden': 0}
+        self.commits += 1
+        if SCENE_STATS and self.commits % STATS_EVERY == 0:
+            print(f"{self.name}: {self.stats['created']} items created, {self.stats['updated']} updated, "
+                  f"{self.stats['hidden']} hidden this frame; {self.created_total} created in total, "
+                  f"{len(self.sprites)} kept")
+        return self.stats
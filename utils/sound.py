@@ -0,0 +1,156 @@
+import io
+import os
+import queue
+import threading
+import wave
+import numpy as np
+
+try:
+    os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+    import pygame
+except ImportError:
+    pygame = None
+
+try:
+    import winsound
+except ImportError:
+    winsound = None
+
+# GAME_SOUND picks the backend: auto, pygame, winsound or off
+BACKEND = os.environ.get("GAME_SOUND", "auto")
+SAMPLE_RATE = 22050
+VOLUME = 0.3
+# Tones played at once at most; more than this are dropped, not delayed
+CHANNELS = 4
+# (frequency, ms) of every tone the games play, synthesised when the service opens
+TONES = [(1000, 100), (1200, 100), (800, 200)]
+
+
+def synthesise(frequency, duration, rate=SAMPLE_RATE):
+    # 16-bit sine tone, faded in and out over 5 ms so it does not click
+    t = np.arange(rate * duration // 1000) / rate
+    samples = np.sin(2 * np.pi * frequency * t) * VOLUME
+    fade = min(len(t) // 2, rate // 200)
+    if fade:
+        ramp = np.linspace(0.0, 1.0, fade)
+        samples[:fade] *= ramp
+        samples[-fade:] *= ramp[::-1]
+    return (samples * 32767).astype(np.int16)
+
+
+class NullSound:
+    # Plays nothing: headless runs, benchmarks and machines with no audio
+    name = "off"
+
+    def __init__(self):
+        self.dropped = 0
+
+    def play(self, frequency, duration):
+        pass
+
+    def close(self):
+        pass
+
+
+class MixerSound:
+    # pygame.mixer: each tone is a Sound made once from its samples and
+    # played on a free channel, mixed on SDL's audio thread
+    name = "pygame"
+
+    def __init__(self):
+        pygame.mixer.init(SAMPLE_RATE, -16, 1)
+        pygame.mixer.set_num_channels(CHANNELS)
+        self.rate, _, self.channels = pygame.mixer.get_init()
+        self.sounds = {}
+        self.dropped = 0
+        for tone in TONES:
+            self.sound(*tone)
+
+    def sound(self, frequency, duration):
+        if (frequency, duration) not in self.sounds:
+            samples = synthesise(frequency, duration, self.rate)
+            if self.channels > 1:
+                samples = np.repeat(samples[:, None], self.channels, axis=1)
+            self.sounds[(frequency, duration)] = pygame.sndarray.make_sound(samples)
+        return self.sounds[(frequency, duration)]
+
+    def play(self, frequency, duration):
+        channel = pygame.mixer.find_channel()
+        if channel is None:
+            self.dropped += 1
+            return
+        channel.play(self.sound(frequency, duration))
+
+    def close(self):
+        pygame.mixer.quit()
+
+
+class WinsoundSound:
+    # winsound: PlaySound blocks for the whole tone, so a worker thread plays
+    # the queued tones one after another; the queue holds CHANNELS tones
+    name = "winsound"
+
+    def __init__(self):
+        self.waves = {}
+        self.dropped = 0
+        for tone in TONES:
+            self.wave(*tone)
+        self.queue = queue.Queue(CHANNELS)
+        self.thread = threading.Thread(target=self.worker, daemon=True)
+        self.thread.start()
+
+    def wave(self, frequency, duration):
+        # The tone as an in-memory WAV file, for PlaySound's SND_MEMORY
+        if (frequency, duration) not in self.waves:
+            buffer = io.BytesIO()
+            with wave.open(buffer, "wb") as out:
+                out.setnchannels(1)
+                out.setsampwidth(2)
+                out.setframerate(SAMPLE_RATE)
+                out.writeframes(synthesise(frequency, duration).tobytes())
+            self.waves[(frequency, duration)] = buffer.getvalue()
+        return self.waves[(frequency, duration)]
+
+    def play(self, frequency, duration):
+        try:
+            self.queue.put_nowait(self.wave(frequency, duration))
+        except queue.Full:
+            self.dropped += 1
+
+    def worker(self):
+        while True:
+            data = self.queue.get()
+            if data is None:
+                return
+            try:
+                winsound.PlaySound(data, winsound.SND_MEMORY)
+            except Exception as e:
+                print(f"Failed to play sound: {e}")
+
+    def close(self):
+        try:
+            self.queue.put_nowait(None)
+        except queue.Full:
+            pass
+
+
+def open_sound(backend=BACKEND):
+    if backend in ("auto", "pygame") and pygame:
+        try:
+            return MixerSound()
+        except Exception as e:
+            print(f"Failed to open pygame mixer: {e}")
+    if backend in ("auto", "winsound") and winsound:
+        return WinsoundSound()
+    return NullSound()
+
+
+_sound = None
+
+
+def get_sound():
+    # One sound service per process, opened on first use
+    global _sound
+    if _sound is None:
+        _sound = open_sound()
+    return _sound